@@ -0,0 +1,38 @@
+"""Add extraction cache table
+
+Revision ID: 0b7e5d2c9a41
+Revises: f3a9c2d1b7e4
+Create Date: 2026-01-19 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7e5d2c9a41'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c2d1b7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Persistent LLM extraction cache keyed by content hash + prompt/model version."""
+    op.create_table('extraction_cache',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('cache_key', sa.String(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_extraction_cache_cache_key'), 'extraction_cache', ['cache_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the extraction cache."""
+    op.drop_index(op.f('ix_extraction_cache_cache_key'), table_name='extraction_cache')
+    op.drop_table('extraction_cache')
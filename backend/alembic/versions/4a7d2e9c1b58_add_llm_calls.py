@@ -0,0 +1,47 @@
+"""Add llm calls ledger
+
+Revision ID: 4a7d2e9c1b58
+Revises: d81c4b7e2f05
+Create Date: 2026-01-28 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7d2e9c1b58'
+down_revision: Union[str, Sequence[str], None] = 'd81c4b7e2f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Per-call LLM token, cost and latency ledger."""
+    op.create_table('llm_calls',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('provider', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=True),
+    sa.Column('stage', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+    sa.Column('completion_tokens', sa.Integer(), nullable=True),
+    sa.Column('tokens_estimated', sa.Boolean(), nullable=True),
+    sa.Column('cost_usd', sa.Float(), nullable=True),
+    sa.Column('latency_ms', sa.Integer(), nullable=True),
+    sa.Column('streamed', sa.Boolean(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_llm_calls_created_at', 'llm_calls', ['created_at'])
+    op.create_index('ix_llm_calls_stage_created_at', 'llm_calls', ['stage', 'created_at'])
+
+
+def downgrade() -> None:
+    """Drop the ledger."""
+    op.drop_index('ix_llm_calls_stage_created_at', table_name='llm_calls')
+    op.drop_index('ix_llm_calls_created_at', table_name='llm_calls')
+    op.drop_table('llm_calls')
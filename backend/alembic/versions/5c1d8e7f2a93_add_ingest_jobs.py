@@ -0,0 +1,44 @@
+"""Add ingest jobs table
+
+Revision ID: 5c1d8e7f2a93
+Revises: 0b7e5d2c9a41
+Create Date: 2026-01-26 14:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d8e7f2a93'
+down_revision: Union[str, Sequence[str], None] = '0b7e5d2c9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Durable queue for the intelligence pipeline."""
+    op.create_table('ingest_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('input_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('extraction_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['input_id'], ['inputs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ingest_jobs_status_run_after', 'ingest_jobs', ['status', 'run_after'])
+
+
+def downgrade() -> None:
+    """Drop the ingest queue."""
+    op.drop_index('ix_ingest_jobs_status_run_after', table_name='ingest_jobs')
+    op.drop_table('ingest_jobs')
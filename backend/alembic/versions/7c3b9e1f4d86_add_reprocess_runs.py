@@ -0,0 +1,47 @@
+"""Add reprocess runs table
+
+Revision ID: 7c3b9e1f4d86
+Revises: b5e93f0d6a12
+Create Date: 2026-01-30 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3b9e1f4d86'
+down_revision: Union[str, Sequence[str], None] = 'b5e93f0d6a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Checkpoints for resumable reprocessing, and the keyset index it pages on."""
+    op.create_table('reprocess_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('filters', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('last_created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_input_id', sa.UUID(), nullable=True),
+    sa.Column('processed', sa.Integer(), nullable=False),
+    sa.Column('extracted', sa.Integer(), nullable=False),
+    sa.Column('failed', sa.Integer(), nullable=False),
+    sa.Column('touched_accounts', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reprocess_runs_name'), 'reprocess_runs', ['name'], unique=True)
+    op.create_index('ix_inputs_created_at_id', 'inputs', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Drop the keyset index and reprocess runs."""
+    op.drop_index('ix_inputs_created_at_id', table_name='inputs')
+    op.drop_index(op.f('ix_reprocess_runs_name'), table_name='reprocess_runs')
+    op.drop_table('reprocess_runs')
@@ -0,0 +1,28 @@
+"""Add health score input fingerprint
+
+Revision ID: 9e2f6a1c3d57
+Revises: 7c3b9e1f4d86
+Create Date: 2026-02-03 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2f6a1c3d57'
+down_revision: Union[str, Sequence[str], None] = '7c3b9e1f4d86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Hash of the data each score was computed from, so unchanged accounts can reuse their summary."""
+    op.add_column('health_scores', sa.Column('input_fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the health score fingerprint."""
+    op.drop_column('health_scores', 'input_fingerprint')
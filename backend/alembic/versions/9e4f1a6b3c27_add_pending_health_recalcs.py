@@ -0,0 +1,37 @@
+"""Add pending health recalcs table
+
+Revision ID: 9e4f1a6b3c27
+Revises: 5c1d8e7f2a93
+Create Date: 2026-01-27 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4f1a6b3c27'
+down_revision: Union[str, Sequence[str], None] = '5c1d8e7f2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Debounced per-account health recalculation requests."""
+    op.create_table('pending_health_recalcs',
+    sa.Column('account_id', sa.UUID(), nullable=False),
+    sa.Column('request_count', sa.Integer(), nullable=False),
+    sa.Column('first_requested_at', sa.DateTime(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('account_id')
+    )
+    op.create_index('ix_pending_health_recalcs_run_after', 'pending_health_recalcs', ['run_after'])
+
+
+def downgrade() -> None:
+    """Drop the pending recalculations."""
+    op.drop_index('ix_pending_health_recalcs_run_after', table_name='pending_health_recalcs')
+    op.drop_table('pending_health_recalcs')
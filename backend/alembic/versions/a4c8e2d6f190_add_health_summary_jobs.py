@@ -0,0 +1,46 @@
+"""Add health summary jobs
+
+Revision ID: a4c8e2d6f190
+Revises: 9e2f6a1c3d57
+Create Date: 2026-02-05 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e2d6f190'
+down_revision: Union[str, Sequence[str], None] = '9e2f6a1c3d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Scores are saved with their AI summary pending; workers fill it from this queue."""
+    op.add_column('health_scores', sa.Column('summary_status', sa.String(), nullable=True))
+    op.create_table('health_summary_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('health_score_id', sa.UUID(), nullable=False),
+    sa.Column('signals', sa.ARRAY(sa.String()), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['health_score_id'], ['health_scores.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_health_summary_jobs_status_run_after', 'health_summary_jobs', ['status', 'run_after'])
+
+
+def downgrade() -> None:
+    """Drop the summary queue and status."""
+    op.drop_index('ix_health_summary_jobs_status_run_after', table_name='health_summary_jobs')
+    op.drop_table('health_summary_jobs')
+    op.drop_column('health_scores', 'summary_status')
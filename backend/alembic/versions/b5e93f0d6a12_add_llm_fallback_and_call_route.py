@@ -0,0 +1,30 @@
+"""Add llm fallback config and call route
+
+Revision ID: b5e93f0d6a12
+Revises: 4a7d2e9c1b58
+Create Date: 2026-01-29 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e93f0d6a12'
+down_revision: Union[str, Sequence[str], None] = '4a7d2e9c1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Backup LLM configuration for hedged requests, and which route each call took."""
+    op.add_column('llmconfigurations', sa.Column('is_fallback', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('llm_calls', sa.Column('route', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the fallback flag and call route."""
+    op.drop_column('llm_calls', 'route')
+    op.drop_column('llmconfigurations', 'is_fallback')
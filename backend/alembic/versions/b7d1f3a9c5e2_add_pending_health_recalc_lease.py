@@ -0,0 +1,28 @@
+"""Add pending health recalc lease
+
+Revision ID: b7d1f3a9c5e2
+Revises: a4c8e2d6f190
+Create Date: 2026-02-09 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1f3a9c5e2'
+down_revision: Union[str, Sequence[str], None] = 'a4c8e2d6f190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Claimed recalculations keep their row until the score is saved."""
+    op.add_column('pending_health_recalcs', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the recalc lease."""
+    op.drop_column('pending_health_recalcs', 'claimed_at')
@@ -0,0 +1,30 @@
+"""Add extraction cache source input
+
+Revision ID: c2e8a4f6b913
+Revises: b7d1f3a9c5e2
+Create Date: 2026-02-09 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8a4f6b913'
+down_revision: Union[str, Sequence[str], None] = 'b7d1f3a9c5e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record which input a cached extraction was made for."""
+    op.add_column('extraction_cache', sa.Column('source_input_id', sa.UUID(), nullable=True))
+    # Keys now include the prompt arguments; old entries can never hit again
+    op.execute("DELETE FROM extraction_cache")
+
+
+def downgrade() -> None:
+    """Drop the extraction cache source input."""
+    op.drop_column('extraction_cache', 'source_input_id')
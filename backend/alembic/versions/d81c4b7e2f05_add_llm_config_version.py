@@ -0,0 +1,28 @@
+"""Add llm configuration version
+
+Revision ID: d81c4b7e2f05
+Revises: 9e4f1a6b3c27
+Create Date: 2026-01-27 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81c4b7e2f05'
+down_revision: Union[str, Sequence[str], None] = '9e4f1a6b3c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Version counter for invalidating cached LLM clients."""
+    op.add_column('llmconfigurations', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Drop the version counter."""
+    op.drop_column('llmconfigurations', 'version')
@@ -0,0 +1,50 @@
+"""Add lexicon tables and extraction lexicon version
+
+Revision ID: f3a9c2d1b7e4
+Revises: c715c3371680
+Create Date: 2026-01-12 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c2d1b7e4'
+down_revision: Union[str, Sequence[str], None] = 'c715c3371680'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Move the keyword lexicon into the DB (versioned via lexicon_revisions)
+    and record which lexicon version each extraction was scanned with.
+    """
+    op.create_table('lexicon_keywords',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('keyword', sa.String(), nullable=False),
+    sa.Column('signal_group', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('lexicon_revisions',
+    sa.Column('version', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('version')
+    )
+    op.add_column('signal_extractions', sa.Column('lexicon_version', sa.Integer(), nullable=True))
+    op.create_index('ix_signal_extractions_lexicon_version', 'signal_extractions', ['lexicon_version'])
+
+
+def downgrade() -> None:
+    """Drop lexicon tables and the extraction version column."""
+    op.drop_index('ix_signal_extractions_lexicon_version', table_name='signal_extractions')
+    op.drop_column('signal_extractions', 'lexicon_version')
+    op.drop_table('lexicon_revisions')
+    op.drop_table('lexicon_keywords')
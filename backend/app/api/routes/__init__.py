@@ -10,3 +10,6 @@ from .reminders import router as reminders_router
 from .reminders import router as reminders_router
 from .llm_settings import router as llm_settings_router
 from .documents import router as documents_router
+from .lexicon import router as lexicon_router
+from .metrics import router as metrics_router
+from .llm_usage import router as llm_usage_router
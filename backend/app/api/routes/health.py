@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List
+import json
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.services.health.calculator import HealthCalculator
-from app.schemas.health import HealthScoreResponse, HealthScoreHistoryItem
+from app.schemas.health import HealthScoreResponse, HealthScoreHistoryItem, HealthPillarsEvent
+from app.models.account import Account
 from app.models.health_score import HealthScore
 
 router = APIRouter()
@@ -14,7 +17,8 @@ router = APIRouter()
 @router.post("/accounts/{account_id}/calculate", response_model=HealthScoreResponse)
 async def calculate_score(account_id: UUID, db: Session = Depends(get_db)):
     """
-    Manually trigger health score recalculation for an account.
+    Manually trigger health score recalculation for an account. Returns as
+    soon as the score is saved; poll /scores/{id} for a pending AI summary.
     """
     calculator = HealthCalculator(db)
     try:
@@ -25,6 +29,45 @@ async def calculate_score(account_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/accounts/{account_id}/calculate/stream")
+async def calculate_score_stream(account_id: UUID, db: Session = Depends(get_db)):
+    """
+    Streaming variant of /calculate as Server-Sent Events:
+    `pillars` as soon as the scores are computed, `summary` for each piece of
+    the AI summary as the LLM produces it, then `score` with the saved record.
+    """
+    if not db.query(Account.id).filter(Account.id == account_id).first():
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    async def events():
+        # The request's session may be closed before the stream finishes
+        stream_db = SessionLocal()
+        try:
+            calculator = HealthCalculator(stream_db)
+            async for kind, payload in calculator.stream_health(account_id, triggered_by="manual"):
+                if kind == "pillars":
+                    yield _sse("pillars", HealthPillarsEvent.model_validate(payload).model_dump(mode="json"))
+                elif kind == "summary":
+                    yield _sse("summary", {"text": payload})
+                else:
+                    yield _sse("score", HealthScoreResponse.model_validate(payload).model_dump(mode="json"))
+        except Exception as e:
+            stream_db.rollback()
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/accounts/{account_id}/latest", response_model=HealthScoreResponse)
 def get_latest_score(account_id: UUID, db: Session = Depends(get_db)):
     """
@@ -40,6 +83,18 @@ def get_latest_score(account_id: UUID, db: Session = Depends(get_db)):
     return score
 
 
+@router.get("/scores/{score_id}", response_model=HealthScoreResponse)
+def get_score(score_id: UUID, db: Session = Depends(get_db)):
+    """
+    Get one health score. Clients poll this after /calculate until
+    summary_status is no longer "pending" to pick up the AI summary.
+    """
+    score = db.query(HealthScore).filter(HealthScore.id == score_id).first()
+    if not score:
+        raise HTTPException(status_code=404, detail="Health score not found")
+    return score
+
+
 @router.get("/accounts/{account_id}/history", response_model=List[HealthScoreHistoryItem])
 def get_history(account_id: UUID, limit: int = 30, db: Session = Depends(get_db)):
     """
@@ -1,33 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from uuid import UUID
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.schemas.intelligence import InputCreate, InputUpdate, SignalExtractionResponse
+from app.models.ingest_job import IngestJob
+from app.schemas.intelligence import InputCreate, InputUpdate, SignalExtractionResponse, IngestJobResponse
 from app.services.intelligence import IntelligenceService
+from app.services.ingest_queue import enqueue_input
+from app.services.bulk_ingest import BulkIngestor, iter_ndjson_lines
 
 router = APIRouter()
 
-@router.post("/", response_model=None)
-async def create_input(
+@router.post("/", response_model=None, status_code=202)
+def create_input(
     input_data: InputCreate, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
+    """
+    Save the input and queue it for the intelligence pipeline. Returns 202 with
+    a job id immediately; poll GET /inputs/jobs/{job_id} for the outcome.
+    """
     service = IntelligenceService(db)
-    
-    # Run intelligence pipeline in background to not block API
-    # Note: For production, use Celery/APScheduler. 
-    # For MVP, FastAPI BackgroundTasks is okay but verify DB session handling.
-    # Actually, for simplicity/MVP debugging, let's run it synchronously first 
-    # to see errors immediately.
-    
     try:
-        result = await service.process_input(input_data)
-        return {"status": "processed", "extraction": result}
+        # Input and job are committed together, so no input is left unqueued
+        db_input = service.save_input(input_data, commit=False)
+        job = enqueue_input(db, db_input.id)
+        return {"status": "queued", "job_id": job.id, "input_id": db_input.id}
     except Exception as e:
-        print(f"Error processing input: {e}")
+        print(f"Error queueing input: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/bulk", response_model=None)
+async def create_inputs_bulk(
+    request: Request,
+    analyze_with_llm: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Import many inputs from an NDJSON body (one InputCreate object per line).
+    
+    The body is read as a stream and written in batches; invalid lines are
+    reported in `errors` without aborting the rest. Keyword extractions are
+    stored directly. With analyze_with_llm=true, inputs that warrant LLM analysis
+    are queued for the ingest workers instead. Health is recalculated once per
+    affected account at the end.
+    """
+    ingestor = BulkIngestor(db, analyze_with_llm=analyze_with_llm)
+    async for line_no, line in iter_ndjson_lines(request.stream()):
+        if ingestor.add_line(line_no, line):
+            # Batch writes and scans block; keep them off the event loop
+            await run_in_threadpool(ingestor.flush)
+    return await ingestor.finish()
+
+@router.get("/jobs/{job_id}", response_model=IngestJobResponse)
+def get_ingest_job(job_id: UUID, db: Session = Depends(get_db)):
+    job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 @router.get("/", response_model=None)
 def get_all_inputs(db: Session = Depends(get_db)):
     from app.models.input import Input
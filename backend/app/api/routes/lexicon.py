@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.core.database import get_db
+from app.models.lexicon import LexiconKeyword
+from app.schemas.lexicon import (
+    LexiconKeywordCreate,
+    LexiconKeywordUpdate,
+    LexiconKeywordResponse,
+    LexiconResponse,
+    SignalGroup,
+)
+from app.services.keyword_scanner import tokenize
+from app.services.lexicon import (
+    ensure_seeded,
+    get_current_version,
+    record_revision,
+    refresh_matcher,
+)
+
+router = APIRouter()
+
+CHURN_SEVERITIES = ("critical", "high", "medium")
+
+
+def _validate(keyword: str, signal_group: str, category: str):
+    if not tokenize(keyword):
+        raise HTTPException(status_code=400, detail="Keyword must contain at least one word")
+    if signal_group == SignalGroup.CHURN and category not in CHURN_SEVERITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Churn category must be one of: {', '.join(CHURN_SEVERITIES)}"
+        )
+
+
+@router.get("/", response_model=LexiconResponse)
+def get_lexicon(db: Session = Depends(get_db)):
+    keywords = db.query(LexiconKeyword).order_by(
+        LexiconKeyword.signal_group, LexiconKeyword.category, LexiconKeyword.keyword
+    ).all()
+    matcher = refresh_matcher(db, force=True)
+    return LexiconResponse(
+        version=get_current_version(db),
+        active_version=matcher.version,
+        keywords=keywords
+    )
+
+
+@router.post("/", response_model=LexiconKeywordResponse)
+def add_keyword(keyword_in: LexiconKeywordCreate, db: Session = Depends(get_db)):
+    keyword = keyword_in.keyword.strip().lower()
+    category = keyword_in.category.strip().lower()
+    _validate(keyword, keyword_in.signal_group, category)
+    
+    ensure_seeded(db)
+    db_keyword = LexiconKeyword(
+        keyword=keyword,
+        signal_group=keyword_in.signal_group.value,
+        category=category
+    )
+    db.add(db_keyword)
+    record_revision(db, f"Added '{keyword}' to {keyword_in.signal_group.value}/{category}")
+    db.refresh(db_keyword)
+    return db_keyword
+
+
+@router.put("/{keyword_id}", response_model=LexiconKeywordResponse)
+def update_keyword(keyword_id: UUID, keyword_in: LexiconKeywordUpdate, db: Session = Depends(get_db)):
+    db_keyword = db.query(LexiconKeyword).filter(LexiconKeyword.id == keyword_id).first()
+    if not db_keyword:
+        raise HTTPException(status_code=404, detail="Keyword not found")
+    
+    if keyword_in.keyword is not None:
+        db_keyword.keyword = keyword_in.keyword.strip().lower()
+    if keyword_in.category is not None:
+        db_keyword.category = keyword_in.category.strip().lower()
+    if keyword_in.is_active is not None:
+        db_keyword.is_active = keyword_in.is_active
+    _validate(db_keyword.keyword, db_keyword.signal_group, db_keyword.category)
+    
+    record_revision(db, f"Updated '{db_keyword.keyword}'")
+    db.refresh(db_keyword)
+    return db_keyword
+
+
+@router.delete("/{keyword_id}")
+def delete_keyword(keyword_id: UUID, db: Session = Depends(get_db)):
+    db_keyword = db.query(LexiconKeyword).filter(LexiconKeyword.id == keyword_id).first()
+    if not db_keyword:
+        raise HTTPException(status_code=404, detail="Keyword not found")
+    
+    db.delete(db_keyword)
+    version = record_revision(db, f"Removed '{db_keyword.keyword}'")
+    return {"status": "success", "version": version}
@@ -5,13 +5,26 @@ from app.models.llm_config import LLMConfiguration
 from app.schemas.llm import LLMConfigResponse, LLMConfigUpdate
 from app.core.security import encrypt_string, decrypt_string
 from app.services.llm.factory import LLMClientFactory
+from app.services.llm import registry
+from app.services.llm.scheduler import llm_scheduler
 from typing import Dict, Any
 
 router = APIRouter()
 
-@router.get("/", response_model=LLMConfigResponse)
-def get_llm_config(db: Session = Depends(get_db)):
-    config = db.query(LLMConfiguration).filter(LLMConfiguration.is_active == True).first()
+def _mask(config: LLMConfiguration) -> str:
+    # Showing the last 4 chars of the real key helps tell keys apart; never return more
+    try:
+        real_key = decrypt_string(config.api_key_encrypted)
+    except Exception:
+        return "Error/Invalid"
+    return "..." + real_key[-4:] if real_key and len(real_key) > 4 else "********"
+
+
+def _get_config(db: Session, is_fallback: bool):
+    config = db.query(LLMConfiguration).filter(
+        LLMConfiguration.is_active == True,
+        LLMConfiguration.is_fallback == is_fallback
+    ).first()
     if not config:
         # Return default or empty
         return {
@@ -20,40 +33,24 @@ def get_llm_config(db: Session = Depends(get_db)):
             "is_active": False,
             "api_key_masked": None
         }
-    
-    # Mask Key
-    masked = "********"
-    if config.api_key_encrypted:
-        try:
-            # We don't need to decrypt to mask, just show it exists
-            masked = "********" + config.api_key_encrypted[-4:] if len(config.api_key_encrypted) > 4 else "********"
-            # Actually, reusing the encrypted string last 4 chars is bad practice visually, 
-            # usually we decrypt and show last 4 of actual key, but for security simply returning "********" is safest.
-            # Let's decrypt to get last 4 chars if we want to be fancy, or just return specific string.
-            # Showing last 4 of actual key is useful.
-            real_key = decrypt_string(config.api_key_encrypted)
-            if real_key and len(real_key) > 4:
-                masked = "..." + real_key[-4:]
-            else:
-                masked = "********"
-        except:
-            masked = "Error/Invalid"
+    return _config_response(config)
+
 
+def _config_response(config: LLMConfiguration) -> LLMConfigResponse:
     return LLMConfigResponse(
         provider=config.provider,
         model_name=config.model_name,
         is_active=config.is_active,
-        api_key_masked=masked
+        api_key_masked=_mask(config) if config.api_key_encrypted else "********"
     )
 
-@router.put("/", response_model=LLMConfigResponse)
-def update_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_db)):
-    # Simple logic: we only support one active config for now.
-    # Upsert logic.
-    config = db.query(LLMConfiguration).first()
+
+def _update_config(db: Session, config_in: LLMConfigUpdate, is_fallback: bool) -> LLMConfigResponse:
+    # Simple logic: one primary and at most one fallback config. Upsert logic.
+    config = db.query(LLMConfiguration).filter(LLMConfiguration.is_fallback == is_fallback).first()
     
     if not config:
-        config = LLMConfiguration()
+        config = LLMConfiguration(is_fallback=is_fallback)
         db.add(config)
     
     if config_in.provider:
@@ -66,20 +63,33 @@ def update_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_db))
         config.is_active = config_in.is_active
     else:
         config.is_active = True # Default to active on save
+    # Other workers compare this to their cached client's version
+    config.version = (config.version or 0) + 1
         
     db.commit()
     db.refresh(config)
-    
-    # Mask for response
-    real_key = decrypt_string(config.api_key_encrypted)
-    masked = "..." + real_key[-4:] if real_key and len(real_key) > 4 else "********"
+    registry.invalidate()
 
-    return LLMConfigResponse(
-        provider=config.provider,
-        model_name=config.model_name,
-        is_active=config.is_active,
-        api_key_masked=masked
-    )
+    return _config_response(config)
+
+
+@router.get("/", response_model=LLMConfigResponse)
+def get_llm_config(db: Session = Depends(get_db)):
+    return _get_config(db, is_fallback=False)
+
+@router.put("/", response_model=LLMConfigResponse)
+def update_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_db)):
+    return _update_config(db, config_in, is_fallback=False)
+
+@router.get("/fallback", response_model=LLMConfigResponse)
+def get_fallback_llm_config(db: Session = Depends(get_db)):
+    """Backup provider/model that hedged requests fail over to."""
+    return _get_config(db, is_fallback=True)
+
+@router.put("/fallback", response_model=LLMConfigResponse)
+def update_fallback_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_db)):
+    """Set the backup provider/model. Send is_active=false to turn hedging off."""
+    return _update_config(db, config_in, is_fallback=True)
 
 @router.post("/test")
 async def test_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_db)):
@@ -92,7 +102,7 @@ async def test_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_
     
     # If not provided, try to use saved
     if not api_key:
-        saved_config = db.query(LLMConfiguration).first()
+        saved_config = db.query(LLMConfiguration).filter(LLMConfiguration.is_fallback == False).first()
         if saved_config:
              api_key = decrypt_string(saved_config.api_key_encrypted)
              if not provider: provider = saved_config.provider
@@ -107,9 +117,11 @@ async def test_llm_config(config_in: LLMConfigUpdate, db: Session = Depends(get_
         # Instantiate provider via Factory
         client = LLMClientFactory.create(provider, api_key, model or "default")
         
-        # Simple test generation
-        # We need a generic test method or just use generate_text
-        response = await client.generate_text("Say 'Hello World'", system_prompt="You are a test bot.")
+        # Simple test generation, through the scheduler: the clients don't retry on
+        # their own (LLM_MAX_RETRIES), so transient errors are retried there
+        response = await llm_scheduler.generate_text(
+            provider, client, "Say 'Hello World'", system_prompt="You are a test bot.", stage="connection_test"
+        )
         return {"status": "success", "response": response}
         
     except Exception as e:
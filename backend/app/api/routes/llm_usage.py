@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.core.database import get_db
+from app.models.llm_call import LLMCall
+from app.schemas.llm import LLMCallResponse, LLMUsageGroupBy, LLMUsageSummary
+
+router = APIRouter()
+
+
+@router.get("/summary", response_model=List[LLMUsageSummary])
+def get_usage_summary(
+    hours: int = 24,
+    group_by: LLMUsageGroupBy = LLMUsageGroupBy.STAGE,
+    db: Session = Depends(get_db)
+):
+    """
+    Token spend, cost and latency over the last `hours`, grouped by pipeline
+    stage (default), provider, model or status. Sorted by cost, then tokens.
+    """
+    column = getattr(LLMCall, group_by.value)
+    since = datetime.utcnow() - timedelta(hours=hours)
+    prompt_tokens = func.coalesce(func.sum(LLMCall.prompt_tokens), 0)
+    completion_tokens = func.coalesce(func.sum(LLMCall.completion_tokens), 0)
+    rows = db.query(
+        column.label("key"),
+        func.count(LLMCall.id).label("calls"),
+        func.sum(case((LLMCall.status != "success", 1), else_=0)).label("errors"),
+        prompt_tokens.label("prompt_tokens"),
+        completion_tokens.label("completion_tokens"),
+        func.sum(LLMCall.cost_usd).label("cost_usd"),
+        func.avg(LLMCall.latency_ms).label("avg_latency_ms"),
+        func.percentile_cont(0.95).within_group(LLMCall.latency_ms).label("p95_latency_ms"),
+        func.max(LLMCall.latency_ms).label("max_latency_ms")
+    ).filter(
+        LLMCall.created_at >= since
+    ).group_by(column).order_by(
+        func.sum(LLMCall.cost_usd).desc().nullslast(),
+        (prompt_tokens + completion_tokens).desc()
+    ).all()
+
+    return [
+        LLMUsageSummary(
+            key=row.key,
+            calls=row.calls,
+            errors=row.errors or 0,
+            prompt_tokens=row.prompt_tokens,
+            completion_tokens=row.completion_tokens,
+            cost_usd=round(row.cost_usd, 6) if row.cost_usd is not None else None,
+            avg_latency_ms=round(float(row.avg_latency_ms), 1) if row.avg_latency_ms is not None else None,
+            p95_latency_ms=row.p95_latency_ms,
+            max_latency_ms=row.max_latency_ms
+        )
+        for row in rows
+    ]
+
+
+@router.get("/calls", response_model=List[LLMCallResponse])
+def list_calls(
+    limit: int = 50,
+    stage: Optional[str] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Most recent ledger rows, optionally filtered by stage and status."""
+    query = db.query(LLMCall)
+    if stage:
+        query = query.filter(LLMCall.stage == stage)
+    if status:
+        query = query.filter(LLMCall.status == status)
+    return query.order_by(LLMCall.created_at.desc()).limit(min(limit, 500)).all()
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.core import metrics
+
+router = APIRouter()
+
+@router.get("/")
+def get_metrics():
+    """Counters and gauges for this worker process."""
+    return metrics.snapshot()
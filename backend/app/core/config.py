@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Any, Dict, List
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Customer Pulse"
@@ -14,6 +14,92 @@ class Settings(BaseSettings):
     # Security
     FERNET_KEY: str = "your-fernet-key-here-must-be-32-url-safe-base64-bytes" # e.g. from cryptography.fernet import Fernet; Fernet.generate_key()
     
+    # Keyword lexicon: how often workers check the DB for a newer lexicon version
+    LEXICON_REFRESH_SECONDS: int = 30
+    
+    # Content-hash cache for repeated inputs (scan results and LLM extractions)
+    CONTENT_CACHE_SIZE: int = 2048
+    EXTRACTION_CACHE_PERSIST: bool = True
+    
+    # Near-duplicate inputs (quoted email threads): MinHash/LSH over recent inputs per account
+    NEAR_DUP_ENABLED: bool = True
+    NEAR_DUP_REUSE_THRESHOLD: float = 0.9  # At or above: reuse the earlier input's extraction, no LLM call
+    NEAR_DUP_REUSE_MAX_NEW_WORDS: int = 5  # ...and only if it adds at most this many words of its own
+    NEAR_DUP_DIFF_THRESHOLD: float = 0.5   # At or above: send only the new lines to the LLM
+    NEAR_DUP_WINDOW: int = 50              # Recent inputs per account to compare against
+    NEAR_DUP_SHINGLE_SIZE: int = 5         # Words per shingle
+    NEAR_DUP_NUM_PERM: int = 128           # MinHash signature length
+    NEAR_DUP_BANDS: int = 32               # LSH bands of NUM_PERM / BANDS rows; candidates from ~0.4 similarity
+
+    # Ingest queue (POST /inputs enqueues, workers run the pipeline)
+    INGEST_WORKER_CONCURRENCY: int = 4     # Jobs in flight per `python -m app.worker` process
+    INGEST_EMBEDDED_WORKERS: int = 1       # Workers started inside the API process (0 = use app.worker only)
+    INGEST_MAX_ATTEMPTS: int = 5
+    INGEST_RETRY_BASE_SECONDS: int = 10    # Backoff: base * 2^(attempt - 1), capped at an hour
+    INGEST_LEASE_SECONDS: int = 600        # A running job older than this is assumed orphaned and reclaimed
+    INGEST_POLL_SECONDS: float = 1.0
+    
+    # Health recalculation after new inputs is debounced per account (0 = recalculate inline)
+    HEALTH_RECALC_DEBOUNCE_SECONDS: int = 60      # Quiet period after the last input before recalculating
+    HEALTH_RECALC_MAX_DELAY_SECONDS: int = 300    # A steady stream of inputs still recalculates this often
+    
+    # Health AI summaries are written by background workers after the score is saved
+    HEALTH_SUMMARY_WORKERS: int = 2               # Summary loops per API or app.worker process (0 = none)
+    HEALTH_SUMMARY_MAX_ATTEMPTS: int = 3
+    
+    # LLM: how often workers check whether the active configuration changed
+    LLM_CONFIG_REFRESH_SECONDS: int = 30
+    LLM_TIMEOUT_SECONDS: float = 60.0      # Per-call timeout for provider requests
+    LLM_MAX_RETRIES: int = 0               # SDK-level retries; the LLM scheduler does its own (so does /settings/llm/test)
+    LLM_THREAD_POOL_SIZE: int = 8          # Threads for SDKs without an async client
+    
+    # LLM scheduler: per-provider requests/tokens per minute (0 = unlimited) and calls in flight.
+    # The buckets live in each process, so the account-wide limits are split evenly across
+    # LLM_RATE_LIMIT_PROCESSES (the API plus every `python -m app.worker` sharing the keys).
+    LLM_RATE_LIMITS: Dict[str, Dict[str, int]] = {
+        "anthropic": {"rpm": 50, "tpm": 40000},
+        "openai": {"rpm": 500, "tpm": 30000},
+        "google": {"rpm": 60, "tpm": 32000},
+    }
+    LLM_RATE_LIMIT_PROCESSES: int = 1
+    LLM_MAX_IN_FLIGHT: int = 4             # Default per provider, override with "max_in_flight"
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 512  # Reserved per call on top of the prompt
+    LLM_SCHEDULER_MAX_ATTEMPTS: int = 4
+    LLM_RETRY_BASE_SECONDS: float = 2.0    # Backoff when the provider sends no Retry-After
+    LLM_HEDGE_AFTER_SECONDS: float = 20.0  # Send a backup request to the fallback provider after this (0 = never)
+    
+    # Context windows by model-name prefix, used to size extraction chunks
+    LLM_CONTEXT_TOKENS: Dict[str, int] = {
+        "claude": 200000,
+        "gpt-4o": 128000,
+        "gpt-4-turbo": 128000,
+        "gpt-4": 8192,
+        "gpt-3.5-turbo": 16385,
+        "gemini-1.5": 1000000,
+        "gemini": 32768,
+    }
+    LLM_DEFAULT_CONTEXT_TOKENS: int = 8192
+    EXTRACTION_CHUNK_MAX_TOKENS: int = 6000  # Longer inputs are extracted in chunks of at most this size
+    
+    # LLM call ledger: USD per million (input, output) tokens, matched on the longest model-name prefix
+    LLM_LEDGER_ENABLED: bool = True
+    LLM_PRICING: Dict[str, List[float]] = {
+        "claude-3-5-haiku": [0.80, 4.00],
+        "claude-3-5-sonnet": [3.00, 15.00],
+        "claude-3-haiku": [0.25, 1.25],
+        "claude-3-opus": [15.00, 75.00],
+        "gpt-4o-mini": [0.15, 0.60],
+        "gpt-4o": [2.50, 10.00],
+        "gemini-1.5-flash": [0.075, 0.30],
+        "gemini-1.5-pro": [1.25, 5.00],
+    }
+
+    # Mock LLM provider for load tests: instant | realistic | degraded | rate_limited
+    # (a model named e.g. "mock-degraded" picks its own profile). Overrides set individual
+    # fields, e.g. {"error_rate": 0.05, "seed": 1}.
+    MOCK_LLM_PROFILE: str = "instant"
+    MOCK_LLM_PROFILE_OVERRIDES: Dict[str, Any] = {}
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
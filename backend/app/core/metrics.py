@@ -0,0 +1,32 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Any
+
+# Simple in-process counters and gauges, exposed at GET /api/v1/metrics.
+# Each worker process reports its own numbers.
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(float)
+_gauges: Dict[str, Callable[[], Any]] = {}
+
+
+def incr(name: str, amount: float = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def get(name: str) -> float:
+    return _counters.get(name, 0)
+
+
+def register_gauge(name: str, fn: Callable[[], Any]) -> None:
+    """Register a callable evaluated on every snapshot (e.g. a cache size)."""
+    _gauges[name] = fn
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        data: Dict[str, Any] = dict(_counters)
+    for name, fn in _gauges.items():
+        data[name] = fn()
+    return dict(sorted(data.items()))
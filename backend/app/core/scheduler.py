@@ -26,17 +26,20 @@ async def run_daily_health_check():
         accounts = db.query(Account).filter(Account.is_active == True).all()
         calculator = HealthCalculator(db)
         
+        # 1. Update Health Scores in one batch (with triggered_by for tracking)
+        scores = await calculator.calculate_health_many(
+            [acc.id for acc in accounts],
+            triggered_by="daily_job"
+        )
+        
         for acc in accounts:
             try:
-                # 1. Update Health Score (with triggered_by for tracking)
-                score = await calculator.calculate_health(
-                    acc.id, 
-                    triggered_by="daily_job"
-                )
-                print(f"Updated health for {acc.name}: {score.overall_score} ({score.trend_direction})")
+                score = scores.get(acc.id)
+                if score:
+                    print(f"Updated health for {acc.name}: {score.overall_score} ({score.trend_direction})")
                 
                 # 2. Health Risk Alert
-                if score.overall_score < 50:
+                if score and score.overall_score < 50:
                     existing = db.query(Alert).filter(
                         Alert.title == f"Health Risk: {acc.name}",
                         Alert.is_read == False
@@ -11,18 +11,32 @@ from app.api.routes import (
     contracts_router,
     alerts_router,
     reminders_router,
-    llm_settings_router
+    llm_settings_router,
+    documents_router,
+    lexicon_router,
+    metrics_router,
+    llm_usage_router
 )
 from contextlib import asynccontextmanager
+import asyncio
 from app.core.scheduler import start_scheduler, scheduler
+from app.services.ingest_queue import start_workers
+from app.services.llm.ledger import flush_ledger
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     start_scheduler()
+    # Single-process setups process the ingest queue in-process;
+    # deployments can set INGEST_EMBEDDED_WORKERS=0 and run `python -m app.worker`
+    stop_workers = asyncio.Event()
+    worker_tasks = start_workers(settings.INGEST_EMBEDDED_WORKERS, stop_workers)
     yield
     # Shutdown
+    stop_workers.set()
+    await asyncio.gather(*worker_tasks, return_exceptions=True)
     scheduler.shutdown()
+    await asyncio.get_running_loop().run_in_executor(None, flush_ledger)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -54,6 +68,9 @@ app.include_router(contracts_router, prefix=f"{settings.API_V1_STR}/contracts",
 app.include_router(alerts_router, prefix=f"{settings.API_V1_STR}/alerts", tags=["alerts"]) # Using root prefix for nested routes consistency
 app.include_router(reminders_router, prefix=f"{settings.API_V1_STR}/reminders", tags=["reminders"])
 app.include_router(documents_router, prefix=f"{settings.API_V1_STR}/documents", tags=["documents"])
+app.include_router(lexicon_router, prefix=f"{settings.API_V1_STR}/lexicon", tags=["lexicon"])
+app.include_router(metrics_router, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"])
+app.include_router(llm_usage_router, prefix=f"{settings.API_V1_STR}/llm/usage", tags=["llm usage"])
 
 @app.get("/")
 def read_root():
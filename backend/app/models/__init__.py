@@ -10,3 +10,10 @@ from .alert import Alert
 from .reminder import Reminder
 from .llm_config import LLMConfiguration
 from .document import AccountDocument
+from .lexicon import LexiconKeyword, LexiconRevision
+from .extraction_cache import ExtractionCacheEntry
+from .ingest_job import IngestJob
+from .health_recalc import PendingHealthRecalc
+from .llm_call import LLMCall
+from .reprocess_run import ReprocessRun
+from .health_summary_job import HealthSummaryJob
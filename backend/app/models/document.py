@@ -4,7 +4,7 @@ from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime
 
-from app.core.database import Base
+from .base import Base
 
 class AccountDocument(Base):
     __tablename__ = "account_documents"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from .base import Base
+
+class ExtractionCacheEntry(Base):
+    """
+    Persisted LLM extraction keyed by normalized content hash + prompt args
+    + prompt version + provider/model, so duplicate content skips the LLM
+    across restarts.
+    """
+    __tablename__ = "extraction_cache"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    cache_key = Column(String, nullable=False, unique=True, index=True)
+    result = Column(JSON, nullable=False) # AnalysisResult as a dict
+    source_input_id = Column(UUID(as_uuid=True), nullable=True) # input whose reminders came from it
+    hit_count = Column(Integer, default=0)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime, nullable=True)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from .base import Base
+
+class PendingHealthRecalc(Base):
+    """
+    One row per account with a health recalculation waiting to run. Repeated
+    requests inside the debounce window bump request_count and push run_after
+    out instead of adding rows, so a burst of inputs costs one recalculation.
+    A claimed row stays until its score is saved, so a crashed or failed
+    recalculation is picked up again.
+    """
+    __tablename__ = "pending_health_recalcs"
+    
+    account_id = Column(UUID(as_uuid=True), ForeignKey("accounts.id"), primary_key=True)
+    request_count = Column(Integer, nullable=False, default=1)
+    first_requested_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)  # Lease: set while a worker runs it, row deleted once the score commits
+
+    __table_args__ = (
+        Index("ix_pending_health_recalcs_run_after", "run_after"),
+    )
@@ -23,12 +23,14 @@ class HealthScore(Base):
     expansion_score = Column(Integer)
     
     ai_summary = Column(Text)
+    summary_status = Column(String, nullable=True)  # pending, completed, failed, superseded
     
     # Trend tracking
     previous_score = Column(Integer, nullable=True)
     score_change = Column(Integer, nullable=True)  # +5, -12, etc.
     trend_direction = Column(String, nullable=True)  # up, down, stable
     triggered_by = Column(String, nullable=True)  # input_added, decay, manual, daily_job
+    input_fingerprint = Column(String(64), nullable=True)  # Hash of the inputs, extractions and contacts scored
     
     calculated_at = Column(DateTime, default=datetime.utcnow)
 
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, ARRAY, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from .base import Base
+
+class HealthSummaryJob(Base):
+    """
+    AI summary still owed to a saved HealthScore. Scores are committed without
+    waiting for the LLM; summary workers claim these rows with SELECT ... FOR
+    UPDATE SKIP LOCKED and write the text back onto the score.
+    """
+    __tablename__ = "health_summary_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    health_score_id = Column(UUID(as_uuid=True), ForeignKey("health_scores.id", ondelete="CASCADE"), nullable=False)
+    signals = Column(ARRAY(String)) # Prompt signals, as picked when the score was computed
+    
+    status = Column(String, nullable=False, default="queued") # queued, running, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_health_summary_jobs_status_run_after", "status", "run_after"),
+    )
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from .base import Base
+
+class IngestJob(Base):
+    """
+    Durable work item for the intelligence pipeline. Workers claim rows with
+    SELECT ... FOR UPDATE SKIP LOCKED, so jobs survive restarts and each one
+    is processed by a single worker at a time.
+    """
+    __tablename__ = "ingest_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    input_id = Column(UUID(as_uuid=True), ForeignKey("inputs.id"), nullable=False)
+    
+    status = Column(String, nullable=False, default="queued") # queued, running, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow) # Backoff: not claimable before this
+    last_error = Column(Text)
+    
+    extraction_id = Column(UUID(as_uuid=True), nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_ingest_jobs_status_run_after", "status", "run_after"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, ARRAY
+from sqlalchemy import Column, String, Boolean, Text, DateTime, ForeignKey, ARRAY, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -25,3 +25,7 @@ class Input(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     account = relationship("Account", back_populates="inputs")
+
+    __table_args__ = (
+        Index("ix_inputs_created_at_id", "created_at", "id"), # Keyset paging for reprocessing
+    )
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Boolean, Integer, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from .base import Base
+
+class LexiconKeyword(Base):
+    __tablename__ = "lexicon_keywords"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    keyword = Column(String, nullable=False)
+    signal_group = Column(String, nullable=False) # churn, positive, action, compliance
+    category = Column(String, nullable=False) # e.g. critical, expansion, fedramp
+    is_active = Column(Boolean, default=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class LexiconRevision(Base):
+    """
+    One row per lexicon change. The highest version is the current lexicon;
+    workers compare it against the version of their compiled matcher.
+    """
+    __tablename__ = "lexicon_revisions"
+    
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    description = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from .base import Base
+
+class LLMCall(Base):
+    """
+    Ledger of every LLM request: one row per attempt, successful or not.
+    Token counts come from the provider's response when it reports them,
+    otherwise from the local estimate (tokens_estimated = True).
+    """
+    __tablename__ = "llm_calls"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    provider = Column(String, nullable=False)
+    model = Column(String)
+    stage = Column(String, nullable=False) # extraction, health_assessment, ...
+    status = Column(String, nullable=False) # success, error, timeout, rate_limited, cancelled
+    route = Column(String) # primary, or hedge for the backup request of a hedged call
+    
+    prompt_tokens = Column(Integer)
+    completion_tokens = Column(Integer)
+    tokens_estimated = Column(Boolean, default=False)
+    cost_usd = Column(Float) # From settings.LLM_PRICING; null for unknown models
+    latency_ms = Column(Integer)
+    streamed = Column(Boolean, default=False)
+    error = Column(Text)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_llm_calls_created_at", "created_at"),
+        Index("ix_llm_calls_stage_created_at", "stage", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Integer
 from uuid import uuid4
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base
@@ -10,3 +10,5 @@ class LLMConfiguration(Base):
     model_name = Column(String)
     api_key_encrypted = Column(String)
     is_active = Column(Boolean, default=False)
+    is_fallback = Column(Boolean, nullable=False, default=False) # Backup provider for hedged requests
+    version = Column(Integer, nullable=False, default=1) # Bumped on every save so workers drop cached clients
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Integer, DateTime, JSON
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from .base import Base
+
+class ReprocessRun(Base):
+    """
+    Checkpoint for a named reprocessing run over historical inputs. Each
+    committed batch advances the keyset cursor (last_created_at, last_input_id)
+    in the same transaction as its writes, so a crashed run resumes exactly
+    after the last batch that made it to the database.
+    """
+    __tablename__ = "reprocess_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String, nullable=False, unique=True, index=True)
+    filters = Column(JSON, nullable=False) # ReprocessFilters as a dict
+    status = Column(String, nullable=False, default="running") # running, completed, failed
+
+    # Keyset cursor: inputs are walked in (created_at, id) order
+    last_created_at = Column(DateTime, nullable=True)
+    last_input_id = Column(UUID(as_uuid=True), nullable=True)
+
+    processed = Column(Integer, nullable=False, default=0)
+    extracted = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    touched_accounts = Column(JSON, nullable=False, default=list) # Account ids to recalculate at the end
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
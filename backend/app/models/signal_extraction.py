@@ -16,6 +16,7 @@ class SignalExtraction(Base):
     action_signals = Column(ARRAY(String))
     compliance_signals = Column(ARRAY(String))
     keyword_severity = Column(String)
+    lexicon_version = Column(Integer, index=True) # Lexicon revision the keyword scan ran against
     
     # LLM
     llm_analyzed = Column(Boolean, default=False)
@@ -0,0 +1,55 @@
+"""
+Reprocess historical inputs after a lexicon, prompt or model change.
+
+    python -m app.reprocess --name lexicon-v7 --lexicon-below 7
+    python -m app.reprocess --name reextract-2025 --since 2025-01-01 --with-llm --concurrency 8
+    python -m app.reprocess --name reextract-2025 --since 2025-01-01 --with-llm --dry-run
+
+Runs are checkpointed under --name: re-running the same command after a crash
+resumes after the last committed batch.
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.reprocess import REPROCESS_BATCH_SIZE, ReprocessFilters, Reprocessor, estimate_run
+
+
+async def main(args) -> None:
+    filters = ReprocessFilters(
+        account_id=args.account,
+        since=args.since,
+        until=args.until,
+        lexicon_below=args.lexicon_below,
+        with_llm=args.with_llm
+    )
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            print(json.dumps(estimate_run(db, filters, args.batch_size), indent=2))
+            return
+        reprocessor = Reprocessor(db, args.name, filters, batch_size=args.batch_size, concurrency=args.concurrency)
+        run = await reprocessor.run()
+        print(f"Run '{run.name}' {run.status}: {run.processed} inputs, {run.extracted} re-extracted, "
+              f"{run.failed} failed, {len(run.touched_accounts or [])} accounts")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reprocess historical inputs")
+    parser.add_argument("--name", required=True, help="Checkpoint name; the same name resumes the run")
+    parser.add_argument("--account", type=UUID, help="Only this account")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Inputs dated on or after (YYYY-MM-DD)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Inputs dated before (YYYY-MM-DD)")
+    parser.add_argument("--lexicon-below", type=int, help="Only inputs last scanned with an older lexicon version")
+    parser.add_argument("--with-llm", action="store_true", help="Re-extract inputs that warrant LLM analysis")
+    parser.add_argument("--dry-run", action="store_true", help="Count inputs and estimate LLM cost, write nothing")
+    parser.add_argument("--batch-size", type=int, default=REPROCESS_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.INGEST_WORKER_CONCURRENCY,
+                        help="LLM re-extractions in flight")
+    asyncio.run(main(parser.parse_args()))
@@ -21,8 +21,9 @@ class HealthScoreResponse(BaseModel):
     satisfaction_score: Optional[int] = None
     expansion_score: Optional[int] = None
     
-    # AI-generated explanation
+    # AI-generated explanation, written after the score is saved
     ai_summary: Optional[str] = None
+    summary_status: Optional[str] = None  # pending, completed, failed, superseded
     
     # Trend tracking
     previous_score: Optional[int] = None
@@ -36,6 +37,25 @@ class HealthScoreResponse(BaseModel):
         from_attributes = True
 
 
+class HealthPillarsEvent(BaseModel):
+    """First event of a streamed calculation: the scores, before the AI summary exists."""
+    account_id: UUID
+    overall_score: int
+    overall_status: str
+    sentiment_score: Optional[int] = None
+    engagement_score: Optional[int] = None
+    request_score: Optional[int] = None
+    relationship_score: Optional[int] = None
+    satisfaction_score: Optional[int] = None
+    expansion_score: Optional[int] = None
+    previous_score: Optional[int] = None
+    score_change: Optional[int] = None
+    trend_direction: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 class HealthScoreHistoryItem(BaseModel):
     """Simplified schema for health score history/timeline."""
     overall_score: int
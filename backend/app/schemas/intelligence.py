@@ -35,3 +35,17 @@ class SignalExtractionResponse(BaseModel):
     summary: str
     action_items: List[str]
     created_at: datetime
+
+class IngestJobResponse(BaseModel):
+    id: UUID
+    input_id: UUID
+    status: str # queued, running, completed, failed
+    attempts: int
+    last_error: Optional[str] = None
+    extraction_id: Optional[UUID] = None
+    run_after: Optional[datetime] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
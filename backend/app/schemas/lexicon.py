@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+from enum import Enum
+
+class SignalGroup(str, Enum):
+    CHURN = "churn"
+    POSITIVE = "positive"
+    ACTION = "action"
+    COMPLIANCE = "compliance"
+
+class LexiconKeywordCreate(BaseModel):
+    keyword: str
+    signal_group: SignalGroup
+    category: str # For churn, the severity: critical, high, medium
+
+class LexiconKeywordUpdate(BaseModel):
+    keyword: Optional[str] = None
+    category: Optional[str] = None
+    is_active: Optional[bool] = None
+
+class LexiconKeywordResponse(BaseModel):
+    id: UUID
+    keyword: str
+    signal_group: str
+    category: str
+    is_active: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class LexiconResponse(BaseModel):
+    version: int # 0 = built-in lexicon, not yet stored in the DB
+    active_version: int # Version compiled in this worker
+    keywords: List[LexiconKeywordResponse]
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
+from uuid import UUID
+from datetime import datetime
 from enum import Enum
 
 class LLMProviderType(str, Enum):
@@ -29,3 +31,40 @@ class LLMConfigResponse(LLMConfigBase):
     
     class Config:
         from_attributes = True
+
+class LLMUsageGroupBy(str, Enum):
+    STAGE = "stage"
+    PROVIDER = "provider"
+    MODEL = "model"
+    STATUS = "status"
+    ROUTE = "route"
+
+class LLMUsageSummary(BaseModel):
+    key: Optional[str] = None
+    calls: int
+    errors: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost_usd: Optional[float] = None
+    avg_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[float] = None
+    max_latency_ms: Optional[int] = None
+
+class LLMCallResponse(BaseModel):
+    id: UUID
+    provider: str
+    model: Optional[str] = None
+    stage: str
+    status: str
+    route: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    tokens_estimated: Optional[bool] = None
+    cost_usd: Optional[float] = None
+    latency_ms: Optional[int] = None
+    streamed: Optional[bool] = None
+    error: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Set, Tuple
+from uuid import UUID
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.account import Account
+from app.models.ingest_job import IngestJob
+from app.models.input import Input
+from app.models.signal_extraction import SignalExtraction
+from app.schemas.intelligence import InputCreate
+from app.services.email_parser import analysis_text
+from app.services.intelligence import input_row
+from app.services.keyword_scanner import scan_many_hits, should_analyze_with_llm
+from app.services.lexicon import refresh_matcher
+
+BULK_BATCH_SIZE = 500
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a streamed request body into (line_number, line) pairs, 1-based."""
+    # Only each new chunk is split; a line spanning chunks is joined once, when it ends
+    partial: List[bytes] = []
+    line_no = 0
+    async for chunk in chunks:
+        *lines, rest = chunk.split(b"\n")
+        if lines and partial:
+            lines[0] = b"".join(partial) + lines[0]
+            partial = []
+        for raw in lines:
+            line_no += 1
+            yield line_no, raw.decode("utf-8", errors="replace")
+        if rest:
+            partial.append(rest)
+    if partial:
+        yield line_no + 1, b"".join(partial).decode("utf-8", errors="replace")
+
+
+class BulkIngestor:
+    """
+    Imports inputs in batches: one multi-row INSERT for the inputs, one bulk
+    scan, one multi-row INSERT for the extractions, one commit per batch.
+    Health is recalculated once per affected account in finish().
+    """
+
+    def __init__(self, db: Session, analyze_with_llm: bool = False):
+        self.db = db
+        self.analyze_with_llm = analyze_with_llm
+        self.received = 0
+        self.inserted = 0
+        self.queued_for_llm = 0
+        self.errors: List[Dict] = []
+        self.affected_accounts: Set[UUID] = set()
+        self._pending: List[Tuple[int, InputCreate]] = []
+
+    def add_line(self, line_no: int, line: str) -> bool:
+        """Parse one line into the pending batch. True once the batch is full and should be flushed."""
+        if not line.strip():
+            return False
+        self.received += 1
+        try:
+            self._pending.append((line_no, InputCreate.model_validate_json(line)))
+        except ValidationError as e:
+            self.errors.append({"line": line_no, "error": e.errors(include_url=False)[0]["msg"]})
+        return len(self._pending) >= BULK_BATCH_SIZE
+
+    def flush(self) -> None:
+        """Write the pending batch. Blocking (DB round trips and the keyword scan): async callers run it in a thread."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        # Unknown accounts would fail the whole multi-row insert; reject those lines up front
+        account_ids = {item.account_id for _, item in batch}
+        known = {row[0] for row in self.db.query(Account.id).filter(Account.id.in_(account_ids)).all()}
+        valid = []
+        for line_no, item in batch:
+            if item.account_id in known:
+                valid.append((line_no, item))
+            else:
+                self.errors.append({"line": line_no, "error": f"Account {item.account_id} not found"})
+        if not valid:
+            return
+
+        refresh_matcher(self.db)
+        scans = scan_many_hits([analysis_text(item.input_type, item.content) for _, item in valid])
+        now = datetime.now()
+
+        input_rows, extraction_rows, job_rows = [], [], []
+        for (_, item), scan in zip(valid, scans):
+            input_id = uuid.uuid4()
+            needs_llm = self.analyze_with_llm and should_analyze_with_llm(scan)
+            input_rows.append({
+                "id": input_id,
+                **input_row(item, now),
+                # LLM-bound inputs are finished by the ingest workers
+                "is_processed": not needs_llm,
+            })
+            if needs_llm:
+                job_rows.append({
+                    "id": uuid.uuid4(),
+                    "input_id": input_id,
+                    "status": "queued",
+                    "attempts": 0,
+                    "max_attempts": settings.INGEST_MAX_ATTEMPTS,
+                    "run_after": datetime.utcnow(),
+                })
+            elif scan.has_matches:
+                extraction_rows.append({
+                    "id": uuid.uuid4(),
+                    "input_id": input_id,
+                    "churn_signals": scan.churn_signals,
+                    "positive_signals": scan.positive_signals,
+                    "action_signals": scan.action_signals,
+                    "compliance_signals": scan.compliance_signals,
+                    "keyword_severity": scan.keyword_severity,
+                    "lexicon_version": scan.lexicon_version,
+                    "llm_analyzed": False,
+                    "llm_analysis_status": "skipped",
+                })
+
+        try:
+            self.db.execute(insert(Input), input_rows)
+            if extraction_rows:
+                self.db.execute(insert(SignalExtraction), extraction_rows)
+            if job_rows:
+                self.db.execute(insert(IngestJob), job_rows)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Bulk insert batch failed: {e}")
+            self.errors.extend({"line": line_no, "error": f"Batch insert failed: {e}"} for line_no, _ in valid)
+            return
+
+        self.inserted += len(input_rows)
+        self.queued_for_llm += len(job_rows)
+        self.affected_accounts.update(item.account_id for _, item in valid)
+        metrics.incr("bulk_ingest.inserted", len(input_rows))
+
+    async def finish(self) -> Dict:
+        """Flush the last batch and recalculate health once per affected account."""
+        await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+        from app.services.health.calculator import HealthCalculator
+        scores = await HealthCalculator(self.db).calculate_health_many(
+            self.affected_accounts, triggered_by="bulk_import"
+        )
+        recalculated = len(scores)
+
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "queued_for_llm": self.queued_for_llm,
+            "accounts_recalculated": recalculated,
+            "errors": self.errors,
+        }
@@ -0,0 +1,128 @@
+import re
+from typing import Callable, Dict, List
+
+from app.core.config import settings
+from app.schemas.intelligence import AnalysisResult
+
+SENTIMENT_VALUES = {"positive": 1, "neutral": 0, "negative": -1}
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def context_window(model: str) -> int:
+    """Context size in tokens for the longest matching model-name prefix."""
+    matches = [prefix for prefix in settings.LLM_CONTEXT_TOKENS if (model or "").startswith(prefix)]
+    if not matches:
+        return settings.LLM_DEFAULT_CONTEXT_TOKENS
+    return settings.LLM_CONTEXT_TOKENS[max(matches, key=len)]
+
+
+def chunk_budget(model: str, prompt_overhead: int) -> int:
+    """
+    Content tokens per extraction call: what fits in the model's context next
+    to the prompt and the expected output, capped at EXTRACTION_CHUNK_MAX_TOKENS
+    so a single call never gets slow just because the model could take more.
+    """
+    available = context_window(model) - prompt_overhead - settings.LLM_EXPECTED_OUTPUT_TOKENS
+    return max(256, min(settings.EXTRACTION_CHUNK_MAX_TOKENS, available))
+
+
+def _split_characters(piece: str, budget: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Last resort for text with nowhere to break (a long URL, base64): fixed-size slices."""
+    parts = []
+    while piece:
+        size = max(1, len(piece) * (budget - 1) // count_tokens(piece))
+        while size > 1 and count_tokens(piece[:size]) + 1 > budget:
+            size = size * 9 // 10
+        parts.append(piece[:size])
+        piece = piece[size:]
+    return parts
+
+
+def _split_oversized(piece: str, budget: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """Break one over-budget line on sentence, then word boundaries, then anywhere."""
+    units = _SENTENCE_END.split(piece)
+    if len(units) == 1:
+        units = piece.split(" ")
+    if len(units) == 1:
+        return _split_characters(piece, budget, count_tokens)
+    parts, current, current_tokens = [], [], 0
+    for unit in units:
+        tokens = count_tokens(unit) + 1
+        if current and current_tokens + tokens > budget:
+            parts.append(" ".join(current))
+            current, current_tokens = [], 0
+        if tokens > budget:
+            # A run-on sentence or an unbroken string: split it on its own
+            parts.extend(_split_oversized(unit, budget, count_tokens))
+            continue
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+
+def split_into_chunks(text: str, budget: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """
+    Split `text` into chunks of at most ~`budget` tokens, keeping whole lines
+    (speaker turns, paragraphs) together wherever possible.
+    """
+    if count_tokens(text) <= budget:
+        return [text]
+
+    chunks, current, current_tokens = [], [], 0
+    for line in text.splitlines():
+        tokens = count_tokens(line) + 1
+        pieces = [line] if tokens <= budget else _split_oversized(line, budget, count_tokens)
+        for piece in pieces:
+            piece_tokens = tokens if len(pieces) == 1 else count_tokens(piece) + 1
+            if current and current_tokens + piece_tokens > budget:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _dedupe(items: List[str]) -> List[str]:
+    seen, result = set(), []
+    for item in items:
+        key = " ".join(str(item).lower().split())
+        if key and key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def merge_results(results: List[AnalysisResult], weights: List[int]) -> AnalysisResult:
+    """
+    Combine per-chunk extractions into one result. Sentiment is the
+    chunk-length weighted average; signals, commitments and action items
+    are unioned with duplicates removed, in transcript order.
+    """
+    total = sum(weights) or 1
+    score = sum(SENTIMENT_VALUES.get(r.sentiment.lower(), 0) * w for r, w in zip(results, weights)) / total
+    if score <= -1 / 3:
+        sentiment = "negative"
+    elif score >= 1 / 3:
+        sentiment = "positive"
+    else:
+        sentiment = "neutral"
+
+    commitments: Dict[tuple, dict] = {}
+    for result in results:
+        for commitment in result.commitments:
+            key = (" ".join(str(commitment.get("description", "")).lower().split()), commitment.get("due_date"))
+            if key[0] and key not in commitments:
+                commitments[key] = commitment
+
+    return AnalysisResult(
+        sentiment=sentiment,
+        summary=" ".join(_dedupe([r.summary for r in results if r.summary])),
+        signals=_dedupe([s for r in results for s in r.signals]),
+        commitments=list(commitments.values()),
+        action_items=_dedupe([a for r in results for a in r.action_items])
+    )
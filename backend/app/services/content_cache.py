@@ -0,0 +1,131 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Hashable, Optional
+from uuid import UUID
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.prompts import SIGNAL_EXTRACTION_SYSTEM_PROMPT, SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.schemas.intelligence import AnalysisResult
+
+# Changes whenever the extraction prompts change, so stale extractions miss
+EXTRACTION_PROMPT_VERSION = hashlib.sha256(
+    (SIGNAL_EXTRACTION_SYSTEM_PROMPT + SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE).encode("utf-8")
+).hexdigest()[:12]
+
+
+def content_hash(text: str) -> str:
+    """Hash of the content with case and whitespace differences normalized away."""
+    normalized = " ".join(text.casefold().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Size-bounded, thread-safe LRU cache that counts hits and misses in app.core.metrics."""
+
+    def __init__(self, name: str, max_size: int):
+        self.name = name
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        metrics.register_gauge(f"cache.{name}.size", lambda: len(self._data))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        metrics.incr(f"cache.{self.name}.{'hits' if value is not None else 'misses'}")
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+scan_cache = LRUCache("scan", settings.CONTENT_CACHE_SIZE)
+extraction_cache = LRUCache("extraction", settings.CONTENT_CACHE_SIZE)
+
+
+# Prompt arguments that change what an extraction says. The sender is left out, so a
+# forwarded or re-pasted copy still hits; the date counts by day only, since inputs
+# without one are dated "now" when they are saved.
+KEYED_PROMPT_ARGS = ("account_name", "date")
+
+
+def _key_value(value: Any) -> str:
+    return value.date().isoformat() if isinstance(value, datetime) else str(value)
+
+
+def extraction_key(digest: str, provider: str, model: str, prompt_args: dict) -> str:
+    """
+    Cache key for one extraction prompt: the content digest plus the prompt
+    arguments in KEYED_PROMPT_ARGS, so the same text from another account is
+    extracted on its own.
+    """
+    keyed = {name: _key_value(prompt_args.get(name)) for name in KEYED_PROMPT_ARGS}
+    args_digest = hashlib.sha256(json.dumps(keyed, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return f"{digest}:{args_digest}:{EXTRACTION_PROMPT_VERSION}:{provider}:{model}"
+
+
+def _for_input(source_input_id: Optional[UUID], analysis: AnalysisResult,
+               input_id: Optional[UUID]) -> AnalysisResult:
+    # Commitments already became reminders on the input the extraction was made for
+    if input_id is not None and source_input_id == input_id:
+        return analysis
+    return analysis.model_copy(update={"commitments": []})
+
+
+def get_cached_extraction(db: Session, key: str, input_id: Optional[UUID] = None) -> Optional[AnalysisResult]:
+    """
+    Look the extraction up in memory first, then in the persistent table.
+    A hit made for a different input comes back without its commitments.
+    """
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        return _for_input(*cached, input_id)
+    if not settings.EXTRACTION_CACHE_PERSIST:
+        return None
+
+    try:
+        entry = db.query(ExtractionCacheEntry).filter(ExtractionCacheEntry.cache_key == key).first()
+    except SQLAlchemyError as e:
+        print(f"Extraction cache lookup failed: {e}")
+        db.rollback()
+        return None
+    if not entry:
+        metrics.incr("cache.extraction_db.misses")
+        return None
+
+    metrics.incr("cache.extraction_db.hits")
+    entry.hit_count = (entry.hit_count or 0) + 1
+    entry.last_hit_at = datetime.utcnow()
+    analysis = AnalysisResult(**entry.result)
+    extraction_cache.put(key, (entry.source_input_id, analysis))
+    return _for_input(entry.source_input_id, analysis, input_id)
+
+
+def store_extraction(db: Session, key: str, analysis: AnalysisResult, input_id: Optional[UUID] = None) -> None:
+    """Remember a successful extraction. The DB row commits with the caller's transaction."""
+    extraction_cache.put(key, (input_id, analysis))
+    if not settings.EXTRACTION_CACHE_PERSIST:
+        return
+    try:
+        # Savepoint: another worker may have stored the same key concurrently
+        with db.begin_nested():
+            db.add(ExtractionCacheEntry(cache_key=key, source_input_id=input_id, result=analysis.model_dump()))
+    except IntegrityError:
+        pass
@@ -0,0 +1,157 @@
+import re
+from email.utils import getaddresses, parseaddr, parsedate_to_datetime
+from typing import List, Optional
+
+# Header lines at the top of a pasted email ("Sent" is Outlook's "Date")
+HEADER_PATTERNS = {
+    'from': re.compile(r'^From:\s*(.+)$', re.IGNORECASE),
+    'to': re.compile(r'^To:\s*(.+)$', re.IGNORECASE),
+    'cc': re.compile(r'^CC:\s*(.+)$', re.IGNORECASE),
+    'subject': re.compile(r'^Subject:\s*(.+)$', re.IGNORECASE),
+    'date': re.compile(r'^(?:Date|Sent):\s*(.+)$', re.IGNORECASE),
+}
+
+# Where the quoted history of a reply starts; everything from here on is dropped
+_REPLY_HEADER = re.compile(r'^On\s.+wrote:\s*$', re.IGNORECASE)
+_REPLY_HEADER_START = re.compile(r'^On\s.+\d', re.IGNORECASE)
+_ORIGINAL_MESSAGE = re.compile(r'^\s*-{2,}\s*Original Message\s*-{2,}\s*$', re.IGNORECASE)
+_OUTLOOK_SEPARATOR = re.compile(r'^\s*_{10,}\s*$')
+_QUOTED_FROM = re.compile(r'^\*?From:\*?\s+\S', re.IGNORECASE)
+_QUOTED_HEADER = re.compile(r'^\*?(?:Sent|Date|To|Subject):\*?\s', re.IGNORECASE)
+
+# Signatures: the "-- " delimiter, mobile footers, and a sign-off followed by a short name block
+_SIGNATURE_DELIMITER = re.compile(r'^--\s?$')
+_MOBILE_FOOTER = re.compile(r'^(?:Sent from my \w+|Get Outlook for \w+|Sent from (?:Mail|Outlook) for \w+)', re.IGNORECASE)
+_SIGN_OFF = re.compile(
+    r'^(?:thanks|thank you|many thanks|thanks again|best|best regards|kind regards|warm regards|regards|'
+    r'cheers|sincerely|respectfully|all the best|talk soon)[\s,.!]*$',
+    re.IGNORECASE
+)
+SIGNATURE_MAX_LINES = 3
+SIGNATURE_MAX_LINE_LENGTH = 80
+# Name, title and phone lines don't end like sentences; a tail that does is still the message
+_SENTENCE_END = re.compile(r'[.!?]["\')]?$')
+
+# Legal footers, dropped paragraph by paragraph
+_DISCLAIMER = re.compile(
+    r'intended (?:solely )?(?:only )?for the (?:use of the )?(?:individual|addressee|named recipient|recipient)'
+    r'|received this (?:e-?mail|message|communication|transmission) in error'
+    r'|confidentiality notice|privileged and confidential|legally privileged'
+    r'|this (?:e-?mail|message)(?: and any (?:files|attachments)[\w\s]*)? (?:is|are|may be) confidential'
+    r'|any (?:review|dissemination|distribution|copying)[\w\s,]* (?:is )?(?:strictly )?prohibited',
+    re.IGNORECASE
+)
+
+
+def _split_headers(lines: List[str]) -> tuple:
+    """Leading header block (up to the first blank line) and the index where the body starts."""
+    headers = {}
+    i = 0
+    while i < len(lines) and not lines[i].strip():
+        i += 1
+    start = i
+    while i < len(lines) and lines[i].strip():
+        for key, pattern in HEADER_PATTERNS.items():
+            match = pattern.match(lines[i].strip())
+            if match:
+                headers.setdefault(key, match.group(1).strip())
+                break
+        else:
+            # Body text right after the headers, without the usual blank line
+            break
+        i += 1
+    return headers, i if headers else start
+
+
+def _quote_start(lines: List[str]) -> Optional[int]:
+    """Index of the first line of quoted history, if the body has any."""
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if _REPLY_HEADER.match(stripped) or _ORIGINAL_MESSAGE.match(stripped):
+            return i
+        # "On Mon, Jan 5, 2026 at 9:14 AM Dana Ortiz <dana@...>" wrapped before "wrote:"
+        if _REPLY_HEADER_START.match(stripped) and i + 1 < len(lines) and lines[i + 1].strip().lower().endswith("wrote:"):
+            return i
+        # Outlook: "From: ..." followed by Sent/To/Subject lines
+        if _QUOTED_FROM.match(stripped) and any(_QUOTED_HEADER.match(l.strip()) for l in lines[i + 1:i + 4]):
+            return i - 1 if i > 0 and _OUTLOOK_SEPARATOR.match(lines[i - 1]) else i
+    return None
+
+
+def _strip_signature(lines: List[str]) -> List[str]:
+    for i, line in enumerate(lines):
+        if _SIGNATURE_DELIMITER.match(line):
+            lines = lines[:i]
+            break
+    lines = [line for line in lines if not _MOBILE_FOOTER.match(line.strip())]
+    while lines and not lines[-1].strip():
+        lines.pop()
+
+    # A sign-off near the end with only a short name/title block after it
+    for i in range(len(lines) - 1, max(-1, len(lines) - SIGNATURE_MAX_LINES - 2), -1):
+        if _SIGN_OFF.match(lines[i].strip()):
+            tail = [line.strip() for line in lines[i + 1:] if line.strip()]
+            if len(tail) <= SIGNATURE_MAX_LINES and all(
+                len(line) <= SIGNATURE_MAX_LINE_LENGTH and not _SENTENCE_END.search(line) for line in tail
+            ):
+                return lines[:i]
+    return lines
+
+
+def _strip_disclaimers(text: str) -> str:
+    paragraphs = re.split(r'\n\s*\n', text)
+    return "\n\n".join(p for p in paragraphs if not _DISCLAIMER.search(p))
+
+
+def parse_email_input(raw_content: str) -> dict:
+    """
+    Parse pasted email content or uploaded .eml file.
+    Extracts headers and body, and separates the newly written text
+    (new_content) from quoted history, signatures and legal footers.
+    """
+    result = {
+        'sender_email': None,
+        'sender_name': None,
+        'recipients': [],
+        'subject': None,
+        'date': None,
+        'body': raw_content,
+        'new_content': raw_content,
+    }
+
+    lines = raw_content.replace('\r\n', '\n').split('\n')
+    headers, body_start = _split_headers(lines)
+    if headers.get('from'):
+        name, address = parseaddr(headers['from'])
+        result['sender_name'] = name or None
+        result['sender_email'] = address or None
+    result['recipients'] = [
+        address for _, address in getaddresses([headers.get('to', ''), headers.get('cc', '')]) if address
+    ]
+    result['subject'] = headers.get('subject')
+    if headers.get('date'):
+        try:
+            result['date'] = parsedate_to_datetime(headers['date'])
+        except (TypeError, ValueError):
+            pass
+
+    body_lines = lines[body_start:]
+    result['body'] = '\n'.join(body_lines).strip()
+
+    quote_at = _quote_start(body_lines)
+    if quote_at is not None:
+        body_lines = body_lines[:quote_at]
+    body_lines = [line for line in body_lines if not line.lstrip().startswith('>')]
+    body_lines = _strip_disclaimers('\n'.join(body_lines)).split('\n')
+    new_content = '\n'.join(_strip_signature(body_lines)).strip()
+
+    # Nothing left (e.g. a bare forward): the quoted text is the content
+    result['new_content'] = new_content or result['body']
+    return result
+
+
+def analysis_text(input_type: str, content: str) -> str:
+    """The part of an input that should be scanned and sent to the LLM."""
+    if input_type == "email":
+        return parse_email_input(content)['new_content']
+    return content
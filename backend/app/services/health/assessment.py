@@ -1,44 +1,69 @@
-from typing import List
+from typing import AsyncIterator, List
 from sqlalchemy.orm import Session
-from app.models.llm_config import LLMConfiguration
-from app.core.security import decrypt_string
-from app.services.llm.factory import LLMClientFactory
+from app.services.llm.registry import FALLBACK, get_active_llm
+from app.services.llm.scheduler import llm_scheduler
 from app.core.prompts_health import HEALTH_ASSESSMENT_SYSTEM_PROMPT, HEALTH_ASSESSMENT_USER_PROMPT_TEMPLATE
 
+NO_PROVIDER_MESSAGE = "AI Analysis unavailable (No active LLM provider)."
+FAILED_MESSAGE = "AI Analysis failed due to technical error."
+
 class HealthAssessmentGenerator:
     def __init__(self, db: Session):
         self.db = db
 
+    def _build_prompt(self, account_name: str, score: int, status: str,
+                      sentiment: int, engagement: int, signals: List[str]) -> str:
+        # 3. Format Signals
+        signals_text = "\n".join([f"- {s}" for s in signals]) if signals else "No specific signals found."
+        
+        # 4. Prompt
+        return HEALTH_ASSESSMENT_USER_PROMPT_TEMPLATE.format(
+            account_name=account_name,
+            score=score,
+            status=status,
+            sentiment_score=sentiment,
+            engagement_score=engagement,
+            signals_text=signals_text
+        )
+
     async def generate_summary(self, account_name: str, score: int, status: str, 
                                sentiment: int, engagement: int, signals: List[str]) -> str:
         
-        # 1. Get Active Provider
-        config = self.db.query(LLMConfiguration).filter(LLMConfiguration.is_active == True).first()
-        if not config:
-            return "AI Analysis unavailable (No active LLM provider)."
-
         try:
-            # 2. Setup Client
-            api_key = decrypt_string(config.api_key_encrypted)
-            llm = LLMClientFactory.create(config.provider, api_key, config.model_name)
-            
-            # 3. Format Signals
-            signals_text = "\n".join([f"- {s}" for s in signals]) if signals else "No specific signals found."
+            # 1-2. Active provider and its cached client
+            active = get_active_llm(self.db)
+            if not active:
+                return NO_PROVIDER_MESSAGE
             
-            # 4. Prompt
-            prompt = HEALTH_ASSESSMENT_USER_PROMPT_TEMPLATE.format(
-                account_name=account_name,
-                score=score,
-                status=status,
-                sentiment_score=sentiment,
-                engagement_score=engagement,
-                signals_text=signals_text
-            )
+            prompt = self._build_prompt(account_name, score, status, sentiment, engagement, signals)
             
             # 5. Generate
-            summary = await llm.generate_text(prompt, system_prompt=HEALTH_ASSESSMENT_SYSTEM_PROMPT)
+            summary = await llm_scheduler.hedged_generate_text(
+                active, get_active_llm(self.db, role=FALLBACK), prompt,
+                system_prompt=HEALTH_ASSESSMENT_SYSTEM_PROMPT, stage="health_assessment"
+            )
             return summary.strip()
             
         except Exception as e:
             print(f"Error generating assessment: {e}")
-            return "AI Analysis failed due to technical error."
+            return FAILED_MESSAGE
+
+    async def stream_summary(self, account_name: str, score: int, status: str,
+                             sentiment: int, engagement: int, signals: List[str]) -> AsyncIterator[str]:
+        """generate_summary, yielded piece by piece through the provider's streaming API."""
+        try:
+            active = get_active_llm(self.db)
+            if not active:
+                yield NO_PROVIDER_MESSAGE
+                return
+            
+            prompt = self._build_prompt(account_name, score, status, sentiment, engagement, signals)
+            async for piece in llm_scheduler.stream_text(
+                active.provider, active.client, prompt, system_prompt=HEALTH_ASSESSMENT_SYSTEM_PROMPT,
+                stage="health_assessment"
+            ):
+                yield piece
+                
+        except Exception as e:
+            print(f"Error streaming assessment: {e}")
+            yield f" {FAILED_MESSAGE}"
@@ -1,11 +1,15 @@
-from typing import Optional, Tuple, Union
+import hashlib
+import uuid
+import numpy as np
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import Row, desc, func, insert, select
 from uuid import UUID
 from datetime import datetime, timedelta
 
 from app.models.account import Account
 from app.models.health_score import HealthScore
+from app.models.health_summary_job import HealthSummaryJob
 from app.models.input import Input
 from app.models.signal_extraction import SignalExtraction
 from app.models.contact import Contact
@@ -17,7 +21,30 @@ from app.services.health.pillars import (
     SatisfactionPillar,
     ExpansionPillar
 )
-from app.services.health.assessment import HealthAssessmentGenerator
+from app.core import metrics
+from app.services.health.assessment import FAILED_MESSAGE, NO_PROVIDER_MESSAGE, HealthAssessmentGenerator
+from app.services.health.vectorized import apply_decay, pack, score_pillars
+from app.services.health_summary import summary_job_row
+
+RECENT_INPUT_LIMIT = 10  # Inputs per account the pillars look at
+BATCH_CHUNK_SIZE = 500   # Accounts loaded per round of calculate_health_many queries
+
+
+def data_fingerprint(
+    account: Account,
+    last_date: Optional[datetime],
+    extractions: List[SignalExtraction],
+    contact_count: int
+) -> str:
+    """
+    Hash of everything a score reads besides the clock: the account name, the
+    latest interaction, the recent extractions and the contact count. Equal
+    fingerprints mean only time (engagement and decay) can have moved the score.
+    """
+    parts = [account.name or "", last_date.isoformat() if last_date else "", str(contact_count)]
+    for ext in extractions:
+        parts.append(f"{ext.input_id}|{ext.sentiment}|{chr(31).join(ext.signals or [])}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
 
 
 class HealthCalculator:
@@ -103,7 +130,9 @@ class HealthCalculator:
         triggered_by: str = "manual"
     ) -> HealthScore:
         """
-        Calculate health score for an account.
+        Calculate health score for an account. The score is saved right away;
+        a new AI summary is left pending for the summary workers
+        (summary_status "pending" until they fill ai_summary).
         
         Args:
             account_id: The account to score
@@ -113,18 +142,240 @@ class HealthCalculator:
                 - "daily_job": Scheduled daily recalculation
                 - "decay": Decay check triggered recalc
         """
+        account, health, signals = self.score_account(account_id, triggered_by)
+
+        # 8. Queue the AI Assessment (unless the previous one still applies)
+        job = self._summary_job(health, signals)
+
+        # 9. Save Score with Trend Data, without waiting for the LLM
+        if job is not None:
+            self.db.add(HealthSummaryJob(**job))
+        return self._save(health)
+
+    def _summary_job(self, health: HealthScore, signals: List[str]) -> Optional[dict]:
+        """
+        Mark health's summary pending and return the job row that will write
+        it, unless _assemble already carried the previous summary over.
+        """
+        if health.ai_summary is not None:
+            metrics.incr("health.summary_reused")
+            return None
+        metrics.incr("health.summary_queued")
+        health.id = health.id or uuid.uuid4()
+        health.summary_status = "pending"
+        return summary_job_row(health.id, signals)
+
+    async def stream_health(
+        self,
+        account_id: UUID,
+        triggered_by: str = "manual"
+    ) -> AsyncIterator[Tuple[str, Union[HealthScore, str]]]:
+        """
+        Same calculation as calculate_health, yielded as it happens:
+        ("pillars", unsaved HealthScore) first, then ("summary", text) for each
+        piece of the AI summary, then ("score", saved HealthScore).
+        """
+        account, health, signals = self.score_account(account_id, triggered_by)
+        yield "pillars", health
+
+        if health.ai_summary is not None:
+            metrics.incr("health.summary_reused")
+            yield "summary", health.ai_summary
+            yield "score", self._save(health)
+            return
+
+        # The client is waiting on this stream, so the summary is generated inline
+        metrics.incr("health.summary_generated")
+        pieces = []
+        async for piece in self.assessment_gen.stream_summary(
+            account_name=account.name,
+            score=health.overall_score,
+            status=health.overall_status,
+            sentiment=health.sentiment_score,
+            engagement=health.engagement_score,
+            signals=signals
+        ):
+            pieces.append(piece)
+            yield "summary", piece
+
+        health.ai_summary = "".join(pieces).strip()
+        if pieces and pieces[-1].strip() in (NO_PROVIDER_MESSAGE, FAILED_MESSAGE):
+            # A stream that broke off: store the error, not a truncated summary with it appended
+            health.ai_summary = pieces[-1].strip()
+        health.summary_status = "failed" if health.ai_summary in (NO_PROVIDER_MESSAGE, FAILED_MESSAGE) else "completed"
+        yield "score", self._save(health)
+
+    async def calculate_health_many(
+        self,
+        account_ids: Iterable[UUID],
+        triggered_by: str = "daily_job"
+    ) -> Dict[UUID, HealthScore]:
+        """
+        calculate_health for a set of accounts, with the same results. Each
+        chunk of BATCH_CHUNK_SIZE accounts is loaded in four queries, scored
+        with the vectorized pillars and saved in one multi-row INSERT, with
+        its summary jobs in another.
+        Unknown account ids are skipped. A chunk that fails is rolled back and
+        its accounts are scored one at a time instead, so one bad account
+        can't cost the rest their scores. Returns the saved scores by account id.
+        """
+        account_ids = list(dict.fromkeys(account_ids))
+        scores: Dict[UUID, HealthScore] = {}
+        for start in range(0, len(account_ids), BATCH_CHUNK_SIZE):
+            chunk = account_ids[start:start + BATCH_CHUNK_SIZE]
+            try:
+                scores.update(await self._calculate_chunk(chunk, triggered_by))
+            except Exception as e:
+                self.db.rollback()
+                metrics.incr("health.batch_fallbacks")
+                print(f"Batch recalculation failed for {len(chunk)} accounts, scoring them one at a time: {e}")
+                scores.update(await self._calculate_each(chunk, triggered_by))
+        return scores
+
+    async def _calculate_each(self, account_ids: List[UUID], triggered_by: str) -> Dict[UUID, HealthScore]:
+        scores: Dict[UUID, HealthScore] = {}
+        for account_id in account_ids:
+            try:
+                scores[account_id] = await self.calculate_health(account_id, triggered_by)
+            except ValueError:  # unknown account, skipped as in the batch path
+                self.db.rollback()
+            except Exception as e:
+                self.db.rollback()
+                print(f"Failed to recalculate health for account {account_id}: {e}")
+        return scores
+
+    async def _calculate_chunk(self, account_ids: List[UUID], triggered_by: str) -> Dict[UUID, HealthScore]:
+        accounts, previous, recent, contacts = self._load_many(account_ids)
+
+        # Steps 3-5 for the whole chunk at once, then 6-7 per account
+        loaded = [recent.get(account.id, (None, [])) for account in accounts]
+        arrays = pack(
+            [extractions for _, extractions in loaded],
+            [last_date for last_date, _ in loaded],
+            [account.check_in_interval_days for account in accounts],
+            [contacts.get(account.id, 0) for account in accounts]
+        )
+        pillars = score_pillars(arrays)
+        overall, decay_applied = apply_decay(arrays, pillars.overall, self.DECAY_RATE_PER_DAY, self.DECAY_FLOOR)
+        pillar_rows = np.column_stack(pillars[:6]).tolist()
+
+        scored = []
+        for i, account in enumerate(accounts):
+            health, signals = self._assemble(
+                account,
+                tuple(pillar_rows[i]),
+                int(overall[i]),
+                bool(decay_applied[i]),
+                previous.get(account.id),
+                data_fingerprint(account, *loaded[i], contacts.get(account.id, 0)),
+                loaded[i][1],
+                triggered_by
+            )
+            scored.append((account, health, signals))
+
+        rows, job_rows = [], []
+        for _, health, signals in scored:
+            health.id = uuid.uuid4()
+            job = self._summary_job(health, signals)
+            if job is not None:
+                job_rows.append({"id": uuid.uuid4(), **job})
+            rows.append({column.key: getattr(health, column.key) for column in HealthScore.__table__.columns})
+        if rows:
+            self.db.execute(insert(HealthScore), rows)
+            if job_rows:
+                self.db.execute(insert(HealthSummaryJob), job_rows)
+            self.db.commit()
+        return {health.account_id: health for _, health, _ in scored}
+
+    def _load_many(self, account_ids: List[UUID]) -> Tuple[
+        List[Account],
+        Dict[UUID, Row],
+        Dict[UUID, Tuple[Optional[datetime], List[SignalExtraction]]],
+        Dict[UUID, int]
+    ]:
+        """
+        Everything score_account reads, for many accounts at once: the accounts,
+        their latest score (overall, status, fingerprint and summary), the last
+        content date and the extractions of their RECENT_INPUT_LIMIT most recent
+        processed inputs (in the order score_account sorts them), and their
+        contact counts.
+        """
+        accounts = self.db.query(Account).filter(Account.id.in_(account_ids)).all()
+
+        latest = select(
+            HealthScore.account_id,
+            HealthScore.overall_score,
+            HealthScore.overall_status,
+            HealthScore.input_fingerprint,
+            HealthScore.ai_summary,
+            func.row_number().over(
+                partition_by=HealthScore.account_id,
+                order_by=desc(HealthScore.calculated_at)
+            ).label("rank")
+        ).where(HealthScore.account_id.in_(account_ids)).subquery()
+        previous = {
+            row.account_id: row
+            for row in self.db.query(
+                latest.c.account_id,
+                latest.c.overall_score,
+                latest.c.overall_status,
+                latest.c.input_fingerprint,
+                latest.c.ai_summary
+            ).filter(latest.c.rank == 1).all()
+        }
+
+        ranked = select(
+            Input.id,
+            Input.account_id,
+            Input.content_date,
+            func.row_number().over(
+                partition_by=Input.account_id,
+                order_by=(desc(Input.content_date), Input.id)
+            ).label("rank")
+        ).where(
+            Input.account_id.in_(account_ids),
+            Input.is_processed == True
+        ).subquery()
+        rows = self.db.query(ranked.c.account_id, ranked.c.rank, ranked.c.content_date, SignalExtraction).outerjoin(
+            SignalExtraction, SignalExtraction.input_id == ranked.c.id
+        ).filter(
+            ranked.c.rank <= RECENT_INPUT_LIMIT
+        ).all()
+
+        recent: Dict[UUID, Tuple[Optional[datetime], List[SignalExtraction]]] = {}
+        for account_id, rank, content_date, extraction in rows:
+            if rank == 1:
+                recent[account_id] = (content_date, recent.get(account_id, (None, []))[1])
+            if extraction is not None:
+                recent.setdefault(account_id, (None, []))[1].append((rank, extraction))
+        for account_id, (last_date, ranked_extractions) in recent.items():
+            ranked_extractions.sort(key=lambda item: (item[0], str(item[1].id)))
+            recent[account_id] = (last_date, [ext for _, ext in ranked_extractions])
+
+        contacts = dict(
+            self.db.query(Contact.account_id, func.count(Contact.id)).filter(
+                Contact.account_id.in_(account_ids)
+            ).group_by(Contact.account_id).all()
+        )
+        return accounts, previous, recent, contacts
+
+    def score_account(self, account_id: UUID, triggered_by: str = "manual") -> Tuple[Account, HealthScore, List[str]]:
+        """
+        Steps 0-7: pillar scores, decay and trend, without the AI summary.
+        Returns the account, an unsaved HealthScore and the signals for the summary.
+        """
         account = self.db.query(Account).filter(Account.id == account_id).first()
         if not account:
             raise ValueError("Account not found")
 
-        # 0. Get previous score for trend tracking
-        previous_score, _ = self._get_previous_score(account_id)
+        # 0. Get previous score for trend tracking (and its summary, if still valid)
+        _, previous = self._get_previous_score(account_id)
 
         # 1. Fetch recent inputs & extractions
         recent_inputs = self.db.query(Input).filter(
             Input.account_id == account_id,
             Input.is_processed == True
-        ).order_by(desc(Input.content_date)).limit(10).all()
+        ).order_by(desc(Input.content_date), Input.id).limit(RECENT_INPUT_LIMIT).all()
         
         input_ids = [inp.id for inp in recent_inputs]
         extractions = []
@@ -132,16 +383,32 @@ class HealthCalculator:
             extractions = self.db.query(SignalExtraction).filter(
                 SignalExtraction.input_id.in_(input_ids)
             ).all()
+        # Most recent input first, so the summary signals come out in a stable order
+        rank = {input_id: i for i, input_id in enumerate(input_ids)}
+        extractions.sort(key=lambda ext: (rank.get(ext.input_id, 0), str(ext.id)))
         
         # 2. Fetch contact count
         contact_count = self.db.query(Contact).filter(
             Contact.account_id == account_id
         ).count()
         
+        last_date = recent_inputs[0].content_date if recent_inputs else None
+        health, signals = self._score(account, previous, last_date, extractions, contact_count, triggered_by)
+        return account, health, signals
+
+    def _score(
+        self,
+        account: Account,
+        previous: Optional[HealthScore],
+        last_date: Optional[datetime],
+        extractions: List[SignalExtraction],
+        contact_count: int,
+        triggered_by: str
+    ) -> Tuple[HealthScore, List[str]]:
+        """Steps 3-7 on already loaded data, one account at a time."""
         # 3. Calculate Pillars
         sentiment_score = SentimentPillar.calculate(extractions)
         
-        last_date = recent_inputs[0].content_date if recent_inputs else None
         engagement_score = EngagementPillar.calculate(
             last_date, 
             account.check_in_interval_days or 14
@@ -170,6 +437,32 @@ class HealthCalculator:
             last_date
         )
         
+        pillars = (sentiment_score, engagement_score, request_score,
+                   relationship_score, satisfaction_score, expansion_score)
+        fingerprint = data_fingerprint(account, last_date, extractions, contact_count)
+        return self._assemble(
+            account, pillars, overall_score, decay_applied, previous, fingerprint, extractions, triggered_by
+        )
+
+    def _assemble(
+        self,
+        account: Account,
+        pillars: Tuple[int, int, int, int, int, int],
+        overall_score: int,
+        decay_applied: bool,
+        previous: Optional[HealthScore],
+        fingerprint: str,
+        extractions: List[SignalExtraction],
+        triggered_by: str
+    ) -> Tuple[HealthScore, List[str]]:
+        """
+        Steps 6-7 once the pillars (in PILLAR_WEIGHTS order) and the decayed
+        score are known. The previous AI summary is carried over when the data
+        fingerprint and the status are unchanged; otherwise ai_summary is None.
+        """
+        (sentiment_score, engagement_score, request_score,
+         relationship_score, satisfaction_score, expansion_score) = pillars
+        
         # Update triggered_by if decay was the main factor
         if decay_applied and triggered_by == "daily_job":
             triggered_by = "decay"
@@ -183,30 +476,20 @@ class HealthCalculator:
             status = "healthy"
         
         # 7. Calculate Trend
+        previous_score = previous.overall_score if previous is not None else None
         score_change, trend_direction = self._calculate_trend(
             overall_score, 
             previous_score
         )
-            
-        # 8. Generate AI Assessment
+        
         all_signals = []
         for ext in extractions:
             if ext.signals:
                 all_signals.extend(ext.signals)
-        unique_signals = list(set(all_signals))[:5] 
-        
-        ai_summary = await self.assessment_gen.generate_summary(
-            account_name=account.name,
-            score=overall_score,
-            status=status,
-            sentiment=sentiment_score,
-            engagement=engagement_score,
-            signals=unique_signals
-        )
+        unique_signals = list(dict.fromkeys(all_signals))[:5]
 
-        # 9. Save Score with Trend Data
         health = HealthScore(
-            account_id=account_id,
+            account_id=account.id,
             overall_score=overall_score,
             overall_status=status,
             sentiment_score=sentiment_score,
@@ -215,14 +498,25 @@ class HealthCalculator:
             relationship_score=relationship_score,
             satisfaction_score=satisfaction_score,
             expansion_score=expansion_score,
-            ai_summary=ai_summary,
             # New trend fields
             previous_score=previous_score,
             score_change=score_change,
             trend_direction=trend_direction,
             triggered_by=triggered_by,
+            input_fingerprint=fingerprint,
             calculated_at=datetime.utcnow()
         )
+        if (
+            previous is not None
+            and previous.input_fingerprint == fingerprint
+            and previous.overall_status == status
+            and previous.ai_summary not in (None, NO_PROVIDER_MESSAGE, FAILED_MESSAGE)
+        ):
+            health.ai_summary = previous.ai_summary
+            health.summary_status = "completed"
+        return health, unique_signals
+
+    def _save(self, health: HealthScore) -> HealthScore:
         self.db.add(health)
         self.db.commit()
         self.db.refresh(health)
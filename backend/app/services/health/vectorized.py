@@ -0,0 +1,175 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.models.signal_extraction import SignalExtraction
+
+# Signal categories, as bits; the keyword tests and their order are those of pillars.py
+SIGNAL_BUG = 1
+SIGNAL_REQUEST = 2
+SIGNAL_HAPPY = 4
+SIGNAL_UNHAPPY = 8
+SIGNAL_EXPANSION = 16
+
+SENTIMENT_POINTS = {"positive": 100, "negative": 0}  # anything else counts as neutral
+NEUTRAL_POINTS = 50
+DEFAULT_CHECK_IN_DAYS = 14
+
+# sentiment, engagement, request, relationship, satisfaction, expansion
+PILLAR_WEIGHTS = (0.20, 0.20, 0.15, 0.15, 0.15, 0.15)
+
+
+@lru_cache(maxsize=65536)
+def signal_mask(signal: str) -> int:
+    """Category bits of one signal string."""
+    s = signal.lower()
+    mask = 0
+    if "bug" in s or "issue" in s:
+        mask |= SIGNAL_BUG
+    if "request" in s or "feature" in s:
+        mask |= SIGNAL_REQUEST
+    # "unhappy" and "dissatisfied" contain the positive words; positive wins, as in SatisfactionPillar
+    if "happy" in s or "love" in s or "satisfied" in s:
+        mask |= SIGNAL_HAPPY
+    elif "unhappy" in s or "frustrated" in s or "dissatisfied" in s:
+        mask |= SIGNAL_UNHAPPY
+    if "upsell" in s or "expansion" in s or "growth" in s or "add-on" in s:
+        mask |= SIGNAL_EXPANSION
+    return mask
+
+
+class PortfolioArrays(NamedTuple):
+    """
+    Columnar pillar inputs for n accounts. Extractions and signals are stored
+    account by account; account i owns extraction_points[extraction_offsets[i]:
+    extraction_offsets[i + 1]] and likewise for signal_masks.
+    """
+    extraction_offsets: np.ndarray  # int64, n + 1
+    extraction_points: np.ndarray   # int64, sentiment points per extraction
+    signal_offsets: np.ndarray      # int64, n + 1
+    signal_masks: np.ndarray        # uint8, category bits per signal
+    days_since: np.ndarray          # int64, days since the last interaction (0 where there is none)
+    has_interaction: np.ndarray     # bool
+    intervals: np.ndarray           # int64, check-in interval in days
+    contacts: np.ndarray            # int64
+
+
+class PillarScores(NamedTuple):
+    sentiment: np.ndarray
+    engagement: np.ndarray
+    request: np.ndarray
+    relationship: np.ndarray
+    satisfaction: np.ndarray
+    expansion: np.ndarray
+    overall: np.ndarray  # weighted, before decay
+
+
+def pack(
+    extractions: Sequence[Sequence[SignalExtraction]],
+    last_dates: Sequence[Optional[datetime]],
+    intervals: Sequence[Optional[int]],
+    contact_counts: Sequence[int],
+    now: Optional[datetime] = None
+) -> PortfolioArrays:
+    """Pack per-account extractions, last interaction dates, check-in intervals and contact counts."""
+    now = now or datetime.utcnow()
+    extraction_counts: List[int] = []
+    signal_counts: List[int] = []
+    points: List[int] = []
+    masks: List[int] = []
+    for account_extractions in extractions:
+        signals_before = len(masks)
+        for ext in account_extractions:
+            points.append(SENTIMENT_POINTS.get(ext.sentiment, NEUTRAL_POINTS))
+            if ext.signals:
+                masks.extend(signal_mask(signal) for signal in ext.signals)
+        extraction_counts.append(len(account_extractions))
+        signal_counts.append(len(masks) - signals_before)
+
+    dates = np.array(last_dates, dtype="datetime64[us]")
+    has_interaction = ~np.isnat(dates)
+    now64 = np.datetime64(now, "us")
+    # Floor division, like timedelta.days; accounts without interactions count as 0 days
+    days_since = ((now64 - np.where(has_interaction, dates, now64)) // np.timedelta64(1, "D")).astype(np.int64)
+
+    return PortfolioArrays(
+        extraction_offsets=_offsets(extraction_counts),
+        extraction_points=np.array(points, dtype=np.int64),
+        signal_offsets=_offsets(signal_counts),
+        signal_masks=np.array(masks, dtype=np.uint8),
+        days_since=days_since,
+        has_interaction=has_interaction,
+        intervals=np.array([i or DEFAULT_CHECK_IN_DAYS for i in intervals], dtype=np.int64),
+        contacts=np.array(contact_counts, dtype=np.int64),
+    )
+
+
+def _offsets(counts: List[int]) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _segment_sum(offsets: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Sum of values over each account's segment; empty segments sum to 0."""
+    n = len(offsets) - 1
+    segment_ids = np.repeat(np.arange(n), np.diff(offsets))
+    return np.bincount(segment_ids, weights=values, minlength=n).astype(np.int64)
+
+
+def score_pillars(arrays: PortfolioArrays) -> PillarScores:
+    """The six pillars and the weighted overall score for every account, identical to pillars.py."""
+    n_extractions = np.diff(arrays.extraction_offsets)
+    n_signals = np.diff(arrays.signal_offsets)
+    no_extractions = n_extractions == 0
+    masks = arrays.signal_masks
+
+    def count(bit: int) -> np.ndarray:
+        return _segment_sum(arrays.signal_offsets, (masks & bit) != 0)
+
+    # Sentiment: mean sentiment points, 50 without extractions
+    sentiment_sum = _segment_sum(arrays.extraction_offsets, arrays.extraction_points)
+    sentiment = np.where(no_extractions, NEUTRAL_POINTS, sentiment_sum // np.maximum(n_extractions, 1))
+
+    # Engagement: step down per check-in interval elapsed
+    days, interval = arrays.days_since, arrays.intervals
+    engagement = np.select(
+        [~arrays.has_interaction, days <= interval, days <= interval * 2, days <= interval * 3],
+        [0, 100, 70, 40],
+        default=0
+    )
+
+    request = np.where(no_extractions, 100, np.maximum(0, 100 - 30 * count(SIGNAL_BUG) - 15 * count(SIGNAL_REQUEST)))
+    relationship = np.select([arrays.contacts <= 0, arrays.contacts == 1], [0, 50], default=100)
+
+    # Satisfaction: mean over signals (happy 100, unhappy 0, other 50), sentiment when there are none
+    signal_points = np.where(masks & SIGNAL_HAPPY, 100, np.where(masks & SIGNAL_UNHAPPY, 0, 50))
+    satisfaction_sum = _segment_sum(arrays.signal_offsets, signal_points)
+    satisfaction = np.where(
+        no_extractions, 50,
+        np.where(n_signals == 0, sentiment, satisfaction_sum // np.maximum(n_signals, 1))
+    )
+
+    expansion = np.where(no_extractions, 0, np.minimum(100, 50 * count(SIGNAL_EXPANSION)))
+
+    pillars = (sentiment, engagement, request, relationship, satisfaction, expansion)
+    # Same summation order as the scalar formula, so the float rounding matches too
+    weighted = np.zeros(len(arrays.contacts), dtype=np.float64)
+    for pillar, weight in zip(pillars, PILLAR_WEIGHTS):
+        weighted = weighted + pillar * weight
+    pillars = tuple(p.astype(np.int64) for p in pillars)
+    return PillarScores(*pillars, overall=weighted.astype(np.int64))
+
+
+def apply_decay(arrays: PortfolioArrays, overall: np.ndarray, rate: int, floor: int):
+    """
+    HealthCalculator._apply_decay for every account.
+    Returns (adjusted_scores, decay_applied).
+    """
+    overdue = arrays.days_since - arrays.intervals
+    decayed = np.maximum(floor, overall - overdue * rate)
+    adjusted = np.where(~arrays.has_interaction, floor, np.where(overdue > 0, decayed, overall))
+    applied = ~arrays.has_interaction | (overdue * rate > 0)
+    return adjusted.astype(np.int64), applied
@@ -0,0 +1,167 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Set
+from uuid import UUID
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.health_recalc import PendingHealthRecalc
+
+
+class ClaimedRecalc(NamedTuple):
+    account_id: UUID
+    request_count: int
+    claimed_at: datetime
+
+
+def request_recalculation(db: Session, account_id: UUID) -> None:
+    """
+    Ask for a health recalculation without running it. Requests for an account
+    that already has one pending are folded into it: the run moves to
+    HEALTH_RECALC_DEBOUNCE_SECONDS after the latest request, but never later
+    than HEALTH_RECALC_MAX_DELAY_SECONDS after the first. A request for an
+    account whose recalculation is already running starts a fresh window, so
+    the running one won't consume it.
+    """
+    now = datetime.utcnow()
+    debounce = timedelta(seconds=settings.HEALTH_RECALC_DEBOUNCE_SECONDS)
+    metrics.incr("health_recalc.requested")
+
+    pending = db.query(PendingHealthRecalc).filter(
+        PendingHealthRecalc.account_id == account_id
+    ).with_for_update().first()
+
+    if pending is None:
+        try:
+            # Savepoint: another worker may be inserting the same account right now
+            with db.begin_nested():
+                db.add(PendingHealthRecalc(
+                    account_id=account_id,
+                    request_count=1,
+                    first_requested_at=now,
+                    run_after=now + debounce
+                ))
+            db.commit()
+            return
+        except IntegrityError:
+            pending = db.query(PendingHealthRecalc).filter(
+                PendingHealthRecalc.account_id == account_id
+            ).with_for_update().first()
+            if pending is None:
+                # Completed in between; the recalculation may predate our input
+                db.add(PendingHealthRecalc(account_id=account_id, first_requested_at=now, run_after=now + debounce))
+                db.commit()
+                return
+
+    if pending.claimed_at is not None:
+        # Running (or its worker died): the input may postdate what it read
+        pending.claimed_at = None
+        pending.request_count = 1
+        pending.first_requested_at = now
+        pending.run_after = now + debounce
+        db.commit()
+        return
+
+    deadline = pending.first_requested_at + timedelta(seconds=settings.HEALTH_RECALC_MAX_DELAY_SECONDS)
+    pending.request_count += 1
+    pending.run_after = min(now + debounce, deadline)
+    db.commit()
+    metrics.incr("health_recalc.saved")
+
+
+def claim_due(db: Session, limit: int = 50) -> List[ClaimedRecalc]:
+    """
+    Lease recalculations that are due. The rows stay until finish_claims
+    deletes them after the score is saved; a lease older than
+    INGEST_LEASE_SECONDS belongs to a dead worker and is claimed again.
+    """
+    now = datetime.utcnow()
+    lease_cutoff = now - timedelta(seconds=settings.INGEST_LEASE_SECONDS)
+    rows = db.query(PendingHealthRecalc).filter(
+        PendingHealthRecalc.run_after <= now,
+        or_(PendingHealthRecalc.claimed_at.is_(None), PendingHealthRecalc.claimed_at < lease_cutoff)
+    ).order_by(PendingHealthRecalc.run_after).limit(limit).with_for_update(skip_locked=True).all()
+
+    claimed = [ClaimedRecalc(row.account_id, row.request_count, now) for row in rows]
+    for row in rows:
+        row.claimed_at = now
+    db.commit()
+    return claimed
+
+
+def finish_claims(db: Session, claimed: List[ClaimedRecalc], succeeded: Set[UUID]) -> None:
+    """
+    Delete the rows of recalculations that saved a score and release the
+    others to run again after the debounce. Rows re-requested meanwhile
+    no longer carry our lease and are left alone.
+    """
+    if not claimed:
+        return
+    claimed_at = claimed[0].claimed_at
+    done = [c.account_id for c in claimed if c.account_id in succeeded]
+    failed = [c.account_id for c in claimed if c.account_id not in succeeded]
+    if done:
+        db.query(PendingHealthRecalc).filter(
+            PendingHealthRecalc.account_id.in_(done),
+            PendingHealthRecalc.claimed_at == claimed_at
+        ).delete(synchronize_session=False)
+    if failed:
+        retry_at = datetime.utcnow() + timedelta(seconds=settings.HEALTH_RECALC_DEBOUNCE_SECONDS)
+        db.query(PendingHealthRecalc).filter(
+            PendingHealthRecalc.account_id.in_(failed),
+            PendingHealthRecalc.claimed_at == claimed_at
+        ).update({
+            PendingHealthRecalc.claimed_at: None,
+            PendingHealthRecalc.run_after: retry_at
+        }, synchronize_session=False)
+    db.commit()
+
+
+async def run_due_recalculations(db: Session) -> int:
+    """Run every due recalculation once, as one batch. Returns how many ran."""
+    from app.services.health.calculator import HealthCalculator
+    claimed = claim_due(db)
+    if not claimed:
+        return 0
+    try:
+        scores = await HealthCalculator(db).calculate_health_many(
+            [c.account_id for c in claimed], triggered_by="input_added"
+        )
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to recalculate health for {len(claimed)} accounts: {e}")
+        scores = {}
+    finish_claims(db, claimed, set(scores))
+
+    for account_id, request_count, _ in claimed:
+        score = scores.get(account_id)
+        if score is None:
+            metrics.incr("health_recalc.failed")
+            print(f"Failed to recalculate health for {account_id}, requeued")
+            continue
+        metrics.incr("health_recalc.runs")
+        print(f"Health recalculated for {account_id} after {request_count} input(s): "
+              f"{score.overall_score} ({score.trend_direction})")
+    return len(scores)
+
+
+async def recalc_loop(stop: asyncio.Event, worker_name: str = "health-recalc") -> None:
+    """Poll for due recalculations until `stop` is set."""
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            await run_due_recalculations(db)
+        except Exception as e:
+            print(f"[{worker_name}] Health recalculation pass failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.INGEST_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,146 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.account import Account
+from app.models.health_score import HealthScore
+from app.models.health_summary_job import HealthSummaryJob
+from app.services.health.assessment import FAILED_MESSAGE, NO_PROVIDER_MESSAGE, HealthAssessmentGenerator
+from app.services.job_lease import keep_lease
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+def summary_job_row(health_score_id: UUID, signals: List[str]) -> dict:
+    """Values for a queued HealthSummaryJob, for db.add or a multi-row INSERT alike."""
+    return {
+        "health_score_id": health_score_id,
+        "signals": signals,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": settings.HEALTH_SUMMARY_MAX_ATTEMPTS,
+        "run_after": datetime.utcnow(),
+    }
+
+
+def claim_next_summary(db: Session) -> Optional[HealthSummaryJob]:
+    """Claim one due summary job; same SKIP LOCKED, lease and last-attempt rules as the ingest queue."""
+    now = datetime.utcnow()
+    lease_cutoff = now - timedelta(seconds=settings.INGEST_LEASE_SECONDS)
+    while True:
+        job = db.query(HealthSummaryJob).filter(
+            or_(
+                and_(HealthSummaryJob.status == "queued", HealthSummaryJob.run_after <= now),
+                and_(HealthSummaryJob.status == "running", HealthSummaryJob.started_at < lease_cutoff)
+            )
+        ).order_by(HealthSummaryJob.run_after).with_for_update(skip_locked=True).first()
+
+        if not job:
+            db.commit()  # release the snapshot
+            return None
+        if job.attempts < job.max_attempts:
+            break
+
+        job.status = "failed"
+        job.last_error = f"Gave up after {job.attempts} attempts; the last one never finished"
+        job.finished_at = now
+        db.query(HealthScore).filter(HealthScore.id == job.health_score_id).update(
+            {"ai_summary": FAILED_MESSAGE, "summary_status": "failed"}, synchronize_session=False
+        )
+        db.commit()
+        metrics.incr("health_summary.failed")
+
+    job.status = "running"
+    job.attempts += 1
+    job.started_at = now
+    db.commit()
+    return job
+
+
+async def run_summary_job(db: Session, job_id: UUID) -> None:
+    """
+    Generate and store the summary for one claimed job. A score that has
+    already been replaced by a newer one for the same account is not
+    summarized at all; a failed generation is retried with backoff.
+    """
+    job = db.query(HealthSummaryJob).filter(HealthSummaryJob.id == job_id).first()
+    if job is None:  # the score was deleted, and its job with it
+        return
+    heartbeat = asyncio.ensure_future(keep_lease(HealthSummaryJob, job_id, job.attempts))
+    try:
+        await _summarize(db, job)
+    finally:
+        heartbeat.cancel()
+
+
+async def _summarize(db: Session, job: HealthSummaryJob) -> None:
+    score = db.query(HealthScore).filter(HealthScore.id == job.health_score_id).first()
+    now = datetime.utcnow()
+
+    newer = db.query(HealthScore.id).filter(
+        HealthScore.account_id == score.account_id,
+        HealthScore.calculated_at > score.calculated_at
+    ).first()
+    if newer:
+        score.summary_status = "superseded"
+        job.status = "completed"
+        job.finished_at = now
+        db.commit()
+        metrics.incr("health_summary.superseded")
+        return
+
+    account = db.query(Account).filter(Account.id == score.account_id).first()
+    summary = await HealthAssessmentGenerator(db).generate_summary(
+        account_name=account.name,
+        score=score.overall_score,
+        status=score.overall_status,
+        sentiment=score.sentiment_score,
+        engagement=score.engagement_score,
+        signals=job.signals or []
+    )
+
+    if summary == FAILED_MESSAGE and job.attempts < job.max_attempts:
+        delay = min(MAX_BACKOFF_SECONDS, settings.INGEST_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+        job.status = "queued"
+        job.last_error = summary
+        job.run_after = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+        db.commit()
+        metrics.incr("health_summary.retried")
+        return
+
+    failed = summary in (FAILED_MESSAGE, NO_PROVIDER_MESSAGE)
+    score.ai_summary = summary
+    score.summary_status = "failed" if failed else "completed"
+    job.status = "failed" if failed else "completed"
+    job.last_error = summary if failed else None
+    job.finished_at = datetime.utcnow()
+    db.commit()
+    metrics.incr("health_summary.failed" if failed else "health_summary.completed")
+
+
+async def summary_loop(stop: asyncio.Event, worker_name: str = "health-summary") -> None:
+    """Claim and write summaries one at a time until `stop` is set."""
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            job = claim_next_summary(db)
+            if job is not None:
+                await run_summary_job(db, job.id)
+                continue
+        except Exception as e:
+            print(f"[{worker_name}] Health summary job failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.INGEST_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
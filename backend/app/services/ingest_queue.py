@@ -0,0 +1,164 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ingest_job import IngestJob
+from app.models.input import Input
+from app.services.intelligence import IntelligenceService
+from app.services.health_recalc import recalc_loop
+from app.services.health_summary import summary_loop
+from app.services.job_lease import keep_lease
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+def enqueue_input(db: Session, input_id: UUID) -> IngestJob:
+    """Queue a saved input for processing by the workers."""
+    job = IngestJob(
+        input_id=input_id,
+        status="queued",
+        max_attempts=settings.INGEST_MAX_ATTEMPTS,
+        run_after=datetime.utcnow()
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    metrics.incr("ingest.enqueued")
+    return job
+
+
+def claim_next_job(db: Session) -> Optional[IngestJob]:
+    """
+    Claim one due job. SKIP LOCKED lets many workers poll the same table
+    without blocking on (or double-claiming) each other's rows. Jobs left
+    'running' by a crashed worker are reclaimed once their lease expires,
+    unless that was their last attempt: those are failed instead.
+    """
+    now = datetime.utcnow()
+    lease_cutoff = now - timedelta(seconds=settings.INGEST_LEASE_SECONDS)
+    while True:
+        job = db.query(IngestJob).filter(
+            or_(
+                and_(IngestJob.status == "queued", IngestJob.run_after <= now),
+                and_(IngestJob.status == "running", IngestJob.started_at < lease_cutoff)
+            )
+        ).order_by(IngestJob.run_after).with_for_update(skip_locked=True).first()
+
+        if not job:
+            db.commit()  # release the snapshot
+            return None
+        if job.attempts < job.max_attempts:
+            break
+
+        job.status = "failed"
+        job.last_error = f"Gave up after {job.attempts} attempts; the last one never finished"
+        job.finished_at = now
+        db.commit()
+        metrics.incr("ingest.failed")
+        print(f"Ingest job {job.id} failed permanently: {job.last_error}")
+
+    job.status = "running"
+    job.attempts += 1
+    job.started_at = now
+    db.commit()
+    return job
+
+
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given (1-based) attempt."""
+    delay = min(MAX_BACKOFF_SECONDS, settings.INGEST_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def run_job(job_id: UUID) -> None:
+    """Run the intelligence pipeline for one claimed job, in its own session."""
+    db = SessionLocal()
+    heartbeat = None
+    try:
+        job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+        if job is None:  # deleted since it was claimed
+            return
+        heartbeat = asyncio.ensure_future(keep_lease(IngestJob, job_id, job.attempts))
+        db_input = db.query(Input).filter(Input.id == job.input_id).first()
+        try:
+            if not db_input:
+                raise ValueError(f"Input {job.input_id} no longer exists")
+            extraction = await IntelligenceService(db).analyze_input(db_input)
+            job.status = "completed"
+            job.extraction_id = extraction.id if extraction else None
+            job.last_error = None
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            metrics.incr("ingest.completed")
+        except Exception as e:
+            db.rollback()
+            job = db.query(IngestJob).filter(IngestJob.id == job_id).first()
+            job.last_error = str(e)
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+                job.finished_at = datetime.utcnow()
+                metrics.incr("ingest.failed")
+                print(f"Ingest job {job_id} failed permanently: {e}")
+            else:
+                job.status = "queued"
+                job.run_after = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+                metrics.incr("ingest.retried")
+                print(f"Ingest job {job_id} attempt {job.attempts} failed, retrying at {job.run_after}: {e}")
+            db.commit()
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+        db.close()
+
+
+async def worker_loop(stop: asyncio.Event, worker_name: str = "worker") -> None:
+    """Claim and run jobs one at a time until `stop` is set."""
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            job = claim_next_job(db)
+            job_id = job.id if job else None
+        except Exception as e:
+            print(f"[{worker_name}] Failed to claim ingest job: {e}")
+            db.rollback()
+            job_id = None
+        finally:
+            db.close()
+
+        if job_id is None:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.INGEST_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        await run_job(job_id)
+
+
+def start_workers(count: int, stop: asyncio.Event) -> list:
+    """
+    Start `count` worker loops on the running event loop, plus one loop that
+    runs the debounced health recalculations those jobs request. The
+    HEALTH_SUMMARY_WORKERS loops that write the AI summaries of saved scores
+    start regardless of `count`: scores calculated from the API need them
+    even when ingestion is left to app.worker.
+    """
+    tasks = [
+        asyncio.ensure_future(summary_loop(stop, worker_name=f"health-summary-{i}"))
+        for i in range(settings.HEALTH_SUMMARY_WORKERS)
+    ]
+    if count <= 0:
+        return tasks
+    tasks.extend(
+        asyncio.ensure_future(worker_loop(stop, worker_name=f"worker-{i}"))
+        for i in range(count)
+    )
+    tasks.append(asyncio.ensure_future(recalc_loop(stop)))
+    return tasks
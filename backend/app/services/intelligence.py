@@ -1,17 +1,62 @@
+import asyncio
 import json
 from sqlalchemy.orm import Session
 from uuid import UUID
+from typing import Optional
 from datetime import datetime
 
 from app.models.input import Input
 from app.models.signal_extraction import SignalExtraction
-from app.models.llm_config import LLMConfiguration
 from app.schemas.intelligence import InputCreate, AnalysisResult
-from app.services.keyword_scanner import scan_text, should_analyze_with_llm
-from app.services.llm.factory import LLMClientFactory
-from app.core.security import decrypt_string
+from app.services.keyword_scanner import scan_hits, should_analyze_with_llm
+from app.services.lexicon import refresh_matcher
+from app.services.content_cache import (
+    content_hash,
+    scan_cache,
+    extraction_key,
+    get_cached_extraction,
+    store_extraction,
+)
+from app.services.chunked_extraction import chunk_budget, merge_results, split_into_chunks
+from app.services.health_recalc import request_recalculation
+from app.services.near_duplicate import near_duplicates, novel_text, word_count
+from app.services.email_parser import analysis_text, parse_email_input
+from app.services.llm.registry import FALLBACK, ActiveLLM, get_active_llm
+from app.services.llm.scheduler import llm_scheduler
+from app.services.llm.usage import estimate_tokens
+from app.core import metrics
+from app.core.config import settings
 from app.core.prompts import SIGNAL_EXTRACTION_SYSTEM_PROMPT, SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE
 
+PARSE_FAILED_SUMMARY = "Failed to parse analysis results."
+
+
+def input_row(input_data: InputCreate, now: Optional[datetime] = None) -> dict:
+    """
+    Column values for a new input. Shared by save_input and the bulk importer
+    so both store the same row for the same payload.
+    """
+    row = {
+        "account_id": input_data.account_id,
+        "input_type": input_data.input_type,
+        "content": input_data.content,
+        "sender": input_data.sender,
+        "folder": input_data.folder,
+        "subject": None,
+        "recipients": None,
+        "content_date": input_data.content_date,
+    }
+    if input_data.input_type == "email":
+        # Pasted emails carry their own headers; fill in what the caller left out
+        parsed = parse_email_input(input_data.content)
+        row["subject"] = parsed['subject']
+        row["recipients"] = parsed['recipients'] or None
+        row["sender"] = row["sender"] or parsed['sender_email']
+        if row["content_date"] is None and parsed['date'] is not None:
+            row["content_date"] = parsed['date'].astimezone().replace(tzinfo=None)
+    row["content_date"] = row["content_date"] or now or datetime.now()
+    return row
+
 
 class IntelligenceService:
     """
@@ -32,28 +77,52 @@ class IntelligenceService:
         4. Extract commitments → create reminders
         5. Optionally trigger health recalculation
         """
-        # 1. Save Input to DB
-        db_input = Input(
-            account_id=input_data.account_id,
-            input_type=input_data.input_type,
-            content=input_data.content,
-            sender=input_data.sender,
-            content_date=input_data.content_date or datetime.now(),
-            is_processed=False
-        )
+        db_input = self.save_input(input_data)
+        return await self.analyze_input(db_input, auto_recalculate_health)
+
+    def save_input(self, input_data: InputCreate, commit: bool = True) -> Input:
+        """
+        Step 1 on its own: store the raw input, unprocessed. With commit=False
+        the row is only flushed, so callers can add to the same transaction.
+        """
+        db_input = Input(**input_row(input_data), is_processed=False)
         self.db.add(db_input)
+        if not commit:
+            self.db.flush()
+            return db_input
         self.db.commit()
         self.db.refresh(db_input)
+        return db_input
+
+    async def analyze_input(self, db_input: Input, auto_recalculate_health: bool = True) -> Optional[SignalExtraction]:
+        """
+        Steps 2-5 for an input that is already saved. Safe to retry: an input
+        that already finished processing just returns its extraction.
+        """
+        if db_input.is_processed:
+            return self.db.query(SignalExtraction).filter(
+                SignalExtraction.input_id == db_input.id
+            ).first()
+
+        # Emails are scanned and analyzed without their quoted history, signature
+        # and legal footer, so old keywords aren't counted again on every reply
+        text = analysis_text(db_input.input_type, db_input.content)
 
-        # 2. Keyword Scan (free, fast)
-        scan_result = scan_text(input_data.content)
+        # 2. Keyword Scan (free, fast) - picks up lexicon edits from other workers,
+        # and repeated content (forwards, re-pasted notes) reuses the earlier scan
+        matcher = refresh_matcher(self.db)
+        scan_key = (content_hash(text), matcher.version)
+        scan_result = scan_cache.get(scan_key)
+        if scan_result is None:
+            scan_result = scan_hits(text)
+            scan_cache.put(scan_key, scan_result)
         
         extraction = None
         
         # 3. Determine if LLM Analysis is needed
         if should_analyze_with_llm(scan_result):
             print(f"Triggering LLM analysis for input {db_input.id}")
-            analysis = await self._run_llm_analysis(input_data)
+            analysis = await self._analyze_with_llm(db_input, text)
             
             # 4. Save Extraction with both keyword and LLM results
             extraction = SignalExtraction(
@@ -64,6 +133,7 @@ class IntelligenceService:
                 action_signals=scan_result.action_signals,
                 compliance_signals=scan_result.compliance_signals,
                 keyword_severity=scan_result.keyword_severity,
+                lexicon_version=scan_result.lexicon_version,
                 # LLM results
                 sentiment=analysis.sentiment,
                 summary=analysis.summary,
@@ -89,7 +159,7 @@ class IntelligenceService:
                 
                 if desc:
                     reminder = Reminder(
-                        account_id=input_data.account_id,
+                        account_id=db_input.account_id,
                         source_input_id=db_input.id,
                         description=desc,
                         due_date=due_date,
@@ -106,7 +176,7 @@ class IntelligenceService:
             print(f"Skipping LLM analysis for input {db_input.id} (low severity)")
             
             # Still save keyword-only extraction if we found anything
-            if scan_result.matches:
+            if scan_result.has_matches:
                 extraction = SignalExtraction(
                     input_id=db_input.id,
                     churn_signals=scan_result.churn_signals,
@@ -114,6 +184,7 @@ class IntelligenceService:
                     action_signals=scan_result.action_signals,
                     compliance_signals=scan_result.compliance_signals,
                     keyword_severity=scan_result.keyword_severity,
+                    lexicon_version=scan_result.lexicon_version,
                     llm_analyzed=False,
                     llm_analysis_status="skipped"
                 )
@@ -124,14 +195,24 @@ class IntelligenceService:
 
         # 6. Trigger Health Recalculation
         if auto_recalculate_health:
-            await self._recalculate_account_health(input_data.account_id)
+            await self._recalculate_account_health(db_input.account_id)
 
         return extraction
 
     async def _recalculate_account_health(self, account_id: UUID):
         """
         Trigger health score recalculation after new input is processed.
+        Debounced per account, so a burst of inputs costs one recalculation
+        (and one AI summary) instead of one per input.
         """
+        if settings.HEALTH_RECALC_DEBOUNCE_SECONDS > 0:
+            try:
+                request_recalculation(self.db, account_id)
+            except Exception as e:
+                self.db.rollback()
+                print(f"Failed to schedule health recalculation: {e}")
+            return
+
         try:
             from app.services.health.calculator import HealthCalculator
             calculator = HealthCalculator(self.db)
@@ -144,40 +225,131 @@ class IntelligenceService:
             print(f"Failed to recalculate health: {e}")
             # Don't fail the whole input processing if health calc fails
 
-    async def _run_llm_analysis(self, input_data: InputCreate) -> AnalysisResult:
-        """Run LLM analysis on the input content."""
-        # Fetch active config
-        config = self.db.query(LLMConfiguration).filter(
-            LLMConfiguration.is_active == True
+    async def reextract(self, db_input: Input) -> AnalysisResult:
+        """
+        A fresh LLM extraction for an input that was already processed (used by
+        reprocessing). Nothing is saved, and the near-duplicate reuse is skipped:
+        the point is a new answer.
+        """
+        return await self._run_llm_analysis(db_input, analysis_text(db_input.input_type, db_input.content))
+
+    async def _analyze_with_llm(self, db_input: Input, content: str) -> AnalysisResult:
+        """
+        LLM analysis, skipped or narrowed when the input mostly repeats a recent
+        one for the same account (replies quoting the thread, re-sent notes):
+        an input that adds (almost) nothing new reuses the earlier extraction,
+        any other repeat sends only its new lines to the LLM.
+        """
+        if not settings.NEAR_DUP_ENABLED:
+            return await self._run_llm_analysis(db_input, content)
+        match = await near_duplicates.find(self.db, db_input, content)
+        if match is None:
+            return await self._run_llm_analysis(db_input, content)
+
+        earlier = self.db.query(Input.input_type, Input.content).filter(Input.id == match.input_id).first()
+        new_text = novel_text(analysis_text(*earlier) if earlier else "", content)
+        previous = self.db.query(SignalExtraction).filter(
+            SignalExtraction.input_id == match.input_id,
+            SignalExtraction.llm_analyzed.is_(True)
         ).first()
-        
-        if not config:
+
+        # A long quoted thread keeps similarity high even under a new paragraph that matters
+        trivial = not new_text or (match.similarity >= settings.NEAR_DUP_REUSE_THRESHOLD
+                                   and word_count(new_text) <= settings.NEAR_DUP_REUSE_MAX_NEW_WORDS)
+        if previous is not None and trivial:
+            print(f"Input {db_input.id} repeats input {match.input_id} ({match.similarity:.0%}), reusing its extraction")
+            metrics.incr("near_dup.skipped_calls")
+            metrics.incr("near_dup.tokens_saved", estimate_tokens(content))
+            # Commitments already became reminders on the earlier input
+            return AnalysisResult(
+                sentiment=previous.sentiment or "neutral",
+                summary=previous.summary or "",
+                signals=previous.signals or [],
+                action_items=previous.action_items or []
+            )
+        if new_text:
+            print(f"Input {db_input.id} repeats input {match.input_id} ({match.similarity:.0%}), analyzing new text only")
+            metrics.incr("near_dup.narrowed_calls")
+            metrics.incr("near_dup.tokens_saved", estimate_tokens(content) - estimate_tokens(new_text))
+            return await self._run_llm_analysis(db_input, new_text)
+        return await self._run_llm_analysis(db_input, content)
+
+    async def _run_llm_analysis(self, db_input: Input, content: Optional[str] = None) -> AnalysisResult:
+        """Run LLM analysis on the input content (or on `content`, the part of it that matters)."""
+        content = content or db_input.content
+        # Active config and its long-lived client (cached per process)
+        active = get_active_llm(self.db)
+        if not active:
             raise ValueError("No active LLM configuration found")
 
-        # Decrypt key
-        api_key = decrypt_string(config.api_key_encrypted)
-        
-        # Instantiate provider
-        llm = LLMClientFactory.create(config.provider, api_key, config.model_name)
-        
         # Prepare Prompt
         from app.models.account import Account
         account = self.db.query(Account).filter(
-            Account.id == input_data.account_id
+            Account.id == db_input.account_id
         ).first()
-        account_name = account.name if account else "Unknown"
+        prompt_args = {
+            "account_name": account.name if account else "Unknown",
+            "date": db_input.content_date or datetime.now(),
+            "sender": db_input.sender
+        }
 
-        prompt = SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE.format(
-            account_name=account_name,
-            content=input_data.content,
-            date=input_data.content_date or datetime.now(),
-            sender=input_data.sender
+        # Duplicate content: reuse the earlier extraction, skip the LLM round trip
+        cache_key = extraction_key(content_hash(content), active.provider, active.model_name, prompt_args)
+        cached = get_cached_extraction(self.db, cache_key, db_input.id)
+        if cached is not None:
+            print("Reusing cached LLM extraction for duplicate content")
+            return cached
+        
+        llm = active.client
+        # Optional second provider for hedged requests when the primary is slow
+        backup = get_active_llm(self.db, role=FALLBACK)
+
+        # Long inputs (meeting transcripts) are split to fit the model's context
+        # and a bounded per-call budget, extracted concurrently, then merged
+        overhead = llm.count_tokens(
+            SIGNAL_EXTRACTION_SYSTEM_PROMPT + SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE.format(content="", **prompt_args)
         )
+        chunks = split_into_chunks(content, chunk_budget(active.model_name, overhead), llm.count_tokens)
+        
+        if len(chunks) == 1:
+            analysis = await self._extract(active, backup, content, prompt_args)
+            complete = analysis is not None
+        else:
+            print(f"Extracting input {db_input.id} in {len(chunks)} chunks")
+            metrics.incr("extraction.chunked_inputs")
+            metrics.incr("extraction.chunks", len(chunks))
+            results = await asyncio.gather(*[
+                self._extract(active, backup, f"[Part {i} of {len(chunks)} of a longer input]\n{chunk}", prompt_args)
+                for i, chunk in enumerate(chunks, start=1)
+            ])
+            parsed = [(result, llm.count_tokens(chunk)) for result, chunk in zip(results, chunks) if result is not None]
+            complete = len(parsed) == len(chunks)
+            analysis = merge_results([r for r, _ in parsed], [w for _, w in parsed]) if parsed else None
+        
+        if analysis is None:
+            return AnalysisResult(
+                sentiment="neutral",
+                summary=PARSE_FAILED_SUMMARY,
+                signals=[],
+                action_items=[]
+            )
+        # Partial merges (a chunk failed to parse) aren't cached, so a retry can do better
+        if complete:
+            store_extraction(self.db, cache_key, analysis, db_input.id)
+        return analysis
+
+    async def _extract(self, active: ActiveLLM, backup: Optional[ActiveLLM], content: str,
+                       prompt_args: dict) -> Optional[AnalysisResult]:
+        """One extraction call. Returns None if the response isn't valid JSON."""
+        prompt = SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE.format(content=content, **prompt_args)
         
         # Generate
-        response_text = await llm.generate_text(
+        response_text = await llm_scheduler.hedged_generate_text(
+            active,
+            backup,
             prompt, 
-            system_prompt=SIGNAL_EXTRACTION_SYSTEM_PROMPT
+            system_prompt=SIGNAL_EXTRACTION_SYSTEM_PROMPT,
+            stage="extraction"
         )
         
         # Parse JSON
@@ -194,9 +366,4 @@ class IntelligenceService:
             )
         except json.JSONDecodeError:
             print(f"Failed to parse LLM response: {response_text}")
-            return AnalysisResult(
-                sentiment="neutral",
-                summary="Failed to parse analysis results.",
-                signals=[],
-                action_items=[]
-            )
+            return None
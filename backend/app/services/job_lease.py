@@ -0,0 +1,42 @@
+import asyncio
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+# Refreshes per lease period, so one slow or missed write doesn't let it lapse
+HEARTBEATS_PER_LEASE = 3
+
+
+def _touch(model, job_id: UUID, attempt: int) -> None:
+    db = SessionLocal()
+    try:
+        # Only our own claim: if the lease already lapsed and another worker took
+        # the job, its attempt number has moved on
+        db.query(model).filter(
+            model.id == job_id,
+            model.status == "running",
+            model.attempts == attempt
+        ).update({"started_at": datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+    except SQLAlchemyError as e:
+        print(f"Lease heartbeat for {model.__tablename__} {job_id} failed: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def keep_lease(model, job_id: UUID, attempt: int) -> None:
+    """
+    Keep a claimed job's lease (its started_at) fresh while it runs, so a job
+    that legitimately takes longer than INGEST_LEASE_SECONDS isn't reclaimed
+    and run twice. Runs until cancelled; writes go through their own session
+    on the default executor, off the event loop.
+    """
+    interval = settings.INGEST_LEASE_SECONDS / HEARTBEATS_PER_LEASE
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        await loop.run_in_executor(None, _touch, model, job_id, attempt)
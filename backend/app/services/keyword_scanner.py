@@ -1,4 +1,8 @@
-from typing import List, Dict, Any
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple, Union
 from pydantic import BaseModel
 
 class KeywordMatch(BaseModel):
@@ -13,6 +17,7 @@ class ScanResult(BaseModel):
     compliance_signals: List[str] = []
     keyword_severity: str = "low"
     matches: List[KeywordMatch] = []
+    lexicon_version: int = 0
 
 # Lexicon from Spec
 CHURN_SIGNALS = {
@@ -114,46 +119,352 @@ COMPLIANCE_SIGNALS = {
     ]
 }
 
+SEVERITIES = ("low", "medium", "high", "critical")
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITIES)}
+
+# Keywords and text are split into the same whitespace-delimited tokens.
+# Apostrophes and hyphens stay inside words ("won't", "c-suite"), while other
+# punctuation becomes a token of its own so phrases never match across it.
+# Matching whole tokens means "ato" can never match inside "potato".
+_REPLACEMENTS = (
+    [("\u2019", "'"), ("\u2018", "'")]
+    + [(c, f" {c} ") for c in '.,!?;:"()[]{}<>/\\|*+=\u201c\u201d\u2014\u2013\u2026']
+)
+
+# A quote or hyphen that isn't inside a word ("'cancel'", "-- exit") is split
+# off; "won't" and "off-board" stay whole
+_WORD_EDGE_MARK = re.compile(r"(?<!\w)['-]|['-](?!\w)")
+
+
+# The last whitespace character (anything str.split() splits on) and the word after it
+_TRAILING_WORD = re.compile(r"\s\S*\Z")
+
+# The end of the text that a following chunk could still change the tokens of:
+# a word (quotes and hyphens inside it included) with an optional quote or
+# hyphen on either side. Smart quotes count, tokenize() turns them into "'".
+_UNFINISHED_WORD = re.compile(r"(?:['\u2018\u2019-]?\w+(?:['\u2018\u2019-]\w+)*)?['\u2018\u2019-]?\Z")
+
+
+def tokenize(text: str) -> List[str]:
+    text = text.lower()
+    for old, new in _REPLACEMENTS:
+        if old in text:
+            text = text.replace(old, new)
+    text = _WORD_EDGE_MARK.sub(r" \g<0> ", text)
+    return text.split()
+
+
+class LexiconMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    The whole lexicon is compiled once into a trie with failure links, so a scan
+    is a single pass over the text's tokens regardless of how many keywords
+    there are. Matching on token boundaries gives whole-word semantics.
+    """
+
+    def __init__(self, lexicon: List[Tuple[str, Dict[str, List[str]], Optional[str]]], version: int = 0):
+        self.version = version
+        # Pattern table, in lexicon order: (keyword, group, category, severity)
+        self.patterns: List[Tuple[str, str, str, str]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[int, ...]] = [()]
+        # Length of the longest keyword token; a longer word can never match
+        self.longest_token = 0
+
+        for group, signal_dict, base_severity in lexicon:
+            for category, keywords in signal_dict.items():
+                severity = category if base_severity is None else base_severity
+                for keyword in keywords:
+                    tokens = tokenize(keyword)
+                    if not tokens:
+                        continue
+                    self._add(tokens, len(self.patterns))
+                    self.longest_token = max(self.longest_token, *map(len, tokens))
+                    self.patterns.append((keyword, group, category, severity))
+
+        self._ranks = [SEVERITY_RANK[severity] for _, _, _, severity in self.patterns]
+        self._build_transitions()
+
+    def _add(self, tokens: List[str], pattern_id: int) -> None:
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._out.append(())
+            node = nxt
+        self._out[node] += (pattern_id,)
+
+    def _build_transitions(self) -> None:
+        """
+        Compute failure links and fold them into a deterministic transition
+        table. Transitions back to the root are left implicit: a token missing
+        from `_delta[state]` continues from the root's goto table.
+        """
+        root = self._goto[0]
+        fail = [0] * len(self._goto)
+        self._delta: List[Dict[str, int]] = [{} for _ in self._goto]
+        queue = deque(root.values())
+        while queue:
+            node = queue.popleft()
+            # Failure state was processed earlier (it is shallower), so its
+            # transitions are already complete.
+            delta = dict(self._delta[fail[node]])
+            delta.update(self._goto[node])
+            self._delta[node] = delta
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                if node:
+                    target = self._delta[fail[node]].get(token) or root.get(token, 0)
+                else:
+                    target = 0
+                fail[child] = target
+                # Inherit outputs of the failure state so every suffix match is reported
+                self._out[child] += self._out[target]
+
+    def feed(self, tokens: Iterable[str], found: Set[int], state: int = 0) -> int:
+        """
+        Advance the automaton over `tokens`, adding matched pattern ids to `found`.
+        Returns the final state so a scan can be resumed on more tokens.
+        """
+        delta = self._delta
+        out = self._out
+        root_get = self._goto[0].get
+        for token in tokens:
+            state = delta[state].get(token) or root_get(token, 0)
+            if out[state]:
+                found.update(out[state])
+        return state
+
+    def find(self, text: str) -> Set[int]:
+        found: Set[int] = set()
+        self.feed(tokenize(text), found)
+        return found
+
+    def hits(self, found: Iterable[int]) -> "ScanHits":
+        ids = tuple(sorted(found))
+        ranks = self._ranks
+        top_rank = max([ranks[i] for i in ids], default=0)
+        return ScanHits(self.patterns, ids, top_rank, self.version)
+
+    def build_result(self, found: Iterable[int]) -> ScanResult:
+        """Assemble a ScanResult from matched pattern ids, in lexicon order."""
+        return self.hits(found).to_result()
+
+    def scan_hits(self, text: str) -> "ScanHits":
+        return self.hits(self.find(text))
+
+    def scan(self, text: str) -> ScanResult:
+        return self.build_result(self.find(text))
+
+
+class ScanHits:
+    """
+    Compact scan result for the internal pipeline: the matched pattern ids
+    (in lexicon order) plus the top severity as an int. Keyword lists are
+    derived on access; call to_result() for the pydantic ScanResult at the
+    API boundary.
+    """
+
+    __slots__ = ("patterns", "pattern_ids", "severity_rank", "lexicon_version")
+
+    def __init__(self, patterns: List[Tuple[str, str, str, str]], pattern_ids: Tuple[int, ...],
+                 severity_rank: int, lexicon_version: int):
+        self.patterns = patterns
+        self.pattern_ids = pattern_ids
+        self.severity_rank = severity_rank
+        self.lexicon_version = lexicon_version
+
+    def _keywords(self, group: str) -> List[str]:
+        patterns = self.patterns
+        return [patterns[i][0] for i in self.pattern_ids if patterns[i][1] == group]
+
+    @property
+    def churn_signals(self) -> List[str]:
+        return self._keywords("churn")
+
+    @property
+    def positive_signals(self) -> List[str]:
+        return self._keywords("positive")
+
+    @property
+    def action_signals(self) -> List[str]:
+        return self._keywords("action")
+
+    @property
+    def compliance_signals(self) -> List[str]:
+        return self._keywords("compliance")
+
+    @property
+    def keyword_severity(self) -> str:
+        return SEVERITIES[self.severity_rank]
+
+    @property
+    def has_matches(self) -> bool:
+        return bool(self.pattern_ids)
+
+    def to_result(self) -> ScanResult:
+        patterns = self.patterns
+        return ScanResult(
+            churn_signals=self.churn_signals,
+            positive_signals=self.positive_signals,
+            action_signals=self.action_signals,
+            compliance_signals=self.compliance_signals,
+            keyword_severity=self.keyword_severity,
+            matches=[
+                KeywordMatch(keyword=patterns[i][0], category=patterns[i][2], severity=patterns[i][3])
+                for i in self.pattern_ids
+            ],
+            lexicon_version=self.lexicon_version
+        )
+
+
+# Base severity per signal group - churn signals use their category as severity
+GROUP_SEVERITY = {
+    "churn": None,
+    "positive": "low",  # Positive signals don't drive severity usually, but we track them
+    "action": "medium",
+    "compliance": "high",  # Compliance is important
+}
+
+# Built-in lexicon (version 0), used until one is stored in the database
+DEFAULT_LEXICON = [
+    ("churn", CHURN_SIGNALS, GROUP_SEVERITY["churn"]),
+    ("positive", POSITIVE_SIGNALS, GROUP_SEVERITY["positive"]),
+    ("action", ACTION_SIGNALS, GROUP_SEVERITY["action"]),
+    ("compliance", COMPLIANCE_SIGNALS, GROUP_SEVERITY["compliance"]),
+]
+
+_matcher: Optional[LexiconMatcher] = None
+
+
+def get_matcher() -> LexiconMatcher:
+    """Compile the lexicon on first use and reuse the automaton afterwards."""
+    global _matcher
+    if _matcher is None:
+        _matcher = LexiconMatcher(DEFAULT_LEXICON)
+    return _matcher
+
+
+def install_matcher(matcher: LexiconMatcher) -> None:
+    """
+    Swap in a newly compiled matcher. Rebinding the module global is atomic, and
+    scans already running keep the matcher they started with.
+    """
+    global _matcher
+    _matcher = matcher
+
+
 def scan_text(text: str) -> ScanResult:
-    text_lower = text.lower()
-    
-    result = ScanResult()
-    
-    # helper to process category dicts
-    def process_dict(signal_dict: Dict[str, List[str]], target_list: List[str], base_severity: str = None):
-        for category, keywords in signal_dict.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    # Determine severity
-                    severity = base_severity if base_severity else "low"
-                    
-                    # For churn signals, the category key IS the severity
-                    if signal_dict is CHURN_SIGNALS:
-                        severity = category
-                    
-                    match = KeywordMatch(
-                        keyword=keyword,
-                        category=category,
-                        severity=severity
-                    )
-                    
-                    result.matches.append(match)
-                    target_list.append(keyword)
-                    
-                    # Update global severity
-                    current_sev_rank = {"low": 0, "medium": 1, "high": 2, "critical": 3}
-                    if current_sev_rank[severity] > current_sev_rank[result.keyword_severity]:
-                        result.keyword_severity = severity
-
-    # Process all signals
-    process_dict(CHURN_SIGNALS, result.churn_signals)
-    process_dict(POSITIVE_SIGNALS, result.positive_signals, base_severity="low") # Positive signals don't drive severity usually, but we track them
-    process_dict(ACTION_SIGNALS, result.action_signals, base_severity="medium")
-    process_dict(COMPLIANCE_SIGNALS, result.compliance_signals, base_severity="high") # Compliance is important
-
-    return result
-
-def should_analyze_with_llm(scan_result: ScanResult) -> bool:
+    return get_matcher().scan(text)
+
+
+def scan_hits(text: str) -> ScanHits:
+    """Like scan_text, but returns the compact ScanHits used inside the pipeline."""
+    return get_matcher().scan_hits(text)
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_chunks(source: Union[str, Iterable[str], IO[str]], chunk_size: int) -> Iterator[str]:
+    if isinstance(source, str):
+        for i in range(0, len(source), chunk_size):
+            yield source[i:i + chunk_size]
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        # Producers may hand over arbitrarily large pieces; re-slice them
+        for piece in source:
+            for i in range(0, len(piece), chunk_size):
+                yield piece[i:i + chunk_size]
+
+
+def scan_stream(source: Union[str, Iterable[str], IO[str]], chunk_size: int = STREAM_CHUNK_SIZE) -> ScanResult:
+    """
+    Scan a large document chunk by chunk. `source` can be an iterator of text
+    chunks, a text-mode file object, or a (large) string.
+
+    Only the current chunk plus the unfinished word at its end is held in memory;
+    the automaton state carries over between chunks, so phrases that straddle a
+    chunk boundary are still found. Returns the same ScanResult as scan_text.
+    """
+    matcher = get_matcher()
+    # A word this long can't match, so only its ends need keeping
+    keep = matcher.longest_token + 4
+    found: Set[int] = set()
+    state = 0
+    carry = ""
+    for chunk in _iter_chunks(source, chunk_size):
+        text = carry + chunk
+        boundary = _TRAILING_WORD.search(text)
+        # Everything before the unfinished word tokenizes the same whatever follows
+        cut = _UNFINISHED_WORD.search(text, boundary.start() + 1 if boundary else 0).start()
+        if cut:
+            state = matcher.feed(tokenize(text[:cut]), found, state)
+        carry = text[cut:]
+        if len(carry) > 2 * keep:
+            # Pathologically long word: drop its middle rather than grow without
+            # bound. It still ends up one token too long to match anything.
+            carry = carry[:keep].rstrip("'\u2018\u2019-") + carry[-2:]
+    matcher.feed(tokenize(carry), found, state)
+    return matcher.build_result(found)
+
+
+# Matcher shipped to each pool worker by _init_worker
+_worker_matcher: Optional[LexiconMatcher] = None
+
+
+def _init_worker(matcher: LexiconMatcher) -> None:
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _find_batch(texts: List[str]) -> List[Tuple[int, ...]]:
+    return [tuple(_worker_matcher.find(text)) for text in texts]
+
+
+def scan_many_hits(texts: Iterable[str], processes: Optional[int] = 1, chunk_size: int = 256) -> List[ScanHits]:
+    """
+    Scan a batch of texts with one compiled matcher. Results are ScanHits, in
+    input order.
+
+    With processes > 1 (or None for one per CPU) the batch is sharded across a
+    process pool. Workers receive the parent's matcher once at start-up and only
+    send back matched pattern ids, so results are assembled locally.
+    """
+    matcher = get_matcher()
+    texts = list(texts)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes <= 1 or len(texts) <= chunk_size:
+        return [matcher.scan_hits(text) for text in texts]
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(processes, len(chunks)),
+        initializer=_init_worker,
+        initargs=(matcher,)
+    ) as pool:
+        for found_batch in pool.map(_find_batch, chunks):
+            results.extend(matcher.hits(found) for found in found_batch)
+    return results
+
+
+def scan_many(texts: Iterable[str], processes: Optional[int] = 1, chunk_size: int = 256) -> List[ScanResult]:
+    """scan_text for a batch of texts (see scan_many_hits), as ScanResults in input order."""
+    return [hits.to_result() for hits in scan_many_hits(texts, processes, chunk_size)]
+
+def should_analyze_with_llm(scan_result: Union[ScanResult, ScanHits]) -> bool:
     """
     Determine if LLM analysis is warranted based on keyword scan.
     """
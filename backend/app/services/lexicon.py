@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.lexicon import LexiconKeyword, LexiconRevision
+from app.services.keyword_scanner import (
+    DEFAULT_LEXICON,
+    GROUP_SEVERITY,
+    LexiconMatcher,
+    get_matcher,
+    install_matcher,
+)
+
+_compile_lock = threading.Lock()
+_last_checked = 0.0
+
+
+def get_current_version(db: Session) -> int:
+    """Latest lexicon revision in the DB, or 0 when the built-in lexicon is in use."""
+    return db.query(func.max(LexiconRevision.version)).scalar() or 0
+
+
+def load_lexicon(db: Session) -> List[Tuple[str, Dict[str, List[str]], Optional[str]]]:
+    """Build the (group, {category: keywords}, base severity) structure from the DB."""
+    keywords = db.query(LexiconKeyword).filter(
+        LexiconKeyword.is_active == True
+    ).order_by(LexiconKeyword.created_at, LexiconKeyword.keyword).all()
+    
+    groups: Dict[str, Dict[str, List[str]]] = {group: {} for group in GROUP_SEVERITY}
+    for kw in keywords:
+        groups.setdefault(kw.signal_group, {}).setdefault(kw.category, []).append(kw.keyword)
+    return [(group, categories, GROUP_SEVERITY.get(group)) for group, categories in groups.items()]
+
+
+def refresh_matcher(db: Session, force: bool = False) -> LexiconMatcher:
+    """
+    Make sure this worker scans with the current lexicon version.
+    
+    The version check is a single cheap query, throttled to once every
+    LEXICON_REFRESH_SECONDS unless `force` is set. When the version has moved,
+    the new lexicon is compiled off to the side and installed in one step, so
+    scans already running finish on the matcher they started with.
+    """
+    global _last_checked
+    now = time.monotonic()
+    if not force and now - _last_checked < settings.LEXICON_REFRESH_SECONDS:
+        return get_matcher()
+    _last_checked = now
+    
+    version = get_current_version(db)
+    if version == get_matcher().version:
+        return get_matcher()
+    
+    # Only one thread compiles; others keep scanning with the old matcher
+    if not _compile_lock.acquire(blocking=False):
+        return get_matcher()
+    try:
+        if version == 0:
+            matcher = LexiconMatcher(DEFAULT_LEXICON)
+        else:
+            matcher = LexiconMatcher(load_lexicon(db), version=version)
+        install_matcher(matcher)
+        print(f"Lexicon matcher compiled for version {version} ({len(matcher.patterns)} keywords)")
+        return matcher
+    finally:
+        _compile_lock.release()
+
+
+def ensure_seeded(db: Session) -> None:
+    """
+    Copy the built-in lexicon into the DB before its first edit, so editing one
+    keyword doesn't replace the whole lexicon with just that keyword.
+    """
+    if get_current_version(db):
+        return
+    for group, signal_dict, _ in DEFAULT_LEXICON:
+        for category, keywords in signal_dict.items():
+            for keyword in keywords:
+                db.add(LexiconKeyword(keyword=keyword, signal_group=group, category=category))
+    db.add(LexiconRevision(description="Seeded from built-in lexicon"))
+    db.flush()
+
+
+def record_revision(db: Session, description: str) -> int:
+    """Bump the lexicon version after a change and recompile locally."""
+    revision = LexiconRevision(description=description)
+    db.add(revision)
+    db.commit()
+    refresh_matcher(db, force=True)
+    return revision.version
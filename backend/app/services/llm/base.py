@@ -1,10 +1,80 @@
+import asyncio
+import functools
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable
+
+from app.core.config import settings
+
+# Shared pool for SDKs without an async client, so a blocking call never runs on the event loop
+_blocking_pool = ThreadPoolExecutor(max_workers=settings.LLM_THREAD_POOL_SIZE, thread_name_prefix="llm")
+
 
 class LLMProvider(ABC):
     def __init__(self, api_key: str, model: str):
         self.api_key = api_key
         self.model = model
+        self.timeout = settings.LLM_TIMEOUT_SECONDS
+
+    async def _run_blocking(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a synchronous SDK call in the LLM thread pool, bounded by the per-call timeout."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        return await asyncio.wait_for(loop.run_in_executor(_blocking_pool, call), timeout=self.timeout)
+
+    async def _stream_blocking(self, fn: Callable[[], Iterable[str]]) -> AsyncIterator[str]:
+        """
+        Iterate a synchronous streaming SDK call in the thread pool, yielding pieces as they arrive.
+        If the consumer stops early (client disconnected, timeout), the producer thread stops
+        reading and closes the SDK stream instead of draining it.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        cancelled = threading.Event()
+
+        def send(item):
+            if not cancelled.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def produce():
+            stream = None
+            try:
+                stream = fn()
+                for piece in stream:
+                    if cancelled.is_set():
+                        break
+                    send(piece)
+            except Exception as e:
+                send(e)
+            finally:
+                close = getattr(stream, "close", None)
+                if cancelled.is_set() and close is not None:
+                    try:
+                        close()
+                    except Exception:
+                        pass
+                send(done)
+
+        loop.run_in_executor(_blocking_pool, produce)
+        try:
+            while True:
+                item = await asyncio.wait_for(queue.get(), timeout=self.timeout)
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+
+    async def stream_text(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        """
+        Generate text as a stream of pieces. Providers with a streaming API
+        override this; the default yields the whole completion at once.
+        """
+        yield await self.generate_text(prompt, system_prompt=system_prompt)
 
     @abstractmethod
     async def generate_text(self, prompt: str, system_prompt: str = None) -> str:
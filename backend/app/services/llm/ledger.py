@@ -0,0 +1,145 @@
+import asyncio
+import queue
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.llm_call import LLMCall
+from .base import LLMProvider
+from .usage import CallUsage, end_usage, start_usage
+
+
+def price_for(model: str) -> Optional[tuple]:
+    """(input, output) USD per million tokens for the longest matching model prefix."""
+    matches = [prefix for prefix in settings.LLM_PRICING if (model or "").startswith(prefix)]
+    if not matches:
+        return None
+    return tuple(settings.LLM_PRICING[max(matches, key=len)])
+
+
+def call_status(error: Optional[BaseException]) -> str:
+    if error is None:
+        return "success"
+    if isinstance(error, asyncio.CancelledError):
+        return "cancelled"  # lost a hedged race
+    if getattr(error, "status_code", None) == 429:
+        return "rate_limited"
+    if isinstance(error, asyncio.TimeoutError) or "Timeout" in type(error).__name__:
+        return "timeout"
+    return "error"
+
+
+def build_entry(provider: str, llm: LLMProvider, stage: str, prompt_text: str, usage: CallUsage,
+                latency: float, error: Optional[BaseException] = None, streamed: bool = False,
+                route: str = "primary") -> LLMCall:
+    """Ledger row for one call, falling back to local estimates for counts the API didn't report."""
+    estimated = usage.prompt_tokens is None or usage.completion_tokens is None
+    prompt_tokens = usage.prompt_tokens
+    if prompt_tokens is None:
+        prompt_tokens = llm.count_tokens(prompt_text)
+    completion_tokens = usage.completion_tokens
+    if completion_tokens is None:
+        completion_tokens = llm.count_tokens(usage.completion_text)
+
+    cost = None
+    price = price_for(llm.model)
+    if price:
+        cost = (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+    return LLMCall(
+        provider=str(getattr(provider, "value", provider)),
+        model=llm.model,
+        stage=stage,
+        status=call_status(error),
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        tokens_estimated=estimated,
+        cost_usd=cost,
+        latency_ms=int(latency * 1000),
+        streamed=streamed,
+        route=route,
+        error=str(error)[:1000] if error else None
+    )
+
+
+# Rows waiting for the writer thread, and how many it commits at a time
+_pending: "queue.Queue[LLMCall]" = queue.Queue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+WRITE_BATCH_SIZE = 100
+
+
+def write_entries(entries: List[LLMCall]) -> None:
+    """Write rows in their own session, so they never ride on (or break) a caller's transaction."""
+    db = SessionLocal()
+    try:
+        db.add_all(entries)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to record {len(entries)} LLM call(s): {e}")
+    finally:
+        db.close()
+
+
+def _write_pending() -> None:
+    while True:
+        batch = [_pending.get()]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(_pending.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            write_entries(batch)
+        finally:
+            for _ in batch:
+                _pending.task_done()
+
+
+def save_entry(entry: LLMCall) -> None:
+    """
+    Count the tokens and hand the row to the writer thread. Never blocks: a
+    synchronous INSERT and COMMIT per attempt would stall the event loop.
+    """
+    global _writer
+    metrics.incr(f"llm.{entry.stage}.prompt_tokens", entry.prompt_tokens or 0)
+    metrics.incr(f"llm.{entry.stage}.completion_tokens", entry.completion_tokens or 0)
+    if not settings.LLM_LEDGER_ENABLED:
+        return
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_write_pending, name="llm-ledger", daemon=True)
+            _writer.start()
+    _pending.put(entry)
+
+
+def flush_ledger() -> None:
+    """Block until every row handed to save_entry so far is written (shutdown, tests)."""
+    _pending.join()
+
+
+@asynccontextmanager
+async def metered_call(provider: str, llm: LLMProvider, stage: str, prompt_text: str, streamed: bool = False,
+                       route: str = "primary"):
+    """
+    Wrap one LLM request. Yields a CallUsage that the provider fills in with
+    reported token counts; callers set usage.completion_text for the estimate
+    fallback. The ledger row is written when the block exits, error or not.
+    """
+    usage, token = start_usage()
+    started = time.perf_counter()
+    error = None
+    try:
+        yield usage
+    except (Exception, asyncio.CancelledError) as e:
+        error = e
+        raise
+    finally:
+        end_usage(token)
+        save_entry(build_entry(provider, llm, stage, prompt_text, usage,
+                               time.perf_counter() - started, error, streamed, route))
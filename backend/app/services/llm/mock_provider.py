@@ -1,11 +1,115 @@
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional
+from types import SimpleNamespace
+from pydantic import BaseModel
 from .base import LLMProvider
+from .usage import estimate_tokens
+from app.core.config import settings
+import asyncio
 import json
+import math
+import random
+import time
+
+
+class MockProfile(BaseModel):
+    """
+    Latency and fault behaviour for MockProvider. The defaults answer
+    instantly and never fail, which is what unit tests want.
+    """
+    latency_median_ms: float = 0
+    latency_p99_ms: float = 0          # Log-normal latency between median and p99
+    ms_per_output_token: float = 0     # Pace of streamed output
+    error_rate: float = 0              # Fraction of calls failing with a 500/503
+    timeout_rate: float = 0            # Fraction of calls that hang until the provider timeout
+    rpm_limit: int = 0                 # 429 with Retry-After beyond this many requests per minute
+    burst_every_seconds: float = 0     # Periodic 429 storms: every N seconds...
+    burst_seconds: float = 0           # ...lasting this long
+    content_aware: bool = False        # Derive extractions from the keyword scan of the input
+    seed: Optional[int] = None
+
+
+MOCK_PROFILES: Dict[str, MockProfile] = {
+    "instant": MockProfile(),
+    "realistic": MockProfile(
+        latency_median_ms=1200, latency_p99_ms=6000, ms_per_output_token=15,
+        error_rate=0.01, timeout_rate=0.002, content_aware=True
+    ),
+    "degraded": MockProfile(
+        latency_median_ms=4000, latency_p99_ms=30000, ms_per_output_token=40,
+        error_rate=0.08, timeout_rate=0.02, content_aware=True
+    ),
+    "rate_limited": MockProfile(
+        latency_median_ms=1200, latency_p99_ms=6000, ms_per_output_token=15,
+        rpm_limit=20, burst_every_seconds=60, burst_seconds=10, content_aware=True
+    ),
+}
+
+
+def get_profile(model: str) -> MockProfile:
+    """
+    Profile for a mock model: "mock-realistic" (or just "realistic") picks a
+    named profile, anything else uses settings.MOCK_LLM_PROFILE. Fields in
+    settings.MOCK_LLM_PROFILE_OVERRIDES are applied on top.
+    """
+    name = (model or "").replace("mock-", "", 1)
+    base = MOCK_PROFILES.get(name) or MOCK_PROFILES.get(settings.MOCK_LLM_PROFILE, MOCK_PROFILES["instant"])
+    return base.model_copy(update=settings.MOCK_LLM_PROFILE_OVERRIDES)
+
+
+class MockAPIError(Exception):
+    """Looks like an SDK APIStatusError to the scheduler: status_code plus response headers."""
+
+    def __init__(self, status_code: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"Error code: {status_code} - {message}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
 
 class MockProvider(LLMProvider):
-    async def generate_text(self, prompt: str, system_prompt: str = None) -> str:
+    def __init__(self, api_key: str, model: str, profile: Optional[MockProfile] = None):
+        super().__init__(api_key, model)
+        self.profile = profile or get_profile(model)
+        self.rng = random.Random(self.profile.seed)
+        self._recent_calls = []
+
+    def _latency(self) -> float:
+        """Seconds for one call, drawn from a log-normal fitted to the median and p99."""
+        median = self.profile.latency_median_ms / 1000
+        if median <= 0:
+            return 0.0
+        p99 = max(self.profile.latency_p99_ms / 1000, median)
+        sigma = math.log(p99 / median) / 2.326
+        return self.rng.lognormvariate(math.log(median), sigma)
+
+    async def _inject_faults(self) -> None:
+        """Raise the 429s, 5xx and timeouts the profile calls for, after a realistic delay."""
+        profile = self.profile
+        now = time.monotonic()
+
+        if profile.burst_every_seconds and (time.time() % profile.burst_every_seconds) < profile.burst_seconds:
+            retry_after = profile.burst_seconds - (time.time() % profile.burst_every_seconds)
+            raise MockAPIError(429, "rate_limit_error (burst)", {"retry-after": f"{retry_after:.2f}"})
+
+        if profile.rpm_limit:
+            self._recent_calls = [t for t in self._recent_calls if now - t < 60]
+            if len(self._recent_calls) >= profile.rpm_limit:
+                retry_after = 60 - (now - self._recent_calls[0])
+                raise MockAPIError(429, "rate_limit_error", {"retry-after": f"{retry_after:.2f}"})
+            self._recent_calls.append(now)
+
+        roll = self.rng.random()
+        if roll < profile.timeout_rate:
+            await asyncio.sleep(self.timeout)
+            raise asyncio.TimeoutError(f"Mock call to {self.model} timed out")
+        await asyncio.sleep(self._latency())
+        if roll < profile.timeout_rate + profile.error_rate:
+            raise MockAPIError(self.rng.choice([500, 503]), "api_error (injected)")
+
+    def _respond(self, prompt: str, system_prompt: str = None) -> str:
         # Check if looking for JSON (Signal Extraction)
         if "Return a JSON object" in prompt or "Signal Extraction" in str(system_prompt):
+            if self.profile.content_aware:
+                return json.dumps(self._extraction_from_scan(prompt))
             return json.dumps({
                 "sentiment": "negative",
                 "summary": "Customer is threatening to cancel due to price.",
@@ -13,12 +117,50 @@ class MockProvider(LLMProvider):
                 "commitments": [{"description": "Send updated contract", "due_date": "2025-12-25"}],
                 "action_items": ["Schedule renewal review", "Discuss discount options"]
             })
-        
+
         # Otherwise, return text (Health Assessment)
+        if self.profile.content_aware and "Status:" in prompt:
+            status = prompt.split("Status:")[1].split(")")[0].strip()
+            return (f"This account is currently {status.replace('_', ' ')}. "
+                    "The score reflects recent sentiment and engagement. Review the latest signals with the account team.")
         return "This account is at risk due to recent churn signals. Sentiment is negative despite engagement. Immediate intervention required."
 
+    def _extraction_from_scan(self, prompt: str) -> Dict[str, Any]:
+        """A plausible extraction built from the keyword scan of the prompt's CONTENT section."""
+        from app.services.keyword_scanner import scan_hits
+        content = prompt.split("CONTENT:", 1)[-1].split("CONTEXT:", 1)[0].strip()
+        hits = scan_hits(content)
+
+        if hits.churn_signals:
+            sentiment = "negative"
+        elif hits.positive_signals:
+            sentiment = "positive"
+        else:
+            sentiment = "neutral"
+        first_sentence = content.split(".")[0][:160].strip()
+        return {
+            "sentiment": sentiment,
+            "summary": f"{first_sentence}." if first_sentence else "No content.",
+            "signals": [kw.replace(" ", "_") for kw in hits.churn_signals + hits.compliance_signals][:8],
+            "commitments": [{"description": f"Follow up on {kw}", "due_date": None} for kw in hits.action_signals[:3]],
+            "action_items": [f"Review {kw}" for kw in hits.churn_signals[:3]]
+        }
+
+    async def generate_text(self, prompt: str, system_prompt: str = None) -> str:
+        await self._inject_faults()
+        return self._respond(prompt, system_prompt)
+
+    async def stream_text(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        # Word by word, like a real token stream
+        await self._inject_faults()
+        text = self._respond(prompt, system_prompt)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.profile.ms_per_output_token * self.count_tokens(word) / 1000)
+            yield word if i == len(words) - 1 else word + " "
+
     async def analyze_health(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         return {"mock": "data"}
 
     def count_tokens(self, text: str) -> int:
-        return 10
+        return estimate_tokens(text)
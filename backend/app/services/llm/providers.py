@@ -1,5 +1,7 @@
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 from .base import LLMProvider
+from .usage import estimate_tokens, report_usage
+from app.core.config import settings
 import anthropic
 import openai
 import google.generativeai as genai
@@ -7,18 +9,39 @@ import google.generativeai as genai
 class AnthropicProvider(LLMProvider):
     def __init__(self, api_key: str, model: str):
         super().__init__(api_key, model)
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # Async client: awaits the HTTP call instead of blocking the event loop.
+        # One instance is kept per process (see llm.registry), so its connection pool is reused.
+        self.client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=self.timeout,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
 
     async def generate_text(self, prompt: str, system_prompt: str = None) -> str:
         messages = [{"role": "user", "content": prompt}]
-        response = self.client.messages.create(
+        kwargs = {"system": system_prompt} if system_prompt else {}
+        response = await self.client.messages.create(
             model=self.model,
             max_tokens=1024,
-            system=system_prompt,
-            messages=messages
+            messages=messages,
+            **kwargs
         )
+        report_usage(response.usage.input_tokens, response.usage.output_tokens)
         return response.content[0].text
 
+    async def stream_text(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        kwargs = {"system": system_prompt} if system_prompt else {}
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": prompt}],
+            **kwargs
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            final = await stream.get_final_message()
+            report_usage(final.usage.input_tokens, final.usage.output_tokens)
+
     async def analyze_health(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         # Placeholder for structured analysis
         prompt = f"Analyze health for: {input_data}"
@@ -26,31 +49,53 @@ class AnthropicProvider(LLMProvider):
         return {"analysis": response, "raw": response}
 
     def count_tokens(self, text: str) -> int:
-        return len(text.split()) # Rough approximation for now
+        return estimate_tokens(text, "anthropic", self.model)
 
 class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str, model: str):
         super().__init__(api_key, model)
-        self.client = openai.OpenAI(api_key=api_key)
+        self.client = openai.AsyncOpenAI(
+            api_key=api_key,
+            timeout=self.timeout,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
 
     async def generate_text(self, prompt: str, system_prompt: str = None) -> str:
         messages = [{"role": "user", "content": prompt}]
         if system_prompt:
             messages.insert(0, {"role": "system", "content": system_prompt})
             
-        response = self.client.chat.completions.create(
+        response = await self.client.chat.completions.create(
             model=self.model,
             messages=messages
         )
+        if response.usage:
+            report_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
         return response.choices[0].message.content
 
+    async def stream_text(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage:  # final chunk
+                report_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+
     async def analyze_health(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         prompt = f"Analyze health for: {input_data}"
         response = await self.generate_text(prompt, system_prompt="You are a customer health analyst.")
         return {"analysis": response, "raw": response}
     
     def count_tokens(self, text: str) -> int:
-        return len(text.split())
+        return estimate_tokens(text, "openai", self.model)
 
 class GoogleProvider(LLMProvider):
     def __init__(self, api_key: str, model: str):
@@ -64,13 +109,43 @@ class GoogleProvider(LLMProvider):
         if system_prompt:
             full_prompt = f"{system_prompt}\n\n{prompt}"
             
-        response = self.model_instance.generate_content(full_prompt)
+        # The Gemini SDK's async path is tied to a gRPC event loop; the thread pool is simpler and safe
+        response = await self._run_blocking(
+            self.model_instance.generate_content,
+            full_prompt,
+            request_options={"timeout": self.timeout}
+        )
+        self._report_usage(getattr(response, "usage_metadata", None))
         return response.text
 
+    async def stream_text(self, prompt: str, system_prompt: str = None) -> AsyncIterator[str]:
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+
+        usage_metadata = []
+
+        def chunks():
+            response = self.model_instance.generate_content(
+                full_prompt, stream=True, request_options={"timeout": self.timeout}
+            )
+            for chunk in response:
+                if getattr(chunk, "usage_metadata", None):
+                    usage_metadata.append(chunk.usage_metadata)
+                if chunk.text:
+                    yield chunk.text
+
+        async for text in self._stream_blocking(chunks):
+            yield text
+        # Reported here rather than in the pool thread, which doesn't share our context
+        self._report_usage(usage_metadata[-1] if usage_metadata else None)
+
+    def _report_usage(self, usage_metadata) -> None:
+        if usage_metadata:
+            report_usage(usage_metadata.prompt_token_count, usage_metadata.candidates_token_count)
+
     async def analyze_health(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         prompt = f"Analyze health for: {input_data}"
         response = await self.generate_text(prompt, system_prompt="You are a customer health analyst.")
         return {"analysis": response, "raw": response}
     
     def count_tokens(self, text: str) -> int:
-        return len(text.split())
+        return estimate_tokens(text, "google", self.model)
@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import decrypt_string
+from app.models.llm_config import LLMConfiguration
+from .base import LLMProvider
+from .factory import LLMClientFactory
+
+
+class ActiveLLM(NamedTuple):
+    config_id: UUID
+    version: int
+    provider: str
+    model_name: str
+    client: LLMProvider
+
+
+PRIMARY = "primary"
+FALLBACK = "fallback"
+
+_lock = threading.Lock()
+_active: Dict[str, Optional[ActiveLLM]] = {}
+_last_checked: Dict[str, float] = {}
+
+
+def get_active_llm(db: Session, role: str = PRIMARY) -> Optional[ActiveLLM]:
+    """
+    The active LLM configuration with a long-lived, already-authenticated client,
+    or None when no provider is configured. role="fallback" returns the backup
+    provider used for hedged requests.
+
+    The client is built once per process and reused, so calls share its
+    connection pool. Other processes' edits are picked up by comparing the
+    config's version column, at most once every LLM_CONFIG_REFRESH_SECONDS;
+    the process that handled the edit calls invalidate() and sees it at once.
+    """
+    now = time.monotonic()
+    current = _active.get(role)
+    if now - _last_checked.get(role, 0.0) < settings.LLM_CONFIG_REFRESH_SECONDS:
+        return current
+
+    row = db.query(LLMConfiguration.id, LLMConfiguration.version).filter(
+        LLMConfiguration.is_active == True,
+        LLMConfiguration.is_fallback == (role == FALLBACK)
+    ).first()
+    if row is None:
+        current = None
+    elif current is None or current.config_id != row.id or current.version != row.version:
+        config = db.query(LLMConfiguration).filter(LLMConfiguration.id == row.id).first()
+        api_key = decrypt_string(config.api_key_encrypted)
+        current = ActiveLLM(
+            config_id=config.id,
+            version=config.version,
+            provider=config.provider,
+            model_name=config.model_name,
+            client=LLMClientFactory.create(config.provider, api_key, config.model_name)
+        )
+        metrics.incr("llm.client_builds")
+        print(f"LLM client built for {role} {config.provider}/{config.model_name} (config version {config.version})")
+
+    with _lock:
+        _active[role] = current
+        _last_checked[role] = now
+    return current
+
+
+def invalidate() -> None:
+    """Drop the cached clients; the next get_active_llm() reloads from the DB."""
+    with _lock:
+        _active.clear()
+        _last_checked.clear()
@@ -0,0 +1,298 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+import anthropic
+import openai
+
+from app.core import metrics
+from app.core.config import settings
+from .base import LLMProvider
+from .ledger import metered_call
+from .registry import ActiveLLM
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+CONNECTION_ERRORS = (anthropic.APIConnectionError, openai.APIConnectionError, asyncio.TimeoutError)
+MAX_BACKOFF_SECONDS = 60
+
+
+class TokenBucket:
+    """
+    Refills `per_minute` units evenly over a minute. reserve() always succeeds
+    and returns how long the caller must wait for its share, so callers are
+    served in arrival order without polling. per_minute <= 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single call bigger than the whole bucket waits for a full bucket, not forever
+        self.tokens -= min(amount, self.capacity)
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class ProviderLimiter:
+    """Request and token buckets, an in-flight cap and a shared 429 pause for one provider."""
+
+    def __init__(self, provider: str, rpm: int = 0, tpm: int = 0, max_in_flight: int = 4):
+        self.provider = provider
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_in_flight = max(1, max_in_flight)
+        self.paused_until = 0.0
+        self.waiting = 0
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+        metrics.register_gauge(f"llm.{provider}.queue_depth", lambda: self.waiting)
+        metrics.register_gauge(f"llm.{provider}.in_flight", lambda: self.in_flight)
+
+    def semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; rebuild if the loop changed (tests, CLI runs)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._semaphore
+
+    def pause(self, seconds: float) -> None:
+        """Hold every call to this provider, not just the one that got the 429."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Parse Retry-After (seconds or HTTP date) or retry-after-ms from an SDK error response."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, CONNECTION_ERRORS):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+class LLMScheduler:
+    """
+    Sends LLM calls through per-provider limits so concurrent callers (ingest
+    workers, the daily job, bulk imports) run at the provider's real rate
+    instead of tripping 429s. Limits come from settings.LLM_RATE_LIMITS, divided
+    by LLM_RATE_LIMIT_PROCESSES since every process keeps its own buckets.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, int]]] = None):
+        self.limits = limits if limits is not None else settings.LLM_RATE_LIMITS
+        self._limiters: Dict[str, ProviderLimiter] = {}
+
+    def limiter(self, provider: str) -> ProviderLimiter:
+        provider = str(getattr(provider, "value", provider))
+        if provider not in self._limiters:
+            config = self.limits.get(provider, {})
+            processes = max(1, settings.LLM_RATE_LIMIT_PROCESSES)
+            self._limiters[provider] = ProviderLimiter(
+                provider,
+                # A limit too small to split still allows this process one unit per minute
+                rpm=max(1, config["rpm"] // processes) if config.get("rpm", 0) > 0 else 0,
+                tpm=max(1, config["tpm"] // processes) if config.get("tpm", 0) > 0 else 0,
+                max_in_flight=config.get("max_in_flight", settings.LLM_MAX_IN_FLIGHT)
+            )
+        return self._limiters[provider]
+
+    async def _wait_for_capacity(self, limiter: ProviderLimiter, estimated_tokens: int) -> None:
+        delay = max(limiter.requests.reserve(1), limiter.tokens.reserve(estimated_tokens))
+        if delay > 0:
+            await asyncio.sleep(delay)
+        while limiter.paused_until > time.monotonic():
+            await asyncio.sleep(limiter.paused_until - time.monotonic())
+
+    @asynccontextmanager
+    async def _slot(self, limiter: ProviderLimiter, estimated_tokens: int):
+        """
+        Wait for rate capacity, then for an in-flight slot, and hold the slot for
+        the call. Rate waits happen before the slot is taken, so a caller sleeping
+        off its reservation (or a 429 pause) doesn't keep others from running.
+        """
+        queued_at = time.monotonic()
+        limiter.waiting += 1
+        queued = True
+        try:
+            await self._wait_for_capacity(limiter, estimated_tokens)
+            async with limiter.semaphore():
+                limiter.waiting -= 1
+                queued = False
+                metrics.incr(f"llm.{limiter.provider}.wait_seconds_total", time.monotonic() - queued_at)
+                metrics.incr(f"llm.{limiter.provider}.calls")
+                limiter.in_flight += 1
+                try:
+                    yield
+                finally:
+                    limiter.in_flight -= 1
+        finally:
+            if queued:  # cancelled while waiting for capacity
+                limiter.waiting -= 1
+
+    async def _backoff(self, limiter: ProviderLimiter, error: Exception, attempt: int) -> None:
+        """Sleep before the next attempt, or re-raise if the error isn't worth retrying."""
+        name = limiter.provider
+        if not is_retryable(error) or attempt >= settings.LLM_SCHEDULER_MAX_ATTEMPTS:
+            metrics.incr(f"llm.{name}.failed")
+            raise error
+        delay = retry_after_seconds(error)
+        if getattr(error, "status_code", None) == 429:
+            metrics.incr(f"llm.{name}.rate_limited")
+            limiter.pause(delay if delay is not None else settings.LLM_RETRY_BASE_SECONDS)
+        if delay is None:
+            delay = min(MAX_BACKOFF_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            delay *= random.uniform(0.8, 1.2)
+        metrics.incr(f"llm.{name}.retries")
+        print(f"LLM call to {name} failed (attempt {attempt}), retrying in {delay:.1f}s: {error}")
+        await asyncio.sleep(delay)
+
+    async def run(self, provider: str, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        """
+        Await call() once there is capacity, retrying retryable failures with
+        exponential backoff (or the server's Retry-After, when it sends one).
+        """
+        limiter = self.limiter(provider)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self._slot(limiter, estimated_tokens):
+                    return await call()
+            except Exception as e:
+                await self._backoff(limiter, e, attempt)
+
+    def _estimate(self, llm: LLMProvider, prompt: str, system_prompt: Optional[str]) -> int:
+        return llm.count_tokens(prompt) + llm.count_tokens(system_prompt or "") + settings.LLM_EXPECTED_OUTPUT_TOKENS
+
+    async def generate_text(self, provider: str, llm: LLMProvider, prompt: str, system_prompt: str = None,
+                            stage: str = "other", route: str = "primary") -> str:
+        """
+        llm.generate_text, scheduled. Reserves prompt tokens plus the expected
+        output, and records every attempt in the LLM call ledger under `stage`.
+        """
+        prompt_text = f"{system_prompt or ''}\n{prompt}"
+
+        async def call() -> str:
+            async with metered_call(provider, llm, stage, prompt_text, route=route) as usage:
+                usage.completion_text = await llm.generate_text(prompt, system_prompt=system_prompt)
+                return usage.completion_text
+
+        return await self.run(provider, call, estimated_tokens=self._estimate(llm, prompt, system_prompt))
+
+    async def hedged_generate_text(self, primary: ActiveLLM, backup: Optional[ActiveLLM], prompt: str,
+                                   system_prompt: str = None, stage: str = "other") -> str:
+        """
+        generate_text against `primary`, with a backup request to `backup` if the
+        primary hasn't answered within LLM_HEDGE_AFTER_SECONDS (or fails outright).
+        The first successful answer wins and the other request is cancelled.
+        Normally the primary answers in time, so the backup costs nothing.
+        """
+        if backup is None or settings.LLM_HEDGE_AFTER_SECONDS <= 0:
+            return await self.generate_text(primary.provider, primary.client, prompt, system_prompt=system_prompt, stage=stage)
+
+        routes: Dict[asyncio.Future, str] = {}
+
+        def start(active: ActiveLLM, route: str) -> asyncio.Future:
+            task = asyncio.ensure_future(self.generate_text(
+                active.provider, active.client, prompt, system_prompt=system_prompt, stage=stage, route=route
+            ))
+            routes[task] = route
+            return task
+
+        pending = {start(primary, "primary")}
+        # Whatever ends this call (an answer, an error, or the caller being cancelled
+        # during the hedge delay), no request is left running behind it
+        try:
+            done, pending = await asyncio.wait(pending, timeout=settings.LLM_HEDGE_AFTER_SECONDS)
+            if done and not next(iter(done)).exception():
+                return next(iter(done)).result()
+
+            # Primary is slow (or already failed): race it against the backup
+            reason = "failed" if done else "slow"
+            metrics.incr(f"llm.hedge.fired_{reason}")
+            print(f"LLM {stage} call to {primary.provider}/{primary.model_name} {reason}, "
+                  f"hedging with {backup.provider}/{backup.model_name}")
+            pending.add(start(backup, "hedge"))
+            last_error = next(iter(done)).exception() if done else None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        metrics.incr(f"llm.hedge.won_{routes[task]}")
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in routes:
+                if not task.done():
+                    task.cancel()
+
+    async def stream_text(self, provider: str, llm: LLMProvider, prompt: str, system_prompt: str = None,
+                          stage: str = "other") -> AsyncIterator[str]:
+        """
+        llm.stream_text, scheduled and recorded like generate_text. The
+        in-flight slot is held until the stream ends. Failures are retried only
+        before the first piece arrives, so the caller never sees repeated text.
+        """
+        prompt_text = f"{system_prompt or ''}\n{prompt}"
+        limiter = self.limiter(provider)
+        estimated = self._estimate(llm, prompt, system_prompt)
+        attempt = 0
+        while True:
+            attempt += 1
+            started = False
+            try:
+                async with self._slot(limiter, estimated):
+                    async with metered_call(provider, llm, stage, prompt_text, streamed=True) as usage:
+                        pieces = []
+                        try:
+                            async for piece in llm.stream_text(prompt, system_prompt=system_prompt):
+                                started = True
+                                pieces.append(piece)
+                                yield piece
+                        finally:
+                            usage.completion_text = "".join(pieces)
+                return
+            except Exception as e:
+                if started:
+                    metrics.incr(f"llm.{limiter.provider}.failed")
+                    raise
+                await self._backoff(limiter, e, attempt)
+
+
+llm_scheduler = LLMScheduler()
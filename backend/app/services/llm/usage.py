@@ -0,0 +1,100 @@
+import math
+import re
+from contextvars import ContextVar, Token
+from typing import Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is in requirements.txt, but keep dev setups working
+    tiktoken = None
+
+# Average characters per token for the heuristic estimate, by provider family.
+# Claude's tokenizer splits a little finer than OpenAI's; Gemini's a little coarser.
+CHARS_PER_TOKEN = {
+    "anthropic": 3.5,
+    "openai": 4.0,
+    "google": 4.2,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Words, runs of digits (tokenizers split these into groups of ~3) and single punctuation marks
+_PIECES = re.compile(r"[^\W\d_]+|\d+|[^\w\s]")
+
+_encodings = {}
+
+
+def _openai_encoding(model: str):
+    if model not in _encodings:
+        try:
+            _encodings[model] = tiktoken.encoding_for_model(model)
+        except KeyError:
+            _encodings[model] = tiktoken.get_encoding("o200k_base")
+    return _encodings[model]
+
+
+def estimate_tokens(text: str, family: str = "", model: str = "") -> int:
+    """
+    Local token estimate for a provider family. OpenAI models use tiktoken
+    (exact) when it is installed; other families use a calibrated heuristic,
+    since Anthropic and Google only count tokens through their APIs.
+    """
+    if not text:
+        return 0
+    if family == "openai" and tiktoken is not None:
+        return len(_openai_encoding(model or "gpt-4o").encode(text))
+
+    ratio = CHARS_PER_TOKEN.get(family, DEFAULT_CHARS_PER_TOKEN)
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        if piece.isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        elif len(piece) == 1:
+            tokens += 1
+        else:
+            tokens += max(1, round(len(piece) / ratio))
+    # Non-ASCII text (accents, CJK) costs noticeably more per character
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return tokens + non_ascii // 2
+
+
+class CallUsage:
+    """Token counts for one LLM call. Providers fill in what the API reports."""
+
+    __slots__ = ("prompt_tokens", "completion_tokens", "completion_text")
+
+    def __init__(self):
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.completion_text = ""
+
+
+_current_usage: ContextVar[Optional[CallUsage]] = ContextVar("llm_call_usage", default=None)
+
+
+def start_usage() -> Tuple[CallUsage, Token]:
+    """
+    Begin tracking usage for the call about to be made in this task. Pass the
+    token to end_usage once the call is over.
+    """
+    usage = CallUsage()
+    return usage, _current_usage.set(usage)
+
+
+def end_usage(token: Token) -> None:
+    """Stop tracking: later reports in this task go back to whatever was tracked before."""
+    try:
+        _current_usage.reset(token)
+    except ValueError:
+        # An abandoned stream is closed from another context, which has nothing to undo
+        pass
+
+
+def report_usage(prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Called by providers with the token counts from the API response."""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    if prompt_tokens is not None:
+        usage.prompt_tokens = prompt_tokens
+    if completion_tokens is not None:
+        usage.completion_tokens = completion_tokens
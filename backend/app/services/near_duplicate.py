@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import random
+import re
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.input import Input
+from app.services.content_cache import LRUCache
+from app.services.email_parser import analysis_text
+
+_WORDS = re.compile(r"\w+")
+_PRIME = (1 << 61) - 1  # Mersenne prime for the universal hash family
+_QUOTE_PREFIX = re.compile(r"^[\s>]+")
+
+
+def shingles(text: str, size: int) -> Set[int]:
+    """64-bit hashes of the word `size`-grams of `text`, case and punctuation ignored."""
+    words = _WORDS.findall(text.casefold())
+    if not words:
+        return set()
+    grams = [" ".join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))]
+    return {int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big") for gram in grams}
+
+
+class MinHasher:
+    """MinHash signatures: num_perm independent hash functions, minimum over each text's shingles."""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = 1):
+        rng = random.Random(seed)
+        self.shingle_size = shingle_size
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self.params)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class LSHIndex:
+    """
+    Banded LSH over the signatures of one account's most recent inputs.
+    Two inputs become candidates when any band of their signatures matches;
+    with b bands of r rows that happens at similarity around (1/b)^(1/r).
+    """
+
+    def __init__(self, bands: int, window: int):
+        self.bands = bands
+        self.window = window
+        self.signatures: "OrderedDict[UUID, Tuple[int, ...]]" = OrderedDict()
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], Set[UUID]] = {}
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = len(signature) // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def __contains__(self, key: UUID) -> bool:
+        return key in self.signatures
+
+    def add(self, key: UUID, signature: Tuple[int, ...]) -> None:
+        if key in self.signatures:
+            return
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets.setdefault(band_key, set()).add(key)
+        while len(self.signatures) > self.window:
+            self._remove(next(iter(self.signatures)))
+
+    def _remove(self, key: UUID) -> None:
+        signature = self.signatures.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self.buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band_key]
+
+    def query(self, signature: Tuple[int, ...]) -> List[Tuple[UUID, float]]:
+        """Candidates sharing a band with `signature`, most similar first."""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        scored = [(key, similarity(signature, self.signatures[key])) for key in candidates]
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+
+class NearDuplicate(NamedTuple):
+    input_id: UUID
+    similarity: float
+
+
+class NearDuplicateDetector:
+    """
+    Finds an earlier input for the same account that the new one mostly
+    repeats (quoted email threads, re-sent notes). Each process keeps an LSH
+    index per account and tops it up from the account's most recent processed
+    inputs, so inputs ingested by other workers are seen too.
+    """
+
+    def __init__(self):
+        self.hasher = MinHasher(settings.NEAR_DUP_NUM_PERM, settings.NEAR_DUP_SHINGLE_SIZE)
+        self.indexes = LRUCache("near_dup_accounts", settings.CONTENT_CACHE_SIZE)
+
+    def _signatures(self, texts: List[str]) -> List[Optional[Tuple[int, ...]]]:
+        return [self.hasher.signature(text) for text in texts]
+
+    async def _index_for(self, db: Session, account_id: UUID, exclude: UUID) -> LSHIndex:
+        index = self.indexes.get(account_id)
+        if index is None:
+            index = LSHIndex(settings.NEAR_DUP_BANDS, settings.NEAR_DUP_WINDOW)
+            self.indexes.put(account_id, index)
+
+        recent = db.query(Input.id, Input.created_at).filter(
+            Input.account_id == account_id,
+            Input.is_processed.is_(True),
+            Input.id != exclude
+        ).order_by(Input.created_at.desc()).limit(settings.NEAR_DUP_WINDOW).all()
+        missing = [row.id for row in reversed(recent) if row.id not in index]
+        if missing:
+            texts = {
+                row.id: analysis_text(row.input_type, row.content)
+                for row in db.query(Input.id, Input.input_type, Input.content).filter(Input.id.in_(missing)).all()
+            }
+            # Hashing a cold window is pure CPU (NUM_PERM hashes per shingle); keep it off the event loop
+            signatures = await asyncio.get_running_loop().run_in_executor(
+                None, self._signatures, [texts.get(input_id) or "" for input_id in missing]
+            )
+            for input_id, signature in zip(missing, signatures):  # oldest first, so the window evicts the right ones
+                if signature is not None:
+                    index.add(input_id, signature)
+        return index
+
+    async def find(self, db: Session, db_input: Input, content: str) -> Optional[NearDuplicate]:
+        """
+        The recent input most similar to `content` (db_input's analysis text),
+        if it is at or above NEAR_DUP_DIFF_THRESHOLD.
+        """
+        signature = await asyncio.get_running_loop().run_in_executor(None, self.hasher.signature, content)
+        if signature is None:
+            return None
+        index = await self._index_for(db, db_input.account_id, db_input.id)
+        for input_id, score in index.query(signature):
+            if score >= settings.NEAR_DUP_DIFF_THRESHOLD:
+                return NearDuplicate(input_id, score)
+            break
+        return None
+
+
+def _normalize_line(line: str) -> str:
+    return " ".join(_QUOTE_PREFIX.sub("", line).casefold().split())
+
+
+def word_count(text: str) -> int:
+    return len(_WORDS.findall(text))
+
+
+def novel_text(earlier: str, current: str) -> str:
+    """
+    Lines of `current` that don't appear in `earlier`, ignoring quote markers
+    ("> ") and whitespace, so a reply reduces to what was actually written.
+    """
+    seen = {_normalize_line(line) for line in earlier.splitlines()}
+    lines = [line for line in current.splitlines() if _normalize_line(line) and _normalize_line(line) not in seen]
+    return "\n".join(lines)
+
+
+near_duplicates = NearDuplicateDetector()
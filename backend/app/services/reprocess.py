@@ -0,0 +1,286 @@
+import asyncio
+import math
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+from sqlalchemy import exists, insert, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.prompts import SIGNAL_EXTRACTION_SYSTEM_PROMPT, SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE
+from app.models.input import Input
+from app.models.reprocess_run import ReprocessRun
+from app.models.signal_extraction import SignalExtraction
+from app.schemas.intelligence import AnalysisResult
+from app.services.chunked_extraction import chunk_budget
+from app.services.email_parser import analysis_text
+from app.services.intelligence import PARSE_FAILED_SUMMARY, IntelligenceService
+from app.services.keyword_scanner import ScanHits, scan_many_hits, should_analyze_with_llm
+from app.services.lexicon import refresh_matcher
+from app.services.llm.ledger import price_for
+from app.services.llm.registry import get_active_llm
+from app.services.llm.usage import estimate_tokens
+
+REPROCESS_BATCH_SIZE = 200
+
+
+class ReprocessFilters(BaseModel):
+    """Which processed inputs a run covers. Stored with the run, so a resume can't drift."""
+    account_id: Optional[UUID] = None
+    since: Optional[datetime] = None        # content_date >= since
+    until: Optional[datetime] = None        # content_date < until
+    lexicon_below: Optional[int] = None     # Only inputs last scanned with an older lexicon (or never)
+    with_llm: bool = False                  # Re-extract inputs that warrant it, not just re-scan
+
+
+def fetch_page(db: Session, filters: ReprocessFilters, after: Optional[tuple] = None,
+               limit: int = REPROCESS_BATCH_SIZE) -> List[Input]:
+    """
+    The next `limit` inputs after the (created_at, id) cursor `after`. Keyset
+    paging stays fast deep into the table, where OFFSET would rescan it.
+    """
+    query = db.query(Input).filter(Input.is_processed.is_(True))
+    if filters.account_id:
+        query = query.filter(Input.account_id == filters.account_id)
+    if filters.since:
+        query = query.filter(Input.content_date >= filters.since)
+    if filters.until:
+        query = query.filter(Input.content_date < filters.until)
+    if filters.lexicon_below is not None:
+        query = query.filter(~exists().where(
+            SignalExtraction.input_id == Input.id,
+            SignalExtraction.lexicon_version >= filters.lexicon_below
+        ))
+    if after is not None:
+        query = query.filter(tuple_(Input.created_at, Input.id) > tuple_(*after))
+    return query.order_by(Input.created_at, Input.id).limit(limit).all()
+
+
+def _keyword_columns(scan: ScanHits) -> Dict:
+    return {
+        "churn_signals": scan.churn_signals,
+        "positive_signals": scan.positive_signals,
+        "action_signals": scan.action_signals,
+        "compliance_signals": scan.compliance_signals,
+        "keyword_severity": scan.keyword_severity,
+        "lexicon_version": scan.lexicon_version,
+    }
+
+
+def _llm_columns(analysis: AnalysisResult) -> Dict:
+    return {
+        "sentiment": analysis.sentiment,
+        "summary": analysis.summary,
+        "signals": analysis.signals,
+        "action_items": analysis.action_items,
+        "llm_analyzed": True,
+        "llm_analysis_status": "completed",
+    }
+
+
+class Reprocessor:
+    """
+    Re-derives SignalExtraction rows for existing inputs after a lexicon,
+    prompt or model change. Inputs are walked in keyset order; each batch is
+    re-scanned in one go, LLM re-extractions run through a bounded pool, and
+    the batch's writes and the checkpoint commit together. Health is
+    recalculated once per touched account when the walk is done.
+
+    Commitments found by re-extraction don't create reminders: they were
+    created (or not) when the input first came in.
+    """
+
+    def __init__(self, db: Session, name: str, filters: ReprocessFilters,
+                 batch_size: int = REPROCESS_BATCH_SIZE, concurrency: int = settings.INGEST_WORKER_CONCURRENCY):
+        self.db = db
+        self.name = name
+        self.filters = filters
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.intelligence = IntelligenceService(db)
+
+    def start_or_resume(self) -> ReprocessRun:
+        """The run's checkpoint row, created on first use."""
+        run = self.db.query(ReprocessRun).filter(ReprocessRun.name == self.name).first()
+        stored = self.filters.model_dump(mode="json")
+        if run is None:
+            run = ReprocessRun(name=self.name, filters=stored, status="running", processed=0,
+                               extracted=0, failed=0, touched_accounts=[])
+            self.db.add(run)
+            self.db.commit()
+            self.db.refresh(run)
+        elif run.filters != stored:
+            raise ValueError(f"Run '{self.name}' was started with different filters: {run.filters}")
+        elif run.status == "failed":
+            run.status = "running"
+            self.db.commit()
+        return run
+
+    async def run(self) -> ReprocessRun:
+        run = self.start_or_resume()
+        if run.status == "completed":
+            print(f"Run '{self.name}' already completed at {run.finished_at}")
+            return run
+
+        if self.filters.with_llm and not get_active_llm(self.db):
+            raise ValueError("No active LLM configuration found")
+
+        after = (run.last_created_at, run.last_input_id) if run.last_input_id else None
+        try:
+            while True:
+                inputs = fetch_page(self.db, self.filters, after, self.batch_size)
+                if not inputs:
+                    break
+                await self.process_batch(run, inputs)
+                after = (run.last_created_at, run.last_input_id)
+                print(f"[{self.name}] {run.processed} inputs reprocessed, {run.extracted} re-extracted, "
+                      f"{run.failed} failed (at {run.last_created_at})")
+        except BaseException:
+            self.db.rollback()
+            run.status = "failed"
+            self.db.commit()
+            raise
+
+        await self.recalculate_health(run)
+        run.status = "completed"
+        run.finished_at = datetime.utcnow()
+        self.db.commit()
+        return run
+
+    async def _extract_all(self, inputs: List[Input]) -> Dict[UUID, Optional[AnalysisResult]]:
+        """LLM extractions for `inputs`, at most `concurrency` at a time. None marks a failure."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def extract(db_input: Input) -> Optional[AnalysisResult]:
+            async with semaphore:
+                try:
+                    analysis = await self.intelligence.reextract(db_input)
+                except Exception as e:
+                    print(f"Re-extraction failed for input {db_input.id}: {e}")
+                    return None
+            return None if analysis.summary == PARSE_FAILED_SUMMARY else analysis
+
+        results = await asyncio.gather(*[extract(db_input) for db_input in inputs])
+        return {db_input.id: result for db_input, result in zip(inputs, results)}
+
+    async def process_batch(self, run: ReprocessRun, inputs: List[Input]) -> None:
+        refresh_matcher(self.db)
+        scans = scan_many_hits([analysis_text(db_input.input_type, db_input.content) for db_input in inputs])
+        existing = {
+            extraction.input_id: extraction
+            for extraction in self.db.query(SignalExtraction).filter(
+                SignalExtraction.input_id.in_([db_input.id for db_input in inputs])
+            ).all()
+        }
+
+        analyses: Dict[UUID, Optional[AnalysisResult]] = {}
+        if self.filters.with_llm:
+            analyses = await self._extract_all([
+                db_input for db_input, scan in zip(inputs, scans) if should_analyze_with_llm(scan)
+            ])
+
+        inserts, updates, deletes = [], [], []
+        for db_input, scan in zip(inputs, scans):
+            row = _keyword_columns(scan)
+            analysis = analyses.get(db_input.id)
+            if analysis is not None:
+                row.update(_llm_columns(analysis))
+            current = existing.get(db_input.id)
+            if current is None:
+                if scan.has_matches or analysis is not None:
+                    inserts.append({"id": uuid.uuid4(), "input_id": db_input.id, "llm_analyzed": False,
+                                    "llm_analysis_status": "skipped", **row})
+            elif not scan.has_matches and analysis is None and not current.llm_analyzed:
+                # Keyword-only extraction whose keywords left the lexicon
+                deletes.append(current.id)
+            else:
+                # Failed or skipped re-extractions keep the previous LLM fields
+                updates.append({"id": current.id, **row})
+
+        failed = sum(1 for analysis in analyses.values() if analysis is None)
+        extracted = len(analyses) - failed
+        touched = {str(db_input.account_id) for db_input in inputs}
+
+        if inserts:
+            self.db.execute(insert(SignalExtraction), inserts)
+        if updates:
+            self.db.execute(update(SignalExtraction), updates)
+        if deletes:
+            self.db.query(SignalExtraction).filter(SignalExtraction.id.in_(deletes)).delete(synchronize_session=False)
+
+        # Checkpoint in the same transaction as the writes
+        run.last_created_at = inputs[-1].created_at
+        run.last_input_id = inputs[-1].id
+        run.processed += len(inputs)
+        run.extracted += extracted
+        run.failed += failed
+        run.touched_accounts = sorted(touched.union(run.touched_accounts or []))
+        run.updated_at = datetime.utcnow()
+        self.db.commit()
+
+        metrics.incr("reprocess.inputs", len(inputs))
+        metrics.incr("reprocess.extracted", extracted)
+        metrics.incr("reprocess.failed", failed)
+
+    async def recalculate_health(self, run: ReprocessRun) -> int:
+        """One recalculation per touched account."""
+        from app.services.health.calculator import HealthCalculator
+        scores = await HealthCalculator(self.db).calculate_health_many(
+            [UUID(account_id) for account_id in run.touched_accounts or []], triggered_by="reprocess"
+        )
+        recalculated = len(scores)
+        print(f"[{self.name}] Health recalculated for {recalculated} accounts")
+        return recalculated
+
+
+def estimate_run(db: Session, filters: ReprocessFilters, batch_size: int = REPROCESS_BATCH_SIZE) -> Dict:
+    """
+    Dry run: walk the same inputs and scan them (cheap, local), and estimate
+    the LLM tokens and cost of the re-extractions without making any calls.
+    The estimate is an upper bound, since duplicate content is served from
+    the extraction cache.
+    """
+    active = get_active_llm(db) if filters.with_llm else None
+    model = active.model_name if active else ""
+    count_tokens = active.client.count_tokens if active else estimate_tokens
+    overhead = count_tokens(SIGNAL_EXTRACTION_SYSTEM_PROMPT + SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE.format(
+        content="", account_name="", date="", sender=""
+    ))
+    budget = chunk_budget(model, overhead)
+
+    # Without with_llm nothing is spent; the LLM figures show what re-extraction would need
+    report = {"inputs": 0, "accounts": 0, "with_llm": filters.with_llm, "llm_inputs": 0, "llm_calls": 0,
+              "prompt_tokens": 0, "completion_tokens": 0, "estimated_cost_usd": None, "model": model or None}
+    accounts = set()
+    refresh_matcher(db)
+    after = None
+    while True:
+        inputs = fetch_page(db, filters, after, batch_size)
+        if not inputs:
+            break
+        after = (inputs[-1].created_at, inputs[-1].id)
+        report["inputs"] += len(inputs)
+        accounts.update(db_input.account_id for db_input in inputs)
+        texts = [analysis_text(db_input.input_type, db_input.content) for db_input in inputs]
+        for text, scan in zip(texts, scan_many_hits(texts)):
+            if not should_analyze_with_llm(scan):
+                continue
+            content_tokens = count_tokens(text)
+            calls = max(1, math.ceil(content_tokens / budget))
+            report["llm_inputs"] += 1
+            report["llm_calls"] += calls
+            report["prompt_tokens"] += content_tokens + overhead * calls
+            report["completion_tokens"] += settings.LLM_EXPECTED_OUTPUT_TOKENS * calls
+        # Nothing is written; drop the loaded rows so a big walk doesn't pile up in the session
+        db.expunge_all()
+
+    report["accounts"] = len(accounts)
+    price = price_for(model) if model else None
+    if price and filters.with_llm:
+        report["estimated_cost_usd"] = round(
+            (report["prompt_tokens"] * price[0] + report["completion_tokens"] * price[1]) / 1_000_000, 4
+        )
+    return report
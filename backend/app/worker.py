@@ -0,0 +1,42 @@
+"""
+Ingest worker: runs queued inputs through the intelligence pipeline, and
+writes the pending AI summaries of saved health scores.
+
+    python -m app.worker --concurrency 8
+
+Any number of worker processes can run side by side; jobs are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED.
+"""
+import argparse
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.services.ingest_queue import start_workers
+from app.services.llm.ledger import flush_ledger
+
+
+async def run_workers(concurrency: int):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+    
+    print(f"Ingest worker started with concurrency {concurrency}")
+    tasks = start_workers(concurrency, stop)
+    await asyncio.gather(*tasks)
+    await loop.run_in_executor(None, flush_ledger)
+    print("Ingest worker stopped.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Customer Pulse ingest worker")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.INGEST_WORKER_CONCURRENCY,
+        help="Number of jobs processed concurrently"
+    )
+    args = parser.parse_args()
+    asyncio.run(run_workers(args.concurrency))
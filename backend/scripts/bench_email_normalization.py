@@ -0,0 +1,84 @@
+"""
+Token savings from email normalization on a synthetic corpus of reply threads.
+
+    python scripts/bench_email_normalization.py
+    python scripts/bench_email_normalization.py --threads 200 --depth 8
+
+Each thread is a chain of replies where every message quotes the whole
+thread below it (alternating Gmail and Outlook styles) and carries a
+signature and a legal footer. Reports tokens sent to scanning and the LLM
+with and without normalization, keyword hits, and parse throughput.
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.email_parser import parse_email_input
+from app.services.keyword_scanner import scan_text
+from app.services.llm.usage import estimate_tokens
+from corpus_generator import NAMES, generate_document
+
+SIGNATURE = "{name}\nCustomer Success | Example Vendor Inc.\n(555) 010-{ext:04d} | www.vendor.example.com"
+DISCLAIMER = (
+    "CONFIDENTIALITY NOTICE: This email and any attachments are confidential and intended solely for the "
+    "use of the individual or entity to whom they are addressed. If you have received this email in error, "
+    "please notify the sender and delete it. Any review, dissemination or copying is strictly prohibited."
+)
+
+
+def build_thread(rng: random.Random, depth: int, density: float) -> list:
+    """Messages of one thread, oldest first; each one quotes everything before it."""
+    messages = []
+    previous = None
+    for i in range(depth):
+        name = rng.choice(NAMES)
+        body = generate_document("email", rng.choice((600, 1200, 2400)), density, seed=rng.random())
+        body = body.rsplit("Thanks,", 1)[0].rstrip()
+        message = f"{body}\n\nThanks,\n{SIGNATURE.format(name=name, ext=rng.randint(0, 9999))}\n\n{DISCLAIMER}\n"
+        if previous is not None:
+            if i % 2:
+                quoted = "\n".join(f"> {line}" for line in previous.splitlines())
+                message += f"\nOn Mon, Jan {i + 1}, 2026 at 9:{i:02d} AM {name} <{name.split()[0].lower()}@example.com> wrote:\n{quoted}\n"
+            else:
+                message += (f"\n________________________________\nFrom: {name} <{name.split()[0].lower()}@example.com>\n"
+                            f"Sent: Monday, January {i + 1}, 2026 9:{i:02d} AM\nSubject: RE: Renewal\n\n{previous}\n")
+        messages.append(message)
+        previous = message
+    return messages
+
+
+def run(threads: int, depth: int, density: float, seed: int) -> None:
+    rng = random.Random(seed)
+    corpus = [message for _ in range(threads) for message in build_thread(rng, depth, density)]
+
+    start = time.perf_counter()
+    normalized = [parse_email_input(message)["new_content"] for message in corpus]
+    elapsed = time.perf_counter() - start
+
+    raw_tokens = sum(estimate_tokens(message) for message in corpus)
+    new_tokens = sum(estimate_tokens(text) for text in normalized)
+    raw_hits = sum(len(scan_text(message).churn_signals) for message in corpus)
+    new_hits = sum(len(scan_text(text).churn_signals) for text in normalized)
+    raw_bytes = sum(len(message) for message in corpus)
+
+    print(f"\n{len(corpus)} emails ({threads} threads x {depth} replies), {raw_bytes / 1e6:.1f} MB")
+    print(f"  tokens raw        {raw_tokens:>12,}")
+    print(f"  tokens normalized {new_tokens:>12,}  ({1 - new_tokens / raw_tokens:.1%} saved)")
+    print(f"  churn keyword hits raw {raw_hits:,} -> normalized {new_hits:,} (quoted history no longer re-counted)")
+    print(f"  parse time {elapsed * 1000 / len(corpus):.2f} ms/email ({raw_bytes / 1e6 / elapsed:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Email normalization token savings")
+    parser.add_argument("--threads", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=6, help="Replies per thread")
+    parser.add_argument("--density", type=float, default=0.01, help="Keyword density of message bodies")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.threads, args.depth, args.density, args.seed)
@@ -0,0 +1,110 @@
+"""
+Scalar vs vectorized pillar scoring over synthetic portfolios.
+
+    python scripts/bench_health_vectorized.py
+    python scripts/bench_health_vectorized.py --sizes 1000 10000 --repeat 5
+
+For each portfolio size, scores every account with the pillar classes (as
+score_account does) and with pack() + score_pillars() + apply_decay(),
+checks that the results are identical, and reports the time of each path.
+Packing walks the extraction objects in Python, so it is reported apart
+from the array math.
+"""
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.health.calculator import HealthCalculator
+from app.services.health.pillars import (
+    EngagementPillar, ExpansionPillar, RelationshipPillar, RequestPillar, SatisfactionPillar, SentimentPillar
+)
+from app.services.health.vectorized import PILLAR_WEIGHTS, apply_decay, pack, score_pillars
+
+SIGNALS = ["renewal", "bug in export", "feature request", "performance issue", "happy with support",
+           "frustrated users", "upsell seats", "add-on interest", "growth plans", "budget review",
+           "security review", "training request"]
+
+
+def make_portfolio(n: int, seed: int):
+    """Up to 10 extractions per account (like RECENT_INPUT_LIMIT), 0-3 signals each."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    extractions, last_dates, intervals, contacts = [], [], [], []
+    for _ in range(n):
+        extractions.append([
+            SimpleNamespace(sentiment=rng.choice(("positive", "neutral", "negative")),
+                            signals=rng.sample(SIGNALS, rng.randint(0, 3)))
+            for _ in range(rng.randint(0, 10))
+        ])
+        last_dates.append(None if rng.random() < 0.05 else now - timedelta(days=rng.randint(0, 90), hours=12))
+        intervals.append(rng.choice((7, 14, 30)))
+        contacts.append(rng.randint(0, 6))
+    return extractions, last_dates, intervals, contacts, now
+
+
+def scalar(calculator: HealthCalculator, extractions, last_dates, intervals, contacts):
+    results = []
+    for exts, last_date, interval, contact_count in zip(extractions, last_dates, intervals, contacts):
+        pillars = (
+            SentimentPillar.calculate(exts),
+            EngagementPillar.calculate(last_date, interval),
+            RequestPillar.calculate(exts),
+            RelationshipPillar.calculate(contact_count),
+            SatisfactionPillar.calculate(exts),
+            ExpansionPillar.calculate(exts),
+        )
+        overall = int(sum(p * w for p, w in zip(pillars, PILLAR_WEIGHTS)))
+        account = SimpleNamespace(check_in_interval_days=interval)
+        results.append(pillars + calculator._apply_decay(account, overall, last_date)[:1])
+    return results
+
+
+def best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(sizes, repeat: int, seed: int) -> None:
+    calculator = HealthCalculator(db=None)
+    print(f"\n{'accounts':>9} {'extractions':>12} {'scalar':>10} {'pack':>10} {'arrays':>10} {'speedup':>9}"
+          f" {'speedup (arrays)':>17}")
+    for n in sizes:
+        extractions, last_dates, intervals, contacts, now = make_portfolio(n, seed)
+
+        scalar_time, expected = best_of(lambda: scalar(calculator, extractions, last_dates, intervals, contacts), repeat)
+        pack_time, arrays = best_of(lambda: pack(extractions, last_dates, intervals, contacts, now=now), repeat)
+
+        def vectorized():
+            scores = score_pillars(arrays)
+            adjusted, _ = apply_decay(arrays, scores.overall, calculator.DECAY_RATE_PER_DAY, calculator.DECAY_FLOOR)
+            return np.column_stack(scores[:6] + (adjusted,))
+
+        array_time, got = best_of(vectorized, repeat)
+        assert got.tolist() == [list(row) for row in expected], "vectorized scores differ from the scalar pillars"
+
+        n_ext = sum(len(e) for e in extractions)
+        total = pack_time + array_time
+        print(f"{n:>9,} {n_ext:>12,} {scalar_time * 1000:>8.1f}ms {pack_time * 1000:>8.1f}ms"
+              f" {array_time * 1000:>8.1f}ms {scalar_time / total:>8.1f}x {scalar_time / array_time:>16.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized pillar scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per path")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
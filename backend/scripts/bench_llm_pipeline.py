@@ -0,0 +1,95 @@
+"""
+Load test for the LLM path (scheduler, retries, hedging) against the mock provider.
+
+    python scripts/bench_llm_pipeline.py                          # 200 extractions, "realistic" profile
+    python scripts/bench_llm_pipeline.py --profile rate_limited --rpm 30
+    python scripts/bench_llm_pipeline.py --profile degraded --hedge-after 5 --calls 100
+
+Nothing is written to the database: the call ledger is disabled for the run.
+Reports end-to-end latency (queueing and retries included), outcome counts
+and the scheduler/hedge counters.
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.prompts import SIGNAL_EXTRACTION_SYSTEM_PROMPT, SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE
+from app.services.llm.mock_provider import MOCK_PROFILES, MockProvider
+from app.services.llm.registry import ActiveLLM
+from app.services.llm.scheduler import LLMScheduler
+from bench_suite import percentile
+from corpus_generator import generate_corpus
+
+
+def make_prompts(count: int, seed: int) -> list:
+    docs = [doc["text"] for doc in generate_corpus(sizes=(200, 2_000, 20_000), seed=seed)]
+    rng = random.Random(seed)
+    return [
+        SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE.format(
+            account_name="Load Test", content=rng.choice(docs), date="2025-01-01", sender="bench"
+        )
+        for _ in range(count)
+    ]
+
+
+async def run(args) -> None:
+    profile = MOCK_PROFILES[args.profile].model_copy(update={"seed": args.seed})
+    scheduler = LLMScheduler({"mock": {"rpm": args.rpm, "tpm": args.tpm, "max_in_flight": args.in_flight}})
+    primary = ActiveLLM(None, 0, "mock", f"mock-{args.profile}", MockProvider("", f"mock-{args.profile}", profile))
+    backup = None
+    if args.hedge_after > 0:
+        backup_profile = MOCK_PROFILES["realistic"].model_copy(update={"seed": args.seed + 1})
+        backup = ActiveLLM(None, 0, "mock", "mock-realistic", MockProvider("", "mock-realistic", backup_profile))
+
+    latencies, outcomes = [], Counter()
+
+    async def one(prompt: str) -> None:
+        started = time.perf_counter()
+        try:
+            await scheduler.hedged_generate_text(primary, backup, prompt, SIGNAL_EXTRACTION_SYSTEM_PROMPT,
+                                                 stage="extraction")
+            outcomes["success"] += 1
+        except Exception as e:
+            outcomes[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - started)
+
+    prompts = make_prompts(args.calls, args.seed)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(prompt) for prompt in prompts))
+    elapsed = time.perf_counter() - started
+
+    print(f"\nProfile {args.profile}: {args.calls} calls in {elapsed:.1f}s "
+          f"({args.calls / elapsed:.1f} calls/s, {args.in_flight} in flight)")
+    print(f"  latency p50 {percentile(latencies, 50):.2f}s  p90 {percentile(latencies, 90):.2f}s  "
+          f"p99 {percentile(latencies, 99):.2f}s  max {max(latencies):.2f}s")
+    print("  outcomes: " + ", ".join(f"{name}={count}" for name, count in outcomes.most_common()))
+    counters = {k: v for k, v in metrics.snapshot().items() if k.startswith(("llm.mock.", "llm.hedge."))}
+    for name, value in counters.items():
+        print(f"  {name}: {value:.1f}" if isinstance(value, float) else f"  {name}: {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM pipeline load test against the mock provider")
+    parser.add_argument("--profile", default="realistic", choices=sorted(MOCK_PROFILES))
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--in-flight", type=int, default=settings.LLM_MAX_IN_FLIGHT)
+    parser.add_argument("--rpm", type=int, default=0, help="Scheduler requests/minute (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="Scheduler tokens/minute (0 = unlimited)")
+    parser.add_argument("--hedge-after", type=float, default=0,
+                        help="Hedge to a 'realistic' backup after this many seconds (0 = no hedging)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    settings.LLM_LEDGER_ENABLED = False
+    settings.LLM_HEDGE_AFTER_SECONDS = args.hedge_after
+    asyncio.run(run(args))
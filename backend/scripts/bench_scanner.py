@@ -0,0 +1,104 @@
+import sys
+import os
+import random
+import time
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.keyword_scanner import (
+    CHURN_SIGNALS,
+    POSITIVE_SIGNALS,
+    ACTION_SIGNALS,
+    COMPLIANCE_SIGNALS,
+    scan_text,
+    scan_hits,
+    scan_many_hits,
+    get_matcher,
+)
+
+FILLER = (
+    "thanks for the update on the project timeline we reviewed the numbers with the team "
+    "and wanted to share a few notes before our next conversation about the rollout plan "
+).split()
+
+
+def legacy_scan(text: str) -> list:
+    """The original per-keyword substring loop, kept here only for comparison."""
+    text_lower = text.lower()
+    found = []
+    for signal_dict in (CHURN_SIGNALS, POSITIVE_SIGNALS, ACTION_SIGNALS, COMPLIANCE_SIGNALS):
+        for category, keywords in signal_dict.items():
+            for keyword in keywords:
+                if keyword in text_lower:
+                    found.append(keyword)
+    return found
+
+
+def make_text(n_words: int, keyword_every: int = 40) -> str:
+    rng = random.Random(n_words)
+    keywords = [k for d in (CHURN_SIGNALS, POSITIVE_SIGNALS, ACTION_SIGNALS, COMPLIANCE_SIGNALS)
+                for kws in d.values() for k in kws]
+    words = []
+    for i in range(n_words):
+        if i % keyword_every == 0:
+            words.append(rng.choice(keywords))
+        else:
+            words.append(rng.choice(FILLER))
+    return " ".join(words)
+
+
+def best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark():
+    get_matcher()  # compile outside the timed region
+    for keyword_every in (40, 2000):
+        print(f"\nOne keyword every {keyword_every} words")
+        print(f"{'words':>10} {'size':>10} {'legacy ms':>12} {'automaton ms':>14} {'speedup':>9}")
+        for n_words in (100, 1_000, 10_000, 100_000, 500_000):
+            text = make_text(n_words, keyword_every)
+            repeat = 20 if n_words <= 10_000 else 3
+            legacy = best_of(legacy_scan, text, repeat)
+            automaton = best_of(scan_text, text, repeat)
+            print(f"{n_words:>10} {len(text) / 1024:>8.0f}KB {legacy * 1000:>12.2f} "
+                  f"{automaton * 1000:>14.2f} {legacy / automaton:>8.2f}x")
+
+
+def run_batch_benchmark(n_texts: int = 20_000, words_per_text: int = 300):
+    texts = [make_text(words_per_text + i % 50, keyword_every=60) for i in range(n_texts)]
+    print(f"\nscan_many_hits over {n_texts} texts (~{words_per_text} words each)")
+    print(f"{'processes':>10} {'seconds':>10} {'texts/s':>10} {'scaling':>9}")
+    baseline = None
+    for processes in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        scan_many_hits(texts, processes=processes, chunk_size=500)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{processes:>10} {elapsed:>10.2f} {n_texts / elapsed:>10.0f} {baseline / elapsed:>8.2f}x")
+
+
+def run_match_heavy_benchmark(n_texts: int = 2_000):
+    """Short texts packed with keywords, where result construction dominates."""
+    texts = [make_text(200 + i % 20, keyword_every=3) for i in range(n_texts)]
+    get_matcher()
+    print(f"\nMatch-heavy texts ({n_texts} x ~200 words, a keyword every 3 words)")
+    print(f"{'path':>22} {'us/text':>10}")
+    for name, fn in (("scan_text (pydantic)", scan_text), ("scan_hits (slots)", scan_hits)):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>22} {elapsed / n_texts * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_batch_benchmark()
+    run_match_heavy_benchmark()
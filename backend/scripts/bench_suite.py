@@ -0,0 +1,161 @@
+"""
+Keyword scanner benchmark suite.
+
+    python scripts/bench_suite.py                       # full run, writes bench_results/<commit>.json
+    python scripts/bench_suite.py --quick               # sizes up to 200KB only
+    python scripts/bench_suite.py --compare old.json new.json
+
+Results are grouped by (function, kind, size, density) and record throughput
+(MB/s), p50/p99 latency per input and the peak memory allocated during a call.
+"""
+import sys
+import os
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.keyword_scanner import scan_text, should_analyze_with_llm, get_matcher
+from corpus_generator import generate_corpus, SIZES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bench_results")
+
+# Allocation tracking is slow on big inputs, so only the first few docs per bucket are traced
+ALLOC_SAMPLES = 3
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def measure(fn: Callable, args_list: List, sizes: Optional[List[int]] = None) -> Dict:
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(args)
+        latencies.append(time.perf_counter() - start)
+
+    peaks = []
+    for args in args_list[:ALLOC_SAMPLES]:
+        tracemalloc.start()
+        fn(args)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    # Throughput only makes sense for functions that consume the text itself
+    mb_per_s = None
+    if sizes and sum(latencies):
+        mb_per_s = round(sum(sizes) / 1_000_000 / sum(latencies), 3)
+    return {
+        "n": len(args_list),
+        "mb_per_s": mb_per_s,
+        "p50_ms": round(statistics.median(latencies) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+        "peak_alloc_kb": round(max(peaks) / 1024, 1),
+    }
+
+
+def run_suite(quick: bool = False) -> Dict:
+    sizes = [s for s in SIZES if not quick or s <= 200_000]
+    print(f"Generating corpus ({len(sizes)} size buckets)...")
+    corpus = generate_corpus(sizes=sizes)
+    print(f"Corpus: {len(corpus)} docs, {sum(len(d['text']) for d in corpus) / 1e6:.1f} MB")
+
+    get_matcher()  # compile outside the timed region
+
+    buckets: Dict[tuple, List[Dict]] = {}
+    for doc in corpus:
+        buckets.setdefault((doc["kind"], doc["size"], doc["density"]), []).append(doc)
+
+    results = []
+    for (kind, size, density), docs in sorted(buckets.items()):
+        texts = [d["text"] for d in docs]
+        byte_sizes = [len(t.encode("utf-8")) for t in texts]
+        scans = [scan_text(t) for t in texts]
+
+        for name, fn, args_list, sizes_arg in (
+            ("scan_text", scan_text, texts, byte_sizes),
+            ("should_analyze_with_llm", should_analyze_with_llm, scans, None),
+        ):
+            row = {"function": name, "kind": kind, "size": size, "density": density}
+            row.update(measure(fn, args_list, sizes_arg))
+            results.append(row)
+            print(f"{name:>24} {kind:>11} {size:>9} d={density:<6} "
+                  f"{row['mb_per_s'] or 0:>9.2f} MB/s  p50 {row['p50_ms']:>9.3f} ms  "
+                  f"p99 {row['p99_ms']:>9.3f} ms  peak {row['peak_alloc_kb']:>9.1f} KB")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def compare(old_path: str, new_path: str, threshold: float = 0.10) -> int:
+    """Print per-bucket changes; return 1 if any p50 latency regressed by more than `threshold`."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def key(row):
+        return (row["function"], row["kind"], row["size"], row["density"])
+
+    old_rows = {key(r): r for r in old["results"]}
+    regressions = 0
+    print(f"Comparing {old['commit']} -> {new['commit']}")
+    for row in new["results"]:
+        before = old_rows.get(key(row))
+        if not before or not before["p50_ms"]:
+            continue
+        change = row["p50_ms"] / before["p50_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{row['function']:>24} {row['kind']:>11} {row['size']:>9} d={row['density']:<6} "
+              f"p50 {before['p50_ms']:>9.3f} -> {row['p50_ms']:>9.3f} ms ({change:+.1%}){flag}")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keyword scanner benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="Skip the 1MB and 5MB buckets")
+    parser.add_argument("--output", help="Result file (default: bench_results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold for --compare")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, threshold=args.threshold))
+
+    report = run_suite(quick=args.quick)
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
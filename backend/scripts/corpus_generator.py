@@ -0,0 +1,130 @@
+import sys
+import os
+import random
+from typing import Dict, List, Optional
+
+# Add backend to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.keyword_scanner import DEFAULT_LEXICON
+
+KINDS = ("email", "call_notes", "transcript")
+
+# Default size buckets in bytes: 200B up to 5MB
+SIZES = (200, 2_000, 20_000, 200_000, 1_000_000, 5_000_000)
+
+KEYWORDS = [kw for _, signal_dict, _ in DEFAULT_LEXICON for kws in signal_dict.values() for kw in kws]
+
+FILLER_WORDS = (
+    "the a our your we they it this that project team timeline update numbers review "
+    "rollout plan data report quarter account users access system integration migration "
+    "dashboard onboarding training workflow process budget office staff contract "
+    "question answer detail week month today morning afternoon meeting notes item "
+    "agreed mentioned discussed shared noted asked confirmed looked walked through "
+    "about with for from into over after before during around regarding on in at"
+).split()
+
+NAMES = ["Dana Ortiz", "Sam Patel", "Jordan Lee", "Alex Kim", "Riley Chen", "Morgan Diaz"]
+
+
+def _sentence(rng: random.Random, keyword_density: float) -> str:
+    """One sentence of 8-20 words; each word slot is a lexicon keyword with p=keyword_density."""
+    words = []
+    for _ in range(rng.randint(8, 20)):
+        if rng.random() < keyword_density:
+            words.append(rng.choice(KEYWORDS))
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + rng.choice([".", ".", ".", "?", "!"])
+
+
+def _email(rng: random.Random, size: int, density: float) -> str:
+    sender, recipient = rng.sample(NAMES, 2)
+    parts = [
+        f"From: {sender} <{sender.split()[0].lower()}@customer.example.gov>",
+        f"To: {recipient} <{recipient.split()[0].lower()}@vendor.example.com>",
+        f"Subject: Re: {_sentence(rng, density)[:60]}",
+        "",
+        f"Hi {recipient.split()[0]},",
+        "",
+    ]
+    length = sum(len(p) + 1 for p in parts)
+    while length < size:
+        paragraph = " ".join(_sentence(rng, density) for _ in range(rng.randint(2, 5)))
+        parts.extend([paragraph, ""])
+        length += len(paragraph) + 2
+    parts.extend(["Thanks,", sender])
+    return "\n".join(parts)
+
+
+def _call_notes(rng: random.Random, size: int, density: float) -> str:
+    parts = [f"Call notes - {rng.choice(NAMES)} / {rng.choice(NAMES)}", ""]
+    length = sum(len(p) + 1 for p in parts)
+    while length < size:
+        line = f"- {_sentence(rng, density)}"
+        parts.append(line)
+        length += len(line) + 1
+    return "\n".join(parts)
+
+
+def _transcript(rng: random.Random, size: int, density: float) -> str:
+    speakers = rng.sample(NAMES, 3)
+    parts = []
+    length = 0
+    seconds = 0
+    while length < size:
+        seconds += rng.randint(3, 40)
+        stamp = f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+        turn = " ".join(_sentence(rng, density) for _ in range(rng.randint(1, 3)))
+        line = f"[{stamp}] {rng.choice(speakers)}: {turn}"
+        parts.append(line)
+        length += len(line) + 1
+    return "\n".join(parts)
+
+
+_GENERATORS = {"email": _email, "call_notes": _call_notes, "transcript": _transcript}
+
+
+def generate_document(kind: str, size: int, keyword_density: float = 0.01, seed: Optional[int] = None) -> str:
+    """
+    Generate a synthetic customer input of roughly `size` bytes.
+
+    keyword_density is the probability that any word is a lexicon keyword
+    (0.01 = about one keyword per 100 words).
+    """
+    rng = random.Random(seed if seed is not None else f"{kind}:{size}:{keyword_density}")
+    return _GENERATORS[kind](rng, size, keyword_density)[:size]
+
+
+def generate_corpus(
+    kinds=KINDS,
+    sizes=SIZES,
+    densities=(0.002, 0.02),
+    docs_per_bucket: Optional[Dict[int, int]] = None,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    Generate a corpus covering every (kind, size, density) bucket. Large sizes
+    get fewer documents by default so the corpus stays around ~50 MB.
+    """
+    corpus = []
+    for kind in kinds:
+        for size in sizes:
+            count = (docs_per_bucket or {}).get(size, max(1, min(50, 2_000_000 // size)))
+            for density in densities:
+                for i in range(count):
+                    corpus.append({
+                        "kind": kind,
+                        "size": size,
+                        "density": density,
+                        "text": generate_document(kind, size, density, seed=f"{seed}:{kind}:{size}:{density}:{i}"),
+                    })
+    return corpus
+
+
+if __name__ == "__main__":
+    for kind in KINDS:
+        print(f"--- {kind} ---")
+        print(generate_document(kind, 600, keyword_density=0.05))
+        print()
@@ -0,0 +1,23 @@
+"""In-memory SQLite databases for the tests, holding only the tables a test needs."""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+def session_factory(*models, shared: bool = False) -> sessionmaker:
+    """
+    sessionmaker over a fresh in-memory database with the tables of `models`.
+    shared=True puts every session on one connection, so code that writes from
+    another thread (executors, the ledger writer) sees the same database.
+    """
+    if shared:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine("sqlite://")
+    for model in models:
+        model.__table__.create(engine)
+    return sessionmaker(bind=engine)
+
+
+def make_session(*models) -> Session:
+    return session_factory(*models)()
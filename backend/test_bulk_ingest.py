@@ -0,0 +1,80 @@
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from app.services.bulk_ingest import BulkIngestor, iter_ndjson_lines
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+async def _collect(data: bytes, size: int):
+    return [item async for item in iter_ndjson_lines(_chunks(data, size))]
+
+def test_ndjson_lines_split_across_chunks():
+    body = b'{"a": 1}\n{"b": 2}\n\n{"c": 3}'
+    for size in (1, 3, 100):
+        lines = asyncio.run(_collect(body, size))
+        assert lines == [(1, '{"a": 1}'), (2, '{"b": 2}'), (3, ''), (4, '{"c": 3}')]
+
+def test_bulk_batch_reports_line_errors():
+    print("Testing bulk ingest batch...")
+    known_account = uuid4()
+    db = MagicMock()
+    db.query().filter().all.return_value = [(known_account,)]
+    
+    ingestor = BulkIngestor(db)
+    lines = [
+        json.dumps({"account_id": str(known_account), "content": "We are evaluating alternatives.", "input_type": "email"}),
+        "{not json",
+        json.dumps({"account_id": str(uuid4()), "content": "Hello", "input_type": "email"}),
+        json.dumps({"account_id": str(known_account), "content": "Thanks for the update.", "input_type": "email"}),
+    ]
+    # Keep the default lexicon instead of reloading it from the (mocked) DB
+    with patch("app.services.bulk_ingest.refresh_matcher"), \
+         patch("app.services.bulk_ingest.BULK_BATCH_SIZE", 3):
+        full = [ingestor.add_line(line_no, line) for line_no, line in enumerate(lines, start=1)]
+        ingestor.flush()
+    
+    # The caller flushes (in a thread) once a batch is full
+    assert full == [False, False, False, True]
+    
+    assert ingestor.received == 4
+    assert ingestor.inserted == 2
+    assert [e["line"] for e in ingestor.errors] == [2, 3]
+    
+    # One multi-row statement for inputs, one for extractions (only the churn line matched)
+    input_rows = db.execute.call_args_list[0].args[1]
+    extraction_rows = db.execute.call_args_list[1].args[1]
+    assert len(input_rows) == 2
+    assert [r["churn_signals"] for r in extraction_rows] == [["evaluating alternatives"]]
+    assert ingestor.affected_accounts == {known_account}
+    print("Bulk ingest batch PASS")
+
+def test_bulk_rows_match_save_input():
+    from app.schemas.intelligence import InputCreate
+    from app.services.intelligence import IntelligenceService
+    account_id = uuid4()
+    payload = {
+        "account_id": str(account_id), "input_type": "email", "folder": "Renewals",
+        "content": "From: Dana <dana@acme.com>\nTo: csm@us.com\nSubject: Renewal\n"
+                   "Date: Tue, 3 Mar 2026 09:15:00 +0000\n\nWe are evaluating alternatives.",
+    }
+    db = MagicMock()
+    db.query().filter().all.return_value = [(account_id,)]
+    ingestor = BulkIngestor(db)
+    with patch("app.services.bulk_ingest.refresh_matcher"):
+        ingestor.add_line(1, json.dumps(payload))
+        ingestor.flush()
+    bulk = db.execute.call_args_list[0].args[1][0]
+    
+    saved = IntelligenceService(MagicMock()).save_input(InputCreate(**payload))
+    for column in ("account_id", "input_type", "content", "sender", "folder", "subject", "recipients", "content_date"):
+        assert bulk[column] == getattr(saved, column), column
+    assert bulk["sender"] == "dana@acme.com" and bulk["subject"] == "Renewal"
+
+if __name__ == "__main__":
+    test_ndjson_lines_split_across_chunks()
+    test_bulk_batch_reports_line_errors()
+    test_bulk_rows_match_save_input()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.account import Account
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.schemas.intelligence import AnalysisResult, InputCreate
+from app.services.content_cache import (
+    LRUCache,
+    content_hash,
+    extraction_cache,
+    extraction_key,
+    get_cached_extraction,
+    store_extraction,
+)
+from app.services.intelligence import IntelligenceService
+from app.services.llm.mock_provider import MockProvider
+from app.services.llm.registry import ActiveLLM
+from sqlite_testing import make_session
+
+PROMPT_ARGS = {"account_name": "Acme", "date": datetime(2026, 1, 5), "sender": "pat@acme.com"}
+
+def test_lru_eviction_and_stats():
+    print("Testing LRU cache...")
+    cache = LRUCache("test_lru", max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recent
+    cache.put("c", 3)           # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    
+    stats = metrics.snapshot()
+    assert stats["cache.test_lru.hits"] == 2
+    assert stats["cache.test_lru.misses"] == 1
+    assert stats["cache.test_lru.size"] == 2
+    print("LRU cache PASS")
+
+def test_normalized_hash():
+    assert content_hash("Hello   World\n") == content_hash("hello world")
+    assert content_hash("hello world") != content_hash("hello there")
+
+def test_key_covers_prompt_args():
+    digest = content_hash("Please send the invoice.")
+    key = extraction_key(digest, "mock", "mock-model", PROMPT_ARGS)
+    assert key == extraction_key(digest, "mock", "mock-model", dict(reversed(list(PROMPT_ARGS.items()))))
+    # Forwarded, or dated "now" at a different moment of the same day: same key
+    for name, value in (("sender", "someone@else.com"), ("date", datetime(2026, 1, 5, 17, 3, 12, 4411))):
+        assert extraction_key(digest, "mock", "mock-model", {**PROMPT_ARGS, name: value}) == key
+    for name, value in (("account_name", "Globex"), ("date", datetime(2026, 1, 6))):
+        assert extraction_key(digest, "mock", "mock-model", {**PROMPT_ARGS, name: value}) != key
+
+class CountingMock(MockProvider):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.calls = 0
+
+    async def generate_text(self, prompt, system_prompt=None):
+        self.calls += 1
+        return json.dumps({"sentiment": "negative", "summary": "Considering a competitor.",
+                           "signals": ["churn_risk"], "commitments": [], "action_items": []})
+
+def test_repasted_undated_input_skips_the_llm():
+    print("Testing re-pasted input cache hit...")
+    extraction_cache.clear()
+    db = MagicMock()
+    db.query().filter().first.return_value = Account(name="Acme")
+    llm = CountingMock("", "mock-model")
+    active = ActiveLLM(config_id=uuid4(), version=1, provider="mock", model_name="mock-model", client=llm)
+    service = IntelligenceService(db)
+    notes = "Call notes: they are evaluating a competitor before renewal."
+
+    with patch("app.services.intelligence.get_active_llm", return_value=active), \
+         patch.object(settings, "EXTRACTION_CACHE_PERSIST", False), \
+         patch.object(settings, "LLM_LEDGER_ENABLED", False):
+        results = []
+        for sender in ("dana@acme.com", "pat@acme.com"):
+            # No content_date: save_input dates each one "now"
+            db_input = service.save_input(InputCreate(account_id=uuid4(), content=notes, input_type="call_notes",
+                                                      sender=sender))
+            db_input.id = uuid4()
+            results.append(asyncio.run(service._run_llm_analysis(db_input)))
+
+    assert llm.calls == 1
+    assert results[0].signals == results[1].signals == ["churn_risk"]
+    print("Re-pasted input cache hit PASS")
+
+def test_persistent_extraction_cache():
+    print("Testing persistent extraction cache...")
+    db = make_session(ExtractionCacheEntry)
+    
+    key = extraction_key(content_hash("We may cancel."), "mock", "mock-model", PROMPT_ARGS)
+    assert get_cached_extraction(db, key) is None
+    
+    source = uuid4()
+    analysis = AnalysisResult(sentiment="negative", summary="Churn risk.", signals=["churn_risk"],
+                              commitments=[{"description": "Send renewal quote"}], action_items=[])
+    store_extraction(db, key, analysis, source)
+    store_extraction(db, key, analysis, source)  # duplicate insert is ignored
+    db.commit()
+    
+    # A fresh process only has the table to go on
+    extraction_cache.clear()
+    cached = get_cached_extraction(db, key, source)
+    assert cached == analysis
+    assert db.query(ExtractionCacheEntry).one().hit_count == 1
+    
+    # Another input with the same content: its reminders were already created
+    for _ in range(2):  # from the table, then from memory
+        reused = get_cached_extraction(db, key, uuid4())
+        assert reused.commitments == [] and reused.signals == analysis.signals
+        extraction_cache.clear()
+    assert get_cached_extraction(db, key, source).commitments == analysis.commitments
+    db.close()
+    print("Persistent extraction cache PASS")
+
+if __name__ == "__main__":
+    test_lru_eviction_and_stats()
+    test_normalized_hash()
+    test_key_covers_prompt_args()
+    test_repasted_undated_input_skips_the_llm()
+    test_persistent_extraction_cache()
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from app.services.email_parser import analysis_text, parse_email_input
+from app.services.keyword_scanner import scan_text
+
+GMAIL_REPLY = """From: Dana Ortiz <dana@customer.example.gov>
+To: Sam Patel <sam@vendor.example.com>, Jordan Lee <jordan@vendor.example.com>
+CC: procurement@customer.example.gov
+Subject: Re: Renewal timeline
+Date: Mon, 5 Jan 2026 09:14:00 -0500
+
+Hi Sam,
+
+Legal approved the DPA, so we can sign the renewal this week.
+
+Thanks,
+Dana Ortiz
+Director of Operations | Customer Agency
+(555) 010-2000
+
+CONFIDENTIALITY NOTICE: This email and any attachments are confidential and intended solely for the use of the individual to whom it is addressed.
+
+On Fri, Jan 2, 2026 at 4:02 PM Sam Patel <sam@vendor.example.com>
+wrote:
+> Hi Dana, we heard you are evaluating alternatives and may cancel.
+> Can we set up a call?
+"""
+
+OUTLOOK_REPLY = """Sounds good, see you Thursday.
+
+Sent from my iPhone
+
+________________________________
+From: Sam Patel <sam@vendor.example.com>
+Sent: Friday, January 2, 2026 4:02 PM
+To: Dana Ortiz <dana@customer.example.gov>
+Subject: Budget cuts
+
+We understand the budget cuts may force a cancellation.
+"""
+
+def test_headers_are_parsed():
+    parsed = parse_email_input(GMAIL_REPLY)
+    assert parsed["sender_email"] == "dana@customer.example.gov"
+    assert parsed["sender_name"] == "Dana Ortiz"
+    assert parsed["recipients"] == ["sam@vendor.example.com", "jordan@vendor.example.com",
+                                    "procurement@customer.example.gov"]
+    assert parsed["subject"] == "Re: Renewal timeline"
+    assert parsed["date"].replace(tzinfo=None) == datetime(2026, 1, 5, 9, 14)
+    assert parsed["body"].startswith("Hi Sam,")
+
+def test_quoted_history_signature_and_disclaimer_are_dropped():
+    print("Testing email normalization...")
+    new = parse_email_input(GMAIL_REPLY)["new_content"]
+    assert new == "Hi Sam,\n\nLegal approved the DPA, so we can sign the renewal this week."
+    # The old churn keywords only live in the quoted history
+    assert scan_text(GMAIL_REPLY).churn_signals
+    assert not scan_text(new).churn_signals
+
+    assert parse_email_input(OUTLOOK_REPLY)["new_content"] == "Sounds good, see you Thursday."
+    print("Email normalization PASS")
+
+def test_content_is_kept_when_nothing_new():
+    forward = "---------- Original Message ----------\nFrom: a@b.com\n\nWe plan to cancel."
+    assert parse_email_input(forward)["new_content"] == forward.strip()
+    plain = "We are evaluating alternatives.\nThanks for the quick turnaround on the report"
+    assert parse_email_input(plain)["new_content"] == plain
+
+def test_sign_off_mid_message_keeps_the_rest():
+    body = ("Hi Dana,\nThanks for the call.\n\nThanks!\nWe have decided to cancel the contract at renewal.\n"
+            "Please send termination paperwork.\nPat")
+    new = parse_email_input(body)["new_content"]
+    assert new == body
+    assert scan_text(new).churn_signals
+
+def test_only_emails_are_normalized():
+    assert analysis_text("call_notes", GMAIL_REPLY) == GMAIL_REPLY
+    assert "wrote:" not in analysis_text("email", GMAIL_REPLY)
+
+if __name__ == "__main__":
+    test_headers_are_parsed()
+    test_quoted_history_signature_and_disclaimer_are_dropped()
+    test_content_is_kept_when_nothing_new()
+    test_sign_off_mid_message_keeps_the_rest()
+    test_only_emails_are_normalized()
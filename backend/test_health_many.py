@@ -0,0 +1,240 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+from sqlalchemy import ARRAY, create_engine, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.base import Base
+from app.models.contact import Contact
+from app.models.health_score import HealthScore
+from app.models.health_summary_job import HealthSummaryJob
+from app.models.input import Input
+from app.models.signal_extraction import SignalExtraction
+from app.services.health.assessment import FAILED_MESSAGE, HealthAssessmentGenerator
+from app.services.health.calculator import HealthCalculator
+from app.services.health_summary import claim_next_summary, run_summary_job
+
+# Postgres ARRAY columns stored as JSON text, so the real queries run on sqlite
+@compiles(ARRAY, "sqlite")
+def _array_as_json(type_, compiler, **kw):
+    return "JSONLIST"
+
+sqlite3.register_adapter(list, json.dumps)
+sqlite3.register_converter("JSONLIST", json.loads)
+
+COMPARED = ["overall_score", "overall_status", "sentiment_score", "engagement_score", "request_score",
+            "relationship_score", "satisfaction_score", "expansion_score", "previous_score", "score_change",
+            "trend_direction", "triggered_by", "input_fingerprint"]
+
+def make_db():
+    engine = create_engine("sqlite://", connect_args={"detect_types": sqlite3.PARSE_DECLTYPES})
+    Base.metadata.create_all(engine, tables=[
+        model.__table__ for model in (Account, Input, SignalExtraction, Contact, HealthScore, HealthSummaryJob)
+    ])
+    return engine, Session(engine)
+
+def add_input(db, account, days_ago, **extraction):
+    db_input = Input(account_id=account.id, input_type="email", content="...", is_processed=True,
+                     content_date=datetime.utcnow() - timedelta(days=days_ago))
+    db.add(db_input)
+    db.flush()
+    if extraction:
+        db.add(SignalExtraction(input_id=db_input.id, **extraction))
+
+def seed(db):
+    active = Account(name="Active", account_type="standard", check_in_interval_days=14)
+    quiet = Account(name="Quiet", account_type="standard", check_in_interval_days=7)
+    busy = Account(name="Busy", account_type="standard")
+    empty = Account(name="Empty", account_type="standard")
+    db.add_all([active, quiet, busy, empty])
+    db.flush()
+
+    add_input(db, active, 1, sentiment="positive", signals=["renewal", "expansion"])
+    add_input(db, active, 3, sentiment="negative", signals=["bug in export", "renewal"])
+    add_input(db, active, 4)
+    db.add_all([Contact(account_id=active.id, name=f"Contact {i}") for i in range(3)])
+    db.add_all([HealthScore(account_id=active.id, overall_score=score, overall_status="warning",
+                            calculated_at=datetime.utcnow() - timedelta(days=days))
+                for score, days in ((40, 10), (55, 1))])
+
+    # Overdue, so decay applies
+    add_input(db, quiet, 40, sentiment="neutral", signals=["feature request"])
+    db.add(Contact(account_id=quiet.id, name="Only contact"))
+
+    # More inputs than the pillars look at; the oldest ones carry churn signals that must not count
+    for days in range(15):
+        add_input(db, busy, days, sentiment="negative" if days >= 10 else "positive",
+                  signals=["cancel"] if days >= 10 else ["upsell"])
+    db.add(Input(account_id=busy.id, input_type="email", content="unprocessed", is_processed=False,
+                 content_date=datetime.utcnow()))
+    db.commit()
+    return [active, quiet, busy, empty]
+
+async def fake_summary(**kwargs):
+    return f"{kwargs['account_name']} {kwargs['score']}: {', '.join(kwargs['signals'])}"
+
+def llm_patch():
+    return patch.object(HealthAssessmentGenerator, "generate_summary", side_effect=fake_summary)
+
+def drain(db):
+    """Run the summary worker until the queue is empty."""
+    while True:
+        job = claim_next_summary(db)
+        if job is None:
+            return
+        asyncio.run(run_summary_job(db, job.id))
+
+def test_batch_matches_per_account_path():
+    print("Testing calculate_health_many parity...")
+    engine, db = make_db()
+    accounts = seed(db)
+    calculator = HealthCalculator(db)
+
+    expected = {}
+    for account in accounts:
+        _, health, signals = calculator.score_account(account.id, triggered_by="daily_job")
+        expected[account.id] = (health, asyncio.run(fake_summary(
+            account_name=account.name, score=health.overall_score, signals=signals)))
+
+    statements = []
+    record = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", record)
+    with llm_patch() as llm:
+        scores = asyncio.run(calculator.calculate_health_many([a.id for a in accounts] + [uuid4()], "daily_job"))
+    event.remove(engine, "before_cursor_execute", record)
+
+    # Saved without waiting for any summary
+    assert not llm.called
+    assert set(scores) == {a.id for a in accounts}  # the unknown id is skipped
+    for account_id, health in scores.items():
+        for field in COMPARED:
+            assert getattr(health, field) == getattr(expected[account_id][0], field), (field, account_id)
+        assert health.ai_summary is None and health.summary_status == "pending"
+
+    # Four loads for the whole set instead of five queries per account, then only inserts
+    selects = [s for s in statements if s.startswith("SELECT")]
+    assert len(selects) == 4
+    assert sum("ROW_NUMBER() OVER (PARTITION BY" in s.upper() for s in selects) == 2
+    assert all(s.startswith(("INSERT INTO health_scores", "INSERT INTO health_summary_jobs"))
+               for s in statements if s not in selects)
+
+    with llm_patch():
+        drain(db)
+    saved = {h.account_id: h for h in db.query(HealthScore).filter(HealthScore.id.in_([h.id for h in scores.values()]))}
+    assert len(saved) == len(accounts)
+    for account_id, health in saved.items():
+        assert health.summary_status == "completed"
+        assert health.ai_summary == expected[account_id][1]
+
+    by_name = {a.name: saved[a.id] for a in accounts}
+    assert by_name["Active"].previous_score == 55
+    assert by_name["Quiet"].triggered_by == "decay"
+    assert "cancel" not in by_name["Busy"].ai_summary
+    print("calculate_health_many parity PASS")
+
+def test_chunks_are_independent():
+    engine, db = make_db()
+    accounts = seed(db)
+    calculator = HealthCalculator(db)
+    original = calculator._load_many
+    calls = []
+
+    def flaky(account_ids):
+        calls.append(account_ids)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        return original(account_ids)
+
+    with patch("app.services.health.calculator.BATCH_CHUNK_SIZE", 2), \
+         patch.object(calculator, "_load_many", side_effect=flaky):
+        scores = asyncio.run(calculator.calculate_health_many([a.id for a in accounts]))
+
+    # The failed chunk is scored one account at a time instead
+    assert len(calls) == 2
+    assert set(scores) == {a.id for a in accounts}
+    assert db.query(HealthScore).filter(HealthScore.id.in_([h.id for h in scores.values()])).count() == 4
+    assert db.query(HealthSummaryJob).count() == 4
+
+def test_unchanged_accounts_reuse_summary():
+    print("Testing summary reuse...")
+    engine, db = make_db()
+    active, quiet, busy, empty = seed(db)
+    calculator = HealthCalculator(db)
+    everyone = [a.id for a in (active, quiet, busy, empty)]
+
+    with llm_patch() as llm:
+        asyncio.run(calculator.calculate_health_many(everyone))
+        drain(db)
+        assert llm.call_count == 4
+        completed = db.query(HealthScore).filter(HealthScore.summary_status == "completed").all()
+        first = {h.account_id: h.ai_summary for h in completed}
+
+        # New extraction for Busy; everyone else only moved with the clock
+        add_input(db, busy, 0, sentiment="negative", signals=["frustrated users"])
+        db.commit()
+        second = asyncio.run(calculator.calculate_health_many(everyone))
+        assert second[busy.id].summary_status == "pending"
+        for account in (active, quiet, empty):
+            assert second[account.id].summary_status == "completed"
+            assert second[account.id].ai_summary == first[account.id]
+        drain(db)
+        assert llm.call_count == 5
+        assert llm.call_args.kwargs["account_name"] == "Busy"
+
+        # The per-account path reads the same fingerprint
+        score = asyncio.run(calculator.calculate_health(active.id))
+        assert score.ai_summary == first[active.id] and db.query(HealthSummaryJob).filter(
+            HealthSummaryJob.status == "queued").count() == 0
+
+    # A failed summary is never carried over
+    db.query(HealthScore).filter(HealthScore.account_id == quiet.id).update({"ai_summary": FAILED_MESSAGE})
+    db.commit()
+    assert asyncio.run(calculator.calculate_health(quiet.id)).summary_status == "pending"
+    print("Summary reuse PASS")
+
+def test_summary_worker_retries_and_skips_superseded():
+    print("Testing summary worker...")
+    engine, db = make_db()
+    active, quiet, _, _ = seed(db)
+    calculator = HealthCalculator(db)
+
+    score = asyncio.run(calculator.calculate_health(active.id))
+    with patch.object(HealthAssessmentGenerator, "generate_summary", return_value=FAILED_MESSAGE):
+        drain(db)
+    job = db.query(HealthSummaryJob).filter(HealthSummaryJob.health_score_id == score.id).one()
+    assert job.status == "queued" and job.attempts == 1 and job.run_after > datetime.utcnow()
+    assert score.summary_status == "pending"
+
+    # A newer score arrives before the retry is due: the old one is never summarized
+    newer = asyncio.run(calculator.calculate_health(active.id))
+    job.run_after = datetime.utcnow()
+    db.commit()
+    with llm_patch() as llm:
+        drain(db)
+    assert llm.call_count == 1
+    db.refresh(score)
+    assert score.summary_status == "superseded" and score.ai_summary is None
+    assert newer.summary_status == "completed" and newer.ai_summary.startswith("Active")
+
+    # The worker on the last attempt died: the lease expires and the summary is given up on
+    last = asyncio.run(calculator.calculate_health(quiet.id))
+    job = db.query(HealthSummaryJob).filter(HealthSummaryJob.health_score_id == last.id).one()
+    job.status, job.attempts = "running", job.max_attempts
+    job.started_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+    assert claim_next_summary(db) is None
+    db.refresh(last)
+    assert job.status == "failed" and last.summary_status == "failed" and last.ai_summary == FAILED_MESSAGE
+    print("Summary worker PASS")
+
+if __name__ == "__main__":
+    test_batch_matches_per_account_path()
+    test_chunks_are_independent()
+    test_unchanged_accounts_reuse_summary()
+    test_summary_worker_retries_and_skips_superseded()
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+from app.core import metrics
+from app.core.config import settings
+from app.models.health_recalc import PendingHealthRecalc
+from app.services.health_recalc import claim_due, finish_claims, request_recalculation
+from sqlite_testing import make_session
+
+def test_burst_coalesces_into_one_recalc():
+    print("Testing debounced health recalculation...")
+    db = make_session(PendingHealthRecalc)
+    account, other = uuid4(), uuid4()
+    saved_before = metrics.get("health_recalc.saved")
+    
+    for _ in range(50):
+        request_recalculation(db, account)
+    request_recalculation(db, other)
+    
+    pending = db.query(PendingHealthRecalc).filter(PendingHealthRecalc.account_id == account).one()
+    assert pending.request_count == 50
+    assert db.query(PendingHealthRecalc).count() == 2
+    assert metrics.get("health_recalc.saved") - saved_before == 49
+    
+    # Still inside the debounce window
+    assert claim_due(db) == []
+    
+    db.query(PendingHealthRecalc).update({PendingHealthRecalc.run_after: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    claimed = claim_due(db)
+    assert sorted(c.request_count for c in claimed) == [1, 50]
+    # Leased, not deleted, until the scores are saved
+    assert claim_due(db) == [] and db.query(PendingHealthRecalc).count() == 2
+    
+    # A new input while the recalculation runs starts a fresh window
+    request_recalculation(db, account)
+    finish_claims(db, claimed, {account, other})
+    pending = db.query(PendingHealthRecalc).one()
+    assert pending.account_id == account and pending.request_count == 1 and pending.claimed_at is None
+    db.close()
+    print("Debounced health recalculation PASS")
+
+def test_max_delay_caps_the_debounce():
+    db = make_session(PendingHealthRecalc)
+    account = uuid4()
+    request_recalculation(db, account)
+    
+    pending = db.query(PendingHealthRecalc).one()
+    pending.first_requested_at = datetime.utcnow() - timedelta(seconds=settings.HEALTH_RECALC_MAX_DELAY_SECONDS)
+    db.commit()
+    
+    # Inputs keep arriving, but the run is no longer pushed out
+    request_recalculation(db, account)
+    assert [c.request_count for c in claim_due(db)] == [2]
+    db.close()
+
+def test_failed_and_orphaned_recalcs_run_again():
+    db = make_session(PendingHealthRecalc)
+    ok, broken = uuid4(), uuid4()
+    for account in (ok, broken):
+        request_recalculation(db, account)
+    db.query(PendingHealthRecalc).update({PendingHealthRecalc.run_after: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+    # The score for `broken` was not saved: it is released, not dropped
+    finish_claims(db, claim_due(db), {ok})
+    pending = db.query(PendingHealthRecalc).one()
+    assert pending.account_id == broken and pending.claimed_at is None and pending.run_after > datetime.utcnow()
+
+    # A worker died holding the lease; it expires and the row is claimed again
+    pending.run_after = datetime.utcnow() - timedelta(seconds=1)
+    pending.claimed_at = datetime.utcnow() - timedelta(seconds=settings.INGEST_LEASE_SECONDS + 1)
+    db.commit()
+    assert [c.account_id for c in claim_due(db)] == [broken]
+    db.close()
+
+if __name__ == "__main__":
+    test_burst_coalesces_into_one_recalc()
+    test_max_delay_caps_the_debounce()
+    test_failed_and_orphaned_recalcs_run_again()
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from app.models.account import Account
+from app.models.input import Input
+from app.models.signal_extraction import SignalExtraction
+from app.services.health.assessment import FAILED_MESSAGE
+from app.services.health.calculator import HealthCalculator
+from app.services.llm.mock_provider import MockProvider
+from app.services.llm.registry import ActiveLLM
+
+def make_db(account_id):
+    db = MagicMock()
+    account = Account(id=account_id, name="Test Corp", check_in_interval_days=14)
+    recent = Input(id=uuid4(), account_id=account_id, content="Thanks!", input_type="email",
+                   content_date=datetime.utcnow() - timedelta(days=1), is_processed=True)
+    db.query().filter().first.return_value = account
+    db.query().filter().order_by().first.return_value = None  # no previous score
+    db.query().filter().order_by().limit().all.return_value = [recent]
+    db.query().filter().all.return_value = [SignalExtraction(input_id=recent.id, sentiment="positive", signals=["renewal"])]
+    db.query().filter().count.return_value = 3
+    return db
+
+def test_stream_pillars_then_summary_then_score():
+    print("Testing streamed health assessment...")
+    account_id = uuid4()
+    db = make_db(account_id)
+    mock = ActiveLLM(config_id=uuid4(), version=1, provider="mock", model_name="mock-model",
+                     client=MockProvider("", "mock-model"))
+    
+    async def collect():
+        calculator = HealthCalculator(db)
+        events = []
+        async for kind, payload in calculator.stream_health(account_id):
+            if kind == "pillars":
+                # Pillars arrive before the summary exists and before anything is saved
+                assert payload.ai_summary is None and not db.add.called
+            events.append((kind, payload))
+        return events
+    
+    with patch("app.services.health.assessment.get_active_llm", return_value=mock), \
+         patch("app.services.llm.ledger.settings.LLM_LEDGER_ENABLED", False):
+        events = asyncio.run(collect())
+    
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "pillars" and kinds[-1] == "score"
+    assert set(kinds[1:-1]) == {"summary"} and len(kinds) > 5  # streamed word by word
+    
+    streamed = "".join(piece for kind, piece in events if kind == "summary")
+    expected = asyncio.run(MockProvider("", "mock-model").generate_text("assess"))
+    assert streamed == expected
+    
+    saved = events[-1][1]
+    assert saved.ai_summary == expected
+    assert saved.overall_score == events[0][1].overall_score
+    db.add.assert_called_once_with(saved)
+    db.commit.assert_called()
+    print("Streamed health assessment PASS")
+
+class BrokenStream(MockProvider):
+    async def stream_text(self, prompt, system_prompt=None):
+        yield "The account is"
+        yield " renewing and"
+        raise ConnectionError("stream reset")
+
+def test_broken_stream_stores_only_the_failure():
+    account_id = uuid4()
+    db = make_db(account_id)
+    broken = ActiveLLM(config_id=uuid4(), version=1, provider="mock", model_name="mock-model",
+                       client=BrokenStream("", "mock-model"))
+
+    async def collect():
+        return [event async for event in HealthCalculator(db).stream_health(account_id)]
+
+    with patch("app.services.health.assessment.get_active_llm", return_value=broken), \
+         patch("app.services.llm.ledger.settings.LLM_LEDGER_ENABLED", False):
+        events = asyncio.run(collect())
+    saved = events[-1][1]
+    assert saved.ai_summary == FAILED_MESSAGE and saved.summary_status == "failed"
+
+def test_abandoned_blocking_stream_stops_the_producer():
+    read = []
+    closed = threading.Event()
+
+    def sdk_stream():
+        try:
+            for i in range(1000):
+                read.append(i)
+                time.sleep(0.001)
+                yield f"piece {i} "
+        finally:
+            closed.set()
+
+    async def first_piece():
+        stream = MockProvider("", "mock-model")._stream_blocking(sdk_stream)
+        async for piece in stream:
+            await stream.aclose()  # the client went away
+            return piece
+
+    assert asyncio.run(first_piece()) == "piece 0 "
+    assert closed.wait(timeout=2)
+    assert len(read) < 1000
+
+if __name__ == "__main__":
+    test_stream_pillars_then_summary_then_score()
+    test_broken_stream_stores_only_the_failure()
+    test_abandoned_blocking_stream_stops_the_producer()
@@ -0,0 +1,70 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.services.health.calculator import HealthCalculator
+from app.services.health.pillars import (
+    EngagementPillar, ExpansionPillar, RelationshipPillar, RequestPillar, SatisfactionPillar, SentimentPillar
+)
+from app.services.health.vectorized import PILLAR_WEIGHTS, apply_decay, pack, score_pillars
+
+SIGNALS = ["renewal", "Bug in export", "feature request", "Critical issue", "happy with support", "unhappy",
+           "dissatisfied", "frustrated users", "love the dashboard", "upsell seats", "Add-on interest",
+           "growth plans", "expansion", "bug/feature request combo", "budget review"]
+
+def random_portfolio(n, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    extractions, last_dates, intervals, contacts = [], [], [], []
+    for _ in range(n):
+        extractions.append([
+            SimpleNamespace(
+                sentiment=rng.choice(["positive", "negative", "neutral", None]),
+                signals=rng.choice([None, [], rng.sample(SIGNALS, rng.randint(1, 4))])
+            )
+            for _ in range(rng.choice([0, 0, 1, 3, 10]))
+        ])
+        # Mid-day offsets keep the day counts away from the boundary the scalar path's own utcnow() could cross
+        last_dates.append(None if rng.random() < 0.1 else now - timedelta(days=rng.randint(0, 60), hours=12))
+        intervals.append(rng.choice([None, 7, 14, 30]))
+        contacts.append(rng.choice([0, 1, 2, 5]))
+    return extractions, last_dates, intervals, contacts, now
+
+def test_pillars_match_scalar():
+    print("Testing vectorized pillars...")
+    extractions, last_dates, intervals, contacts, now = random_portfolio(500, seed=3)
+    scores = score_pillars(pack(extractions, last_dates, intervals, contacts, now=now))
+
+    for i in range(500):
+        expected = (
+            SentimentPillar.calculate(extractions[i]),
+            EngagementPillar.calculate(last_dates[i], intervals[i] or 14),
+            RequestPillar.calculate(extractions[i]),
+            RelationshipPillar.calculate(contacts[i]),
+            SatisfactionPillar.calculate(extractions[i]),
+            ExpansionPillar.calculate(extractions[i]),
+        )
+        assert tuple(int(pillar[i]) for pillar in scores[:6]) == expected, i
+        # The scalar formula, in its own summation order
+        assert int(scores.overall[i]) == int(sum(p * w for p, w in zip(expected, PILLAR_WEIGHTS))), i
+    print("Vectorized pillars PASS")
+
+def test_decay_matches_scalar():
+    extractions, last_dates, intervals, contacts, now = random_portfolio(300, seed=11)
+    arrays = pack(extractions, last_dates, intervals, contacts, now=now)
+    overall = score_pillars(arrays).overall
+    adjusted, applied = apply_decay(arrays, overall, HealthCalculator.DECAY_RATE_PER_DAY, HealthCalculator.DECAY_FLOOR)
+
+    calculator = HealthCalculator(db=None)
+    for i in range(300):
+        account = SimpleNamespace(check_in_interval_days=intervals[i])
+        assert (int(adjusted[i]), bool(applied[i])) == calculator._apply_decay(account, int(overall[i]), last_dates[i])
+
+def test_empty_portfolio():
+    scores = score_pillars(pack([], [], [], []))
+    assert all(len(pillar) == 0 for pillar in scores)
+
+if __name__ == "__main__":
+    test_pillars_match_scalar()
+    test_decay_matches_scalar()
+    test_empty_portfolio()
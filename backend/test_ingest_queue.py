@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from app.core.config import settings
+from app.models.ingest_job import IngestJob
+from app.services.ingest_queue import claim_next_job, enqueue_input, retry_delay, run_job, start_workers
+from app.services.job_lease import keep_lease
+from sqlite_testing import make_session, session_factory
+
+def test_claim_order_and_backoff():
+    print("Testing ingest job claiming...")
+    db = make_session(IngestJob)
+    first = enqueue_input(db, uuid4())
+    later = enqueue_input(db, uuid4())
+    later.run_after = datetime.utcnow() + timedelta(minutes=5)  # backing off
+    db.commit()
+    
+    job = claim_next_job(db)
+    assert job.id == first.id
+    assert job.status == "running" and job.attempts == 1
+    
+    # Nothing else is due yet
+    assert claim_next_job(db) is None
+    
+    # A worker crashed mid-job: the lease expires and the job is reclaimed
+    job.started_at = datetime.utcnow() - timedelta(seconds=settings.INGEST_LEASE_SECONDS + 1)
+    db.commit()
+    reclaimed = claim_next_job(db)
+    assert reclaimed.id == first.id and reclaimed.attempts == 2
+    db.close()
+    print("Ingest job claiming PASS")
+
+def test_final_attempt_is_not_reclaimed():
+    db = make_session(IngestJob)
+    job = enqueue_input(db, uuid4())
+    job.max_attempts = 2
+    db.commit()
+    assert claim_next_job(db).attempts == 1
+    expired = datetime.utcnow() - timedelta(seconds=settings.INGEST_LEASE_SECONDS + 1)
+    job.started_at = expired
+    db.commit()
+    assert claim_next_job(db).attempts == 2
+
+    # The worker running the last attempt died too
+    job.started_at = expired
+    db.commit()
+    assert claim_next_job(db) is None
+    db.refresh(job)
+    assert job.status == "failed" and job.attempts == 2 and job.finished_at is not None
+    db.close()
+
+def test_lease_heartbeat():
+    print("Testing lease heartbeat...")
+    # The heartbeat writes from an executor thread
+    Session = session_factory(IngestJob, shared=True)
+    db = Session()
+    job = enqueue_input(db, uuid4())
+    claim_next_job(db)
+    stale = datetime.utcnow() - timedelta(minutes=5)
+    job.started_at = stale
+    db.commit()
+
+    async def beat(attempt):
+        await asyncio.wait_for(keep_lease(IngestJob, job.id, attempt), timeout=0.2)
+
+    with patch("app.services.job_lease.SessionLocal", Session), \
+         patch.object(settings, "INGEST_LEASE_SECONDS", 0.15):
+        # Another worker's attempt: left alone
+        try:
+            asyncio.run(beat(attempt=2))
+        except asyncio.TimeoutError:
+            pass
+        db.refresh(job)
+        assert job.started_at == stale
+        try:
+            asyncio.run(beat(attempt=1))
+        except asyncio.TimeoutError:
+            pass
+    db.refresh(job)
+    assert job.started_at > stale
+    db.close()
+
+    # A job deleted after it was claimed is skipped
+    with patch("app.services.ingest_queue.SessionLocal", Session):
+        asyncio.run(run_job(uuid4()))
+    print("Lease heartbeat PASS")
+
+def test_summary_workers_start_without_ingest_workers():
+    async def start(count):
+        stop = asyncio.Event()
+        stop.set()  # every loop exits right away
+        with patch.object(settings, "HEALTH_SUMMARY_WORKERS", 2), \
+             patch("app.services.ingest_queue.summary_loop", new=AsyncMock()) as summary:
+            tasks = start_workers(count, stop)
+            await asyncio.gather(*tasks)
+        return len(tasks), summary.await_count
+
+    assert asyncio.run(start(0)) == (2, 2)
+    with patch("app.services.ingest_queue.recalc_loop", new=AsyncMock()):
+        assert asyncio.run(start(3)) == (6, 2)  # + 3 ingest loops and the recalc loop
+
+def test_retry_delay_grows():
+    base = settings.INGEST_RETRY_BASE_SECONDS
+    assert base * 0.8 <= retry_delay(1) <= base * 1.2
+    assert base * 4 * 0.8 <= retry_delay(3) <= base * 4 * 1.2
+    assert retry_delay(30) <= 3600 * 1.2
+
+if __name__ == "__main__":
+    test_claim_order_and_backoff()
+    test_final_attempt_is_not_reclaimed()
+    test_lease_heartbeat()
+    test_summary_workers_start_without_ingest_workers()
+    test_retry_delay_grows()
@@ -0,0 +1,37 @@
+from app.models.lexicon import LexiconKeyword, LexiconRevision
+from app.services import lexicon as lexicon_service
+from app.services.keyword_scanner import scan_text, get_matcher, install_matcher, LexiconMatcher, DEFAULT_LEXICON
+from sqlite_testing import make_session
+
+def test_versioned_reload():
+    print("Testing DB-backed lexicon reload...")
+    db = make_session(LexiconKeyword, LexiconRevision)
+    try:
+        # Nothing stored yet: the built-in lexicon (version 0) stays active
+        assert lexicon_service.refresh_matcher(db, force=True).version == 0
+        assert scan_text("Let's talk about the QBR").action_signals == ['qbr']
+        
+        lexicon_service.ensure_seeded(db)
+        db.add(LexiconKeyword(keyword="price increase", signal_group="churn", category="high"))
+        version = lexicon_service.record_revision(db, "Added 'price increase'")
+        assert version == 2
+        
+        old_matcher = get_matcher()
+        result = scan_text("The price increase is a deal breaker")
+        assert result.lexicon_version == 2
+        assert result.churn_signals == ['deal breaker', 'price increase']
+        assert result.keyword_severity == "high"
+        
+        # Unchanged version: the compiled matcher is reused, not rebuilt
+        assert lexicon_service.refresh_matcher(db, force=True) is old_matcher
+        
+        db.query(LexiconKeyword).filter(LexiconKeyword.keyword == "qbr").delete()
+        lexicon_service.record_revision(db, "Removed 'qbr'")
+        assert scan_text("Let's talk about the QBR").action_signals == []
+        print("Lexicon reload PASS")
+    finally:
+        db.close()
+        install_matcher(LexiconMatcher(DEFAULT_LEXICON))
+
+if __name__ == "__main__":
+    test_versioned_reload()
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from app.services.llm.providers import AnthropicProvider, GoogleProvider, OpenAIProvider
+
+SERVER_DELAY = 0.5
+
+class SlowLLMHandler(BaseHTTPRequestHandler):
+    """Stand-in for the provider APIs: answers every call after SERVER_DELAY seconds."""
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(SERVER_DELAY)
+        if self.path.endswith("/messages"):
+            body = {"id": "msg_1", "type": "message", "role": "assistant", "model": "slow",
+                    "content": [{"type": "text", "text": "hello"}], "stop_reason": "end_turn",
+                    "usage": {"input_tokens": 1, "output_tokens": 1}}
+        else:
+            body = {"id": "cmpl_1", "object": "chat.completion", "created": 0, "model": "slow",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": "hello"}}]}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+async def run_with_ticker(calls):
+    """Run the calls concurrently; return (results, elapsed, longest gap between 10ms ticks)."""
+    gaps = []
+    done = asyncio.Event()
+    
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+    
+    tick_task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    results = await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick_task
+    return results, elapsed, max(gaps)
+
+def test_event_loop_stays_responsive():
+    print("Testing non-blocking LLM providers...")
+    server, url = start_server()
+    os.environ["ANTHROPIC_BASE_URL"] = url
+    os.environ["OPENAI_BASE_URL"] = f"{url}/v1"
+    try:
+        anthropic_llm = AnthropicProvider("sk-test", "slow")
+        openai_llm = OpenAIProvider("sk-test", "slow")
+        
+        async def main():
+            calls = [anthropic_llm.generate_text("hi") for _ in range(3)]
+            calls += [openai_llm.generate_text("hi", system_prompt="be brief") for _ in range(3)]
+            return await run_with_ticker(calls)
+        
+        results, elapsed, max_gap = asyncio.run(main())
+        assert results == ["hello"] * 6
+        # Six 0.5s calls overlap instead of queueing behind each other
+        assert elapsed < SERVER_DELAY * 3, elapsed
+        assert max_gap < 0.2, max_gap
+    finally:
+        os.environ.pop("ANTHROPIC_BASE_URL", None)
+        os.environ.pop("OPENAI_BASE_URL", None)
+        server.shutdown()
+    print("Non-blocking LLM providers PASS")
+
+def test_thread_pool_fallback_and_timeout():
+    google_llm = GoogleProvider("test-key", "slow")
+    
+    def slow_generate(prompt, request_options=None):
+        time.sleep(SERVER_DELAY)
+        return SimpleNamespace(text="hello")
+    google_llm.model_instance = SimpleNamespace(generate_content=slow_generate)
+    
+    async def main():
+        return await run_with_ticker([google_llm.generate_text("hi") for _ in range(3)])
+    
+    results, elapsed, max_gap = asyncio.run(main())
+    assert results == ["hello"] * 3
+    assert elapsed < SERVER_DELAY * 2 and max_gap < 0.2
+    
+    google_llm.timeout = 0.1
+    try:
+        asyncio.run(google_llm.generate_text("hi"))
+        assert False, "expected a timeout"
+    except asyncio.TimeoutError:
+        pass
+
+if __name__ == "__main__":
+    test_event_loop_stays_responsive()
+    test_thread_pool_fallback_and_timeout()
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.llm_call import LLMCall
+from app.services.llm.ledger import flush_ledger
+from app.services.llm.mock_provider import MockProvider
+from app.services.llm.registry import ActiveLLM
+from app.services.llm.scheduler import LLMScheduler
+from sqlite_testing import session_factory
+
+class TimedMock(MockProvider):
+    def __init__(self, model, delay, fail=False):
+        super().__init__("", model)
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+    
+    async def generate_text(self, prompt, system_prompt=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise ValueError(f"{self.model} is down")
+        return self.model
+
+def active(llm):
+    return ActiveLLM(config_id=uuid4(), version=1, provider="mock", model_name=llm.model, client=llm)
+
+def run_hedged(primary, backup):
+    # The rows are written from the ledger's thread
+    Session = session_factory(LLMCall, shared=True)
+    scheduler = LLMScheduler({})
+    
+    async def call():
+        result = await scheduler.hedged_generate_text(active(primary), active(backup), "hi", stage="extraction")
+        await asyncio.sleep(0.05)  # let the cancelled loser record its ledger row
+        return result
+    
+    with patch("app.services.llm.ledger.SessionLocal", Session), \
+         patch.object(settings, "LLM_HEDGE_AFTER_SECONDS", 0.1):
+        start = time.perf_counter()
+        try:
+            result = asyncio.run(call())
+            elapsed = time.perf_counter() - start
+        finally:
+            # Also when the call raises: the rows must land before the patch lifts
+            flush_ledger()
+    rows = Session().query(LLMCall).all()
+    return result, elapsed, {(r.route, r.status) for r in rows}
+
+def test_slow_primary_is_hedged():
+    print("Testing hedged LLM requests...")
+    won = metrics.get("llm.hedge.won_hedge")
+    result, elapsed, ledger = run_hedged(TimedMock("primary", 2.0), TimedMock("backup", 0.05))
+    assert result == "backup"
+    assert elapsed < 1.0
+    assert ledger == {("primary", "cancelled"), ("hedge", "success")}
+    assert metrics.get("llm.hedge.won_hedge") == won + 1
+    print("Hedged LLM requests PASS")
+
+def test_fast_primary_never_hedges():
+    backup = TimedMock("backup", 0.0)
+    result, _, ledger = run_hedged(TimedMock("primary", 0.01), backup)
+    assert result == "primary"
+    assert backup.calls == 0
+    assert ledger == {("primary", "success")}
+
+def test_failed_primary_fails_over():
+    result, elapsed, ledger = run_hedged(TimedMock("primary", 0.0, fail=True), TimedMock("backup", 0.0))
+    assert result == "backup"
+    assert ("primary", "error") in ledger and ("hedge", "success") in ledger
+    
+    # Both down: the error surfaces
+    try:
+        run_hedged(TimedMock("primary", 0.0, fail=True), TimedMock("backup", 0.0, fail=True))
+        assert False
+    except ValueError:
+        pass
+
+def test_cancelled_caller_cancels_the_primary():
+    primary, backup = TimedMock("primary", 2.0), TimedMock("backup", 0.0)
+    scheduler = LLMScheduler({})
+
+    async def main():
+        caller = asyncio.ensure_future(
+            scheduler.hedged_generate_text(active(primary), active(backup), "hi", stage="extraction")
+        )
+        await asyncio.sleep(0.05)  # still inside the hedge delay
+        caller.cancel()
+        try:
+            await caller
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0)  # let the primary see its cancellation
+        # Checked inside the loop: asyncio.run cancels leftovers on the way out
+        return primary.cancelled
+
+    with patch.object(settings, "LLM_HEDGE_AFTER_SECONDS", 0.5), \
+         patch.object(settings, "LLM_LEDGER_ENABLED", False):
+        start = time.perf_counter()
+        cancelled = asyncio.run(main())
+    assert cancelled and backup.calls == 0
+    assert time.perf_counter() - start < 1.0
+
+if __name__ == "__main__":
+    test_slow_primary_is_hedged()
+    test_fast_primary_never_hedges()
+    test_failed_primary_fails_over()
+    test_cancelled_caller_cancels_the_primary()
@@ -0,0 +1,78 @@
+import asyncio
+from unittest.mock import patch
+
+from app.models.llm_call import LLMCall
+from app.services.llm.ledger import flush_ledger, price_for
+from app.services.llm.mock_provider import MockProvider
+from app.services.llm.scheduler import LLMScheduler
+from app.services.llm.usage import _current_usage, estimate_tokens, report_usage
+from sqlite_testing import session_factory
+
+SAMPLE = ("Hi Dana, thanks for the call on 2024-03-18. We're evaluating alternatives "
+          "because the renewal quote went up 35%, but the team loves the new dashboard!")
+
+def test_token_estimates():
+    for family in ("anthropic", "openai", "google", ""):
+        tokens = estimate_tokens(SAMPLE, family, "")
+        # English runs about 3.5-4.5 characters per token
+        assert len(SAMPLE) / 6 < tokens < len(SAMPLE) / 2.5, (family, tokens)
+    assert estimate_tokens(SAMPLE, "anthropic") >= estimate_tokens(SAMPLE, "google")
+    assert estimate_tokens("") == 0
+
+def test_pricing_prefix():
+    assert price_for("gpt-4o-mini-2024-07-18") == (0.15, 0.60)
+    assert price_for("gpt-4o-2024-08-06") == (2.50, 10.00)
+    assert price_for("mock-model") is None
+
+class ReportingMock(MockProvider):
+    async def generate_text(self, prompt, system_prompt=None):
+        report_usage(120, 30)
+        return "ok"
+
+class FailingMock(MockProvider):
+    async def generate_text(self, prompt, system_prompt=None):
+        raise ValueError("bad request")
+
+def test_every_call_is_recorded():
+    print("Testing LLM call ledger...")
+    # The rows are written from the ledger's thread
+    Session = session_factory(LLMCall, shared=True)
+    scheduler = LLMScheduler({})
+    
+    async def calls():
+        await scheduler.generate_text("mock", MockProvider("", "mock-model"), SAMPLE, stage="extraction")
+        await scheduler.generate_text("openai", ReportingMock("", "gpt-4o-mini"), SAMPLE, stage="health_assessment")
+        pieces = [p async for p in scheduler.stream_text("mock", MockProvider("", "mock-model"), "assess", stage="health_assessment")]
+        try:
+            await scheduler.generate_text("mock", FailingMock("", "mock-model"), SAMPLE, stage="extraction")
+        except ValueError:
+            pass
+        return pieces
+    
+    with patch("app.services.llm.ledger.SessionLocal", Session):
+        asyncio.run(calls())
+        flush_ledger()
+    
+    db = Session()
+    rows = db.query(LLMCall).order_by(LLMCall.created_at).all()
+    assert [(r.stage, r.status) for r in rows] == [
+        ("extraction", "success"),
+        ("health_assessment", "success"),
+        ("health_assessment", "success"),
+        ("extraction", "error"),
+    ]
+    estimated, reported, streamed, failed = rows
+    assert estimated.tokens_estimated and estimated.prompt_tokens > 0 and estimated.completion_tokens > 0
+    assert not reported.tokens_estimated
+    assert (reported.prompt_tokens, reported.completion_tokens) == (120, 30)
+    assert abs(reported.cost_usd - (120 * 0.15 + 30 * 0.60) / 1_000_000) < 1e-12
+    assert streamed.streamed and streamed.completion_tokens > 5
+    assert failed.error == "bad request" and failed.latency_ms is not None
+    assert _current_usage.get() is None  # nothing left tracking after the calls
+    db.close()
+    print("LLM call ledger PASS")
+
+if __name__ == "__main__":
+    test_token_estimates()
+    test_pricing_prefix()
+    test_every_call_is_recorded()
@@ -0,0 +1,43 @@
+from app.core import metrics
+from app.core.security import encrypt_string
+from app.models.llm_config import LLMConfiguration
+from app.services.llm import registry
+from sqlite_testing import make_session
+
+def test_client_is_reused_until_config_changes():
+    print("Testing LLM client registry...")
+    db = make_session(LLMConfiguration)
+    registry.invalidate()
+    assert registry.get_active_llm(db) is None
+    
+    config = LLMConfiguration(provider="mock", model_name="mock-model",
+                              api_key_encrypted=encrypt_string("sk-test"), is_active=True)
+    db.add(config)
+    db.commit()
+    registry.invalidate()
+    
+    builds = metrics.get("llm.client_builds")
+    first = registry.get_active_llm(db)
+    assert first.client.api_key == "sk-test"
+    assert registry.get_active_llm(db).client is first.client
+    assert metrics.get("llm.client_builds") - builds == 1
+    
+    # Another process saves a new model: picked up on the next version check
+    config.model_name = "mock-model-2"
+    config.version += 1
+    db.commit()
+    registry._last_checked.clear()  # refresh interval elapsed
+    second = registry.get_active_llm(db)
+    assert second.client is not first.client
+    assert second.model_name == "mock-model-2"
+    
+    # Unchanged version: the check is one query and the client is kept
+    registry._last_checked.clear()
+    assert registry.get_active_llm(db).client is second.client
+    assert metrics.get("llm.client_builds") - builds == 2
+    registry.invalidate()
+    db.close()
+    print("LLM client registry PASS")
+
+if __name__ == "__main__":
+    test_client_is_reused_until_config_changes()
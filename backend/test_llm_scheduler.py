@@ -0,0 +1,113 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.core import metrics
+from app.core.config import settings
+from app.services.llm.scheduler import LLMScheduler, TokenBucket, retry_after_seconds
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+    
+    def __init__(self, retry_after: str):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+def test_token_bucket():
+    now = [0.0]
+    bucket = TokenBucket(60, clock=lambda: now[0])  # one per second
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == 1.0
+    assert bucket.reserve(1) == 2.0
+    now[0] = 10.0  # refilled 10, still owed 2
+    assert bucket.reserve(1) == 0.0
+    assert TokenBucket(0).reserve(10 ** 6) == 0.0
+
+def test_in_flight_cap_and_rate():
+    print("Testing LLM scheduler limits...")
+    scheduler = LLMScheduler({"fake": {"rpm": 600, "tpm": 0, "max_in_flight": 2}})
+    active = []
+    peak = [0]
+    
+    async def call():
+        active.append(1)
+        peak[0] = max(peak[0], len(active))
+        await asyncio.sleep(0.25)
+        active.pop()
+        return "ok"
+    
+    async def main():
+        return await asyncio.gather(*[scheduler.run("fake", call) for _ in range(8)])
+    
+    # Drain the burst allowance so the rate limit is what paces the calls
+    scheduler.limiter("fake").requests.tokens = 0
+    start = time.perf_counter()
+    assert asyncio.run(main()) == ["ok"] * 8
+    elapsed = time.perf_counter() - start
+    assert peak[0] == 2
+    # 600 rpm = one call per 100ms
+    assert elapsed >= 0.7, elapsed
+    assert scheduler.limiter("fake").waiting == 0
+    assert metrics.get("llm.fake.wait_seconds_total") > 0
+    print("LLM scheduler limits PASS")
+
+def test_rate_wait_does_not_hold_a_slot():
+    scheduler = LLMScheduler({"fake": {"rpm": 300, "max_in_flight": 1}})  # one call per 200ms
+    limiter = scheduler.limiter("fake")
+
+    async def call():
+        return "ok"
+
+    async def main():
+        limiter.requests.tokens = 0
+        task = asyncio.ensure_future(scheduler.run("fake", call))
+        await asyncio.sleep(0.05)
+        # Sleeping off its reservation, queued, and not occupying the only slot
+        assert limiter.waiting == 1 and not limiter.semaphore().locked()
+        return await task
+
+    assert asyncio.run(main()) == "ok"
+
+def test_limits_are_split_across_processes():
+    with patch.object(settings, "LLM_RATE_LIMIT_PROCESSES", 4):
+        limiter = LLMScheduler({"fake": {"rpm": 50, "tpm": 40000}}).limiter("fake")
+        assert (limiter.requests.capacity, limiter.tokens.capacity) == (12, 10000)
+        assert LLMScheduler({"tiny": {"rpm": 2}}).limiter("tiny").requests.capacity == 1
+        assert LLMScheduler({}).limiter("fake").requests.rate == 0  # unlimited stays unlimited
+
+def test_retry_after_is_honored():
+    scheduler = LLMScheduler({"flaky": {"max_in_flight": 4}})
+    attempts = []
+    
+    async def call():
+        attempts.append(time.perf_counter())
+        if len(attempts) == 1:
+            raise FakeRateLimitError("0.3")
+        return "ok"
+    
+    assert asyncio.run(scheduler.run("flaky", call)) == "ok"
+    assert attempts[1] - attempts[0] >= 0.3
+    assert metrics.get("llm.flaky.rate_limited") == 1
+    
+    async def broken():
+        raise ValueError("not retryable")
+    try:
+        asyncio.run(scheduler.run("flaky", broken))
+        assert False
+    except ValueError:
+        pass
+
+def test_retry_after_parsing():
+    assert retry_after_seconds(FakeRateLimitError("7")) == 7.0
+    ms = SimpleNamespace(response=SimpleNamespace(headers={"retry-after-ms": "250"}))
+    assert retry_after_seconds(ms) == 0.25
+    assert retry_after_seconds(ValueError()) is None
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_in_flight_cap_and_rate()
+    test_rate_wait_does_not_hold_a_slot()
+    test_limits_are_split_across_processes()
+    test_retry_after_is_honored()
+    test_retry_after_parsing()
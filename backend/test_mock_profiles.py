@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.core.prompts import SIGNAL_EXTRACTION_SYSTEM_PROMPT, SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE
+from app.services.llm.mock_provider import MOCK_PROFILES, MockAPIError, MockProfile, MockProvider, get_profile
+from app.services.llm.scheduler import LLMScheduler, is_retryable, retry_after_seconds
+
+def extraction_prompt(content: str) -> str:
+    return SIGNAL_EXTRACTION_USER_PROMPT_TEMPLATE.format(
+        account_name="Acme", content=content, date="2025-01-01", sender="ceo@acme.com"
+    )
+
+def test_profile_selection():
+    assert get_profile("mock-model") == MOCK_PROFILES["instant"]
+    assert get_profile("mock-degraded") == MOCK_PROFILES["degraded"]
+    with patch.object(settings, "MOCK_LLM_PROFILE", "realistic"), \
+         patch.object(settings, "MOCK_LLM_PROFILE_OVERRIDES", {"error_rate": 0.5}):
+        profile = get_profile("mock-model")
+    assert profile.latency_median_ms == MOCK_PROFILES["realistic"].latency_median_ms
+    assert profile.error_rate == 0.5
+
+def test_latency_distribution():
+    print("Testing mock latency distribution...")
+    provider = MockProvider("", "mock", MockProfile(latency_median_ms=1000, latency_p99_ms=5000, seed=3))
+    samples = sorted(provider._latency() for _ in range(5000))
+    assert 0.9 < samples[2500] < 1.1, samples[2500]
+    assert 4.0 < samples[4950] < 6.0, samples[4950]
+
+    # Same seed, same sequence
+    again = MockProvider("", "mock", MockProfile(latency_median_ms=1000, latency_p99_ms=5000, seed=3))
+    first = MockProvider("", "mock", MockProfile(latency_median_ms=1000, latency_p99_ms=5000, seed=3))
+    assert [again._latency() for _ in range(5)] == [first._latency() for _ in range(5)]
+    print("Latency distribution PASS")
+
+def test_errors_are_retried_by_scheduler():
+    print("Testing injected errors through the scheduler...")
+    provider = MockProvider("", "mock", MockProfile(error_rate=0.5, seed=11))
+    scheduler = LLMScheduler({"mock": {"max_in_flight": 8}})
+    outcomes = {"ok": 0, "errors": 0}
+
+    async def main():
+        async def one():
+            try:
+                await provider.generate_text("hello")
+                outcomes["ok"] += 1
+            except MockAPIError as e:
+                assert is_retryable(e)
+                outcomes["errors"] += 1
+        await asyncio.gather(*[one() for _ in range(400)])
+
+    asyncio.run(main())
+    assert 150 < outcomes["errors"] < 250, outcomes
+
+    with patch.object(settings, "LLM_RETRY_BASE_SECONDS", 0.01), \
+         patch.object(settings, "LLM_LEDGER_ENABLED", False), \
+         patch.object(settings, "LLM_SCHEDULER_MAX_ATTEMPTS", 10):
+        text = asyncio.run(scheduler.generate_text("mock", provider, "hello"))
+    assert "account" in text
+    print("Injected errors PASS")
+
+def test_rate_limit_429_has_retry_after():
+    provider = MockProvider("", "mock", MockProfile(rpm_limit=2))
+    asyncio.run(provider.generate_text("one"))
+    asyncio.run(provider.generate_text("two"))
+    try:
+        asyncio.run(provider.generate_text("three"))
+        assert False
+    except MockAPIError as e:
+        assert e.status_code == 429
+        assert 59 < retry_after_seconds(e) <= 60
+
+def test_timeouts_hang_for_provider_timeout():
+    provider = MockProvider("", "mock", MockProfile(timeout_rate=1.0))
+    provider.timeout = 0.05
+    start = time.perf_counter()
+    try:
+        asyncio.run(provider.generate_text("hello"))
+        assert False
+    except asyncio.TimeoutError as e:
+        assert is_retryable(e)
+    assert time.perf_counter() - start >= 0.05
+
+def test_content_aware_extraction():
+    print("Testing content-aware mock responses...")
+    provider = MockProvider("", "mock", MockProfile(content_aware=True))
+    churn = json.loads(asyncio.run(provider.generate_text(
+        extraction_prompt("We are going to cancel our subscription. Your competitor is cheaper."),
+        system_prompt=SIGNAL_EXTRACTION_SYSTEM_PROMPT
+    )))
+    assert churn["sentiment"] == "negative"
+    assert churn["signals"]
+    assert churn["summary"].startswith("We are going to cancel")
+
+    happy = json.loads(asyncio.run(provider.generate_text(
+        extraction_prompt("Thanks for the update on the timeline."),
+        system_prompt=SIGNAL_EXTRACTION_SYSTEM_PROMPT
+    )))
+    assert happy["sentiment"] in ("positive", "neutral")
+    assert happy["signals"] == []
+    print("Content-aware responses PASS")
+
+if __name__ == "__main__":
+    test_profile_selection()
+    test_latency_distribution()
+    test_errors_are_retried_by_scheduler()
+    test_rate_limit_429_has_retry_after()
+    test_timeouts_hang_for_provider_timeout()
+    test_content_aware_extraction()
@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.core import metrics
+from app.schemas.intelligence import AnalysisResult
+from app.services.intelligence import IntelligenceService
+from app.services.near_duplicate import (
+    LSHIndex, MinHasher, NearDuplicate, NearDuplicateDetector, novel_text, shingles, similarity
+)
+
+THREAD = "\n".join([
+    "Hi team, following up on the renewal discussion from last week.",
+    "We reviewed the pricing options with finance and procurement.",
+    "Our main concern is the per seat cost for the analytics module.",
+    "The rollout to the second region is still planned for March.",
+    "Can you send the updated order form and the security questionnaire?",
+    "Thanks, Dana",
+])
+REPLY = "Quick update: legal approved the DPA, we can sign this week.\n" + \
+        "\n".join(f"> {line}" for line in THREAD.splitlines())
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher(256, 3)
+    a = " ".join(f"word{i}" for i in range(200))
+    b = " ".join(f"word{i}" for i in range(40, 240))
+    sa, sb = shingles(a, 3), shingles(b, 3)
+    true = len(sa & sb) / len(sa | sb)
+    assert abs(similarity(hasher.signature(a), hasher.signature(b)) - true) < 0.08
+    assert hasher.signature("") is None
+
+def test_lsh_finds_reply_and_evicts():
+    hasher = MinHasher(128, 5)
+    index = LSHIndex(bands=32, window=2)
+    thread_id, other_id = uuid4(), uuid4()
+    index.add(thread_id, hasher.signature(THREAD))
+    index.add(other_id, hasher.signature("Completely unrelated note about the holiday party schedule and parking."))
+    matches = index.query(hasher.signature(REPLY))
+    assert matches[0][0] == thread_id and matches[0][1] > 0.6
+
+    index.add(uuid4(), hasher.signature("A third input pushes the oldest out of the window."))
+    assert thread_id not in index
+    assert all(thread_id not in bucket for bucket in index.buckets.values())
+
+def test_novel_text_strips_quoted_thread():
+    assert novel_text(THREAD, REPLY) == "Quick update: legal approved the DPA, we can sign this week."
+    assert novel_text(THREAD, THREAD) == ""
+
+def test_detector_tops_up_from_recent_inputs():
+    earlier_id = uuid4()
+    db = MagicMock()
+    db.query().filter().order_by().limit().all.return_value = [SimpleNamespace(id=earlier_id)]
+    db.query().filter().all.return_value = [SimpleNamespace(id=earlier_id, input_type="call_notes", content=THREAD)]
+    detector = NearDuplicateDetector()
+    match = asyncio.run(detector.find(db, SimpleNamespace(id=uuid4(), account_id=uuid4()), REPLY))
+    assert match.input_id == earlier_id and match.similarity > 0.6
+
+def _run(match, earlier_content, previous, content=REPLY):
+    db = MagicMock()
+    db.query().filter().first.side_effect = [("call_notes", earlier_content), previous]
+    service = IntelligenceService(db)
+    db_input = SimpleNamespace(id=uuid4(), account_id=uuid4(), content=content)
+    fresh = AnalysisResult(sentiment="positive", summary="DPA approved.", signals=[], action_items=[])
+    with patch("app.services.intelligence.near_duplicates.find", new=AsyncMock(return_value=match)), \
+         patch.object(service, "_run_llm_analysis", new=AsyncMock(return_value=fresh)) as llm:
+        return asyncio.run(service._analyze_with_llm(db_input, content)), llm
+
+def test_near_duplicate_reuses_or_narrows():
+    print("Testing near-duplicate analysis...")
+    previous = SimpleNamespace(sentiment="neutral", summary="Renewal follow-up.", signals=["pricing_concern"],
+                               action_items=["Send order form"])
+    skipped = metrics.get("near_dup.skipped_calls")
+
+    bump = "See below, thanks!\n" + "\n".join(f"> {line}" for line in THREAD.splitlines())
+    analysis, llm = _run(NearDuplicate(uuid4(), 0.95), THREAD, previous, content=bump)
+    assert analysis.summary == "Renewal follow-up." and analysis.commitments == []
+    llm.assert_not_awaited()
+    assert metrics.get("near_dup.skipped_calls") == skipped + 1
+
+    # Very similar, but the new lines say something: narrowed, not reused
+    analysis, llm = _run(NearDuplicate(uuid4(), 0.95), THREAD, previous)
+    assert analysis.summary == "DPA approved."
+    assert llm.await_args.args[1] == "Quick update: legal approved the DPA, we can sign this week."
+
+    analysis, llm = _run(NearDuplicate(uuid4(), 0.7), THREAD, previous)
+    assert analysis.summary == "DPA approved."
+    assert llm.await_args.args[1] == "Quick update: legal approved the DPA, we can sign this week."
+
+    analysis, llm = _run(None, "", None)
+    assert llm.await_args.args[1] == REPLY
+    print("Near-duplicate analysis PASS")
+
+if __name__ == "__main__":
+    test_minhash_estimates_jaccard()
+    test_lsh_finds_reply_and_evicts()
+    test_novel_text_strips_quoted_thread()
+    test_detector_tops_up_from_recent_inputs()
+    test_near_duplicate_reuses_or_narrows()
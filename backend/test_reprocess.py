@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from app.schemas.intelligence import AnalysisResult
+from app.services.intelligence import PARSE_FAILED_SUMMARY
+from app.services.reprocess import ReprocessFilters, Reprocessor, estimate_run, fetch_page
+
+CHURN = "We are going to cancel our subscription."
+QUIET = "Thanks for the update on the timeline."
+
+def make_input(content: str, account_id=None, minutes: int = 0):
+    return SimpleNamespace(id=uuid4(), account_id=account_id or uuid4(), content=content, input_type="call_notes",
+                           created_at=datetime(2025, 1, 1) + timedelta(minutes=minutes))
+
+def make_run():
+    return SimpleNamespace(name="test", status="running", filters={}, last_created_at=None, last_input_id=None,
+                           processed=0, extracted=0, failed=0, touched_accounts=[], finished_at=None)
+
+def test_keyset_page_query():
+    captured = []
+    filters = ReprocessFilters(account_id=uuid4(), since=datetime(2025, 1, 1), lexicon_below=7)
+    with patch.object(Query, "all", lambda self: captured.append(self) or []):
+        fetch_page(Session(), filters, after=(datetime(2025, 2, 1), uuid4()), limit=50)
+    sql = str(captured[0].statement.compile(dialect=postgresql.dialect()))
+    assert "(inputs.created_at, inputs.id) >" in sql
+    assert "NOT (EXISTS" in sql and "signal_extractions.lexicon_version >=" in sql
+    assert "ORDER BY inputs.created_at, inputs.id" in sql
+    assert "OFFSET" not in sql
+
+def test_batch_writes_and_checkpoint():
+    print("Testing reprocess batch...")
+    account = uuid4()
+    churn, quiet, stale = make_input(CHURN, account), make_input(QUIET, account, 1), make_input(QUIET, minutes=2)
+    # `stale` had a keyword-only extraction that no longer matches; `churn` had an LLM one
+    churn_old = SimpleNamespace(id=uuid4(), input_id=churn.id, llm_analyzed=True)
+    stale_old = SimpleNamespace(id=uuid4(), input_id=stale.id, llm_analyzed=False)
+    db = MagicMock()
+    db.query().filter().all.return_value = [churn_old, stale_old]
+
+    analysis = AnalysisResult(sentiment="negative", summary="Cancelling.", signals=["churn"], action_items=[])
+    reprocessor = Reprocessor(db, "test", ReprocessFilters(with_llm=True))
+    run = make_run()
+    with patch("app.services.reprocess.refresh_matcher"), \
+         patch.object(reprocessor.intelligence, "reextract", new=AsyncMock(return_value=analysis)) as llm:
+        asyncio.run(reprocessor.process_batch(run, [churn, quiet, stale]))
+
+    # Only the churn input warranted the LLM
+    assert [call.args[0] for call in llm.await_args_list] == [churn]
+    updates = db.execute.call_args_list[-1].args[1]
+    assert [u["id"] for u in updates] == [churn_old.id]
+    assert updates[0]["summary"] == "Cancelling." and updates[0]["churn_signals"]
+    assert db.query().filter().delete.called
+
+    assert (run.last_created_at, run.last_input_id) == (stale.created_at, stale.id)
+    assert (run.processed, run.extracted, run.failed) == (3, 1, 0)
+    assert set(run.touched_accounts) == {str(account), str(stale.account_id)}
+    assert db.commit.called
+    print("Reprocess batch PASS")
+
+def test_failed_extraction_keeps_previous_llm_fields():
+    churn = make_input(CHURN)
+    old = SimpleNamespace(id=uuid4(), input_id=churn.id, llm_analyzed=True)
+    db = MagicMock()
+    db.query().filter().all.return_value = [old]
+    failed = AnalysisResult(sentiment="neutral", summary=PARSE_FAILED_SUMMARY, signals=[], action_items=[])
+    reprocessor = Reprocessor(db, "test", ReprocessFilters(with_llm=True))
+    run = make_run()
+    with patch("app.services.reprocess.refresh_matcher"), \
+         patch.object(reprocessor.intelligence, "reextract", new=AsyncMock(return_value=failed)):
+        asyncio.run(reprocessor.process_batch(run, [churn]))
+    updates = db.execute.call_args_list[-1].args[1]
+    assert "summary" not in updates[0] and updates[0]["churn_signals"]
+    assert (run.extracted, run.failed) == (0, 1)
+
+def test_resume_and_one_recalc_per_account():
+    print("Testing reprocess resume...")
+    account = uuid4()
+    inputs = [make_input(QUIET, account, minutes=i) for i in range(5)]
+    run = make_run()
+    cursors = []
+
+    def fake_fetch(db, filters, after, limit):
+        cursors.append(after)
+        start = 0 if after is None else next(i for i, x in enumerate(inputs) if x.id == after[1]) + 1
+        return inputs[start:start + limit]
+
+    async def crash_on_second(self, run, batch):
+        if run.processed:
+            raise RuntimeError("worker died")
+        await original(self, run, batch)
+
+    original = Reprocessor.process_batch
+    db = MagicMock()
+    db.query().filter().all.return_value = []
+    calculator = MagicMock()
+    calculator.return_value.calculate_health_many = AsyncMock(return_value={})
+    with patch("app.services.reprocess.fetch_page", side_effect=fake_fetch), \
+         patch("app.services.reprocess.refresh_matcher"), \
+         patch("app.services.health.calculator.HealthCalculator", calculator), \
+         patch.object(Reprocessor, "start_or_resume", return_value=run):
+        with patch.object(Reprocessor, "process_batch", crash_on_second):
+            try:
+                asyncio.run(Reprocessor(db, "test", ReprocessFilters(), batch_size=2).run())
+                assert False
+            except RuntimeError:
+                pass
+        assert run.status == "failed" and run.processed == 2
+
+        asyncio.run(Reprocessor(db, "test", ReprocessFilters(), batch_size=2).run())
+
+    # The resumed walk started after the last committed batch
+    assert cursors[2] == (inputs[1].created_at, inputs[1].id)
+    assert run.status == "completed" and run.processed == 5
+    assert calculator.return_value.calculate_health_many.await_count == 1
+    assert calculator.return_value.calculate_health_many.await_args.args[0] == [account]
+    print("Reprocess resume PASS")
+
+def test_dry_run_estimate():
+    inputs = [make_input(CHURN + " " + "word " * 100), make_input(QUIET)]
+    pages = [inputs, []]
+    active = SimpleNamespace(model_name="gpt-4o-mini", client=SimpleNamespace(count_tokens=lambda t: len(t.split())))
+    with patch("app.services.reprocess.fetch_page", side_effect=lambda *a: pages.pop(0)), \
+         patch("app.services.reprocess.refresh_matcher"), \
+         patch("app.services.reprocess.get_active_llm", return_value=active):
+        report = estimate_run(MagicMock(), ReprocessFilters(with_llm=True))
+    assert report["inputs"] == 2 and report["accounts"] == 2
+    assert report["llm_inputs"] == 1 and report["llm_calls"] == 1
+    assert report["prompt_tokens"] > 100
+    assert report["estimated_cost_usd"] > 0
+
+if __name__ == "__main__":
+    test_keyset_page_query()
+    test_batch_writes_and_checkpoint()
+    test_failed_extraction_keeps_previous_llm_fields()
+    test_resume_and_one_recalc_per_account()
+    test_dry_run_estimate()
@@ -33,3 +33,69 @@ print_result(text4, result4)
 text5 = "Just checking in on the ticket."
 result5 = scan_text(text5)
 print_result(text5, result5)
+
+# Test 6: Word boundaries ('ato' in 'potato', 'cor' in 'core')
+text6 = "Our core team ordered potato chips for the offsite."
+result6 = scan_text(text6)
+print_result(text6, result6)
+assert result6.compliance_signals == []
+
+# Test 7: Overlapping phrases are all reported
+text7 = "Section 508 compliance is part of the security review, let's schedule time."
+result7 = scan_text(text7)
+print_result(text7, result7)
+assert result7.compliance_signals == ['508 compliance', 'section 508', 'security review']
+assert result7.action_signals == ['schedule time', "let's schedule"]
+
+# Test 7b: Quotes and hyphens split off at word edges, wherever the word sits
+from app.services.keyword_scanner import tokenize
+assert tokenize("'cancel' now") == ["'", "cancel", "'", "now"]
+assert tokenize("we won't off-board") == ["we", "won't", "off-board"]
+for quoted in ("'cancel' our plan", "please\t'cancel' our plan", "please 'cancel' our plan",
+               "please\n'cancel'", "-cancel- our plan"):
+    assert scan_text(quoted).churn_signals == ['cancel'], quoted
+
+# Test 8: Batch scanning keeps input order, in-process and across a pool
+from app.services.keyword_scanner import scan_many, scan_many_hits
+batch = [text1, text2, text3, text4, text5] * 40
+expected = [scan_text(t) for t in batch]
+assert scan_many(batch) == expected
+assert [hits.to_result() for hits in scan_many_hits(batch, processes=2, chunk_size=16)] == expected
+assert [hits.has_matches for hits in scan_many_hits(batch[:5])] == [bool(r.matches) for r in expected[:5]]
+print("\nBatch scan: OK")
+
+# Test 9: Streaming scan matches a one-shot scan for any chunking
+import io
+from app.services.keyword_scanner import scan_stream
+document = " ".join([text2, text3, text4, text7, "We'd like to roll out to other teams."] * 50)
+expected = scan_text(document)
+for size in (1, 7, 64, 1000):
+    assert scan_stream(document, chunk_size=size) == expected
+    assert scan_stream(io.StringIO(document), chunk_size=size) == expected
+assert scan_stream(iter(["... not ", "renew", "ing\nthe contract"])).churn_signals == ['not renewing']
+# Any whitespace is a word boundary, not just space, tab and newlines
+spaced = "We are\u00a0not renewing\u2003the contract.\x0bPlease cancel\u2028our plan"
+for size in (1, 5, 1000):
+    assert scan_stream(spaced, chunk_size=size) == scan_text(spaced)
+# Words are never split across chunks, however small the chunks
+for size in (1, 2, 3):
+    assert scan_stream("let's reconnect", chunk_size=size).action_signals == ['reconnect']
+    assert scan_stream(iter(["we'll re", "connect soon"]), chunk_size=size).action_signals == ['reconnect']
+# Quotes and hyphens at chunk edges tokenize as they would in one pass
+edged = "please 'cancel'-now, off-board- 'won\u2019t renew' x--exit--"
+for size in (1, 2, 3, 1000):
+    assert scan_stream(edged, chunk_size=size) == scan_text(edged)
+# A huge word is held back by its ends only, and still never matches
+from unittest.mock import patch
+from app.services.keyword_scanner import get_matcher
+matcher = get_matcher()
+fed = []
+def recording_feed(tokens, found, state=0):
+    tokens = list(tokens)
+    fed.extend(tokens)
+    return type(matcher).feed(matcher, tokens, found, state)
+with patch.object(matcher, "feed", recording_feed):
+    huge = scan_stream("reconnect" + "x" * 100_000 + "'cancel please reconnect", chunk_size=8)
+assert huge.action_signals == ['reconnect'] and huge.churn_signals == []
+assert max(map(len, fed)) < 3 * (matcher.longest_token + 4)
+print("Streaming scan: OK")
@@ -79,6 +79,10 @@ export default function AccountDetail() {
         try {
             const newHealth = await healthService.calculateScore(id);
             setHealthScore(newHealth);
+            setRecalculating(false);
+            if (newHealth.summary_status === "pending") {
+                setHealthScore(await healthService.waitForSummary(newHealth));
+            }
         } catch (error) {
             console.error(error);
         } finally {
@@ -175,6 +179,9 @@ export default function AccountDetail() {
                                             </p>
                                         </div>
                                     )}
+                                    {!healthScore.ai_summary && healthScore.summary_status === "pending" && (
+                                        <p className="text-sm text-slate-400 italic animate-pulse">Generating AI summary...</p>
+                                    )}
 
                                     <div className="grid grid-cols-2 gap-4">
                                         {[
@@ -11,6 +11,29 @@ export const healthService = {
         return response.json();
     },
 
+    getScore: async (scoreId: string): Promise<HealthScore> => {
+        const response = await fetch(`${API_URL}/health/scores/${scoreId}`);
+        if (!response.ok) throw new Error("Failed to fetch health score");
+        return response.json();
+    },
+
+    // The score is saved before its AI summary exists; poll until the summary workers fill it in.
+    // A superseded score will never get one, so follow the account's newest score instead.
+    waitForSummary: async (score: HealthScore, intervalMs = 2000, timeoutMs = 120000): Promise<HealthScore> => {
+        const deadline = Date.now() + timeoutMs;
+        let current = score;
+        while (Date.now() < deadline) {
+            if (current.summary_status === "superseded") {
+                current = await healthService.getLatestHealth(current.account_id);
+                continue;
+            }
+            if (current.summary_status !== "pending") break;
+            await new Promise((resolve) => setTimeout(resolve, intervalMs));
+            current = await healthService.getScore(current.id);
+        }
+        return current;
+    },
+
     getLatestHealth: async (accountId: string): Promise<HealthScore> => {
         const response = await fetch(`${API_URL}/health/accounts/${accountId}/history?limit=1`);
         if (!response.ok) throw new Error("Failed to fetch latest health score");
@@ -9,6 +9,7 @@ export interface HealthScore {
     relationship_score: number;
     satisfaction_score: number;
     expansion_score: number;
-    ai_summary: string;
+    ai_summary: string | null;
+    summary_status?: "pending" | "completed" | "failed" | "superseded" | null;
     calculated_at: string;
 }